@@ -10,6 +10,20 @@ Core Capabilities:
 - Reinforcement Learning: Learn from engagement
 - Game Theory: Strategic posting optimization
 - Evolutionary Algorithms: Template evolution
+
+Subpackages are imported lazily on first attribute access, so
+`import automation_codex` stays cheap for CLI and bridge scripts.
 """
 
 __version__ = "1.0.0"
+
+from .utils.lazy_import import lazy_exports
+
+_EXPORTS = {
+    'core': '.core',
+    'config': '.config',
+    'utils': '.utils',
+    'validation': '.validation'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
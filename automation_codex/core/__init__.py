@@ -1,20 +1,64 @@
 # AutomationCodex Core Mathematical Models
 # Credits: Grok AI (prompting), Leonardo AI (artwork), Perplexity AI (research)
+#
+# Names are resolved lazily (PEP 562) so importing the package stays cheap;
+# numpy/networkx are only loaded once a model actually uses them. The shared
+# analyzer cache instance lives at core.content_cache.content_cache.
 
-from .mathematical_models import (
-    TemplateEvolutionGraph,
-    TemplateAutomaton,
-    ContentComplexityAnalyzer,
-    TrendPredictionMDP,
-    TemplateState,
-    TemplateNode
-)
+from ..utils.lazy_import import lazy_exports
 
-__all__ = [
-    'TemplateEvolutionGraph',
-    'TemplateAutomaton',
-    'ContentComplexityAnalyzer',
-    'TrendPredictionMDP',
-    'TemplateState',
-    'TemplateNode'
-]
+_EXPORTS = {
+    'TemplateEvolutionGraph': '.mathematical_models',
+    'TemplateAutomaton': '.mathematical_models',
+    'ContentComplexityAnalyzer': '.mathematical_models',
+    'TrendPredictionMDP': '.mathematical_models',
+    'TemplateState': '.mathematical_models',
+    'TemplateNode': '.mathematical_models',
+    'CompactTemplateNode': '.mathematical_models',
+    'ScrapingGraph': '.scraping_models',
+    'ScraperAutomaton': '.scraping_models',
+    'InformationTheoryAnalyzer': '.scraping_models',
+    'MarkovDecisionProcess': '.scraping_models',
+    'MathematicalModelsOrchestrator': '.scraping_models',
+    'ScraperState': '.scraping_models',
+    'GraphNode': '.scraping_models',
+    'CompactGraphNode': '.scraping_models',
+    'create_mathematical_models_suite': '.scraping_models',
+    'ExecutionPlan': '.execution_plan',
+    'build_execution_plan': '.execution_plan',
+    'run_execution_plan': '.execution_plan',
+    'ContentDigestCache': '.content_cache',
+    'memoize_content': '.content_cache',
+    'AMPHETAMEMES_TEMPLATE': '.prompt_templates',
+    'PROMPT_TEMPLATES': '.prompt_templates',
+    'write_templates_csv': '.prompt_templates',
+    'TemplateCatalog': '.template_catalog',
+    'create_template_catalog': '.template_catalog',
+    'PromptElements': '.prompt_generator',
+    'CombinatorialPromptGenerator': '.prompt_generator',
+    'create_prompt_generator': '.prompt_generator',
+    'TemplateSearchIndex': '.template_search',
+    'build_search_index': '.template_search',
+    'HoltForecaster': '.trend_forecasting',
+    'forecast_history': '.trend_forecasting',
+    'EngagementEvent': '.engagement_learning',
+    'EngagementLearner': '.engagement_learning',
+    'RewardWeights': '.engagement_learning',
+    'compute_rewards': '.engagement_learning',
+    'LifecycleEventLog': '.lifecycle_store',
+    'LifecycleRestore': '.lifecycle_store',
+    'GAConfig': '.evolutionary_optimizer',
+    'EvolutionResult': '.evolutionary_optimizer',
+    'KeywordEngagementPredictor': '.evolutionary_optimizer',
+    'TemplateEvolutionEngine': '.evolutionary_optimizer',
+    'create_evolution_engine': '.evolutionary_optimizer',
+    'CompetitorProfile': '.posting_scheduler',
+    'GameTheoryScheduler': '.posting_scheduler',
+    'ScheduleSolution': '.posting_scheduler',
+    'solve_zero_sum': '.posting_scheduler',
+    'create_posting_scheduler': '.posting_scheduler'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,233 @@
+"""
+Content Digest Cache
+Shared memoization layer for content analyzers
+
+Analyzer entry points such as ContentComplexityAnalyzer.content_complexity_score
+and InformationTheoryAnalyzer.content_complexity_score are pure functions of
+their text input, and the same prompts and scraped pages are scored over and
+over. This module caches their results keyed by a fast content digest
+(xxhash when installed, blake2b otherwise) with:
+- LRU eviction bounded by entry count and by approximate byte size
+- Optional on-disk spillover of evicted entries
+- Hit/miss/eviction metrics
+"""
+
+import copy
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def content_digest(content: Union[str, bytes]) -> str:
+    """Return a fast 128-bit hex digest of content"""
+    if isinstance(content, str):
+        content = content.encode('utf-8', 'surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(content)
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _approximate_size(value: Any) -> int:
+    """Approximate in-memory size of a cached value in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class ContentDigestCache:
+    """LRU cache keyed by content digests with byte-size bound and disk spillover"""
+
+    def __init__(self, max_entries: int = 100_000, max_bytes: int = 64 * 1024 * 1024,
+                 spill_dir: Optional[Union[str, Path]] = None):
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.spills = 0
+        self.configure(max_entries=max_entries, max_bytes=max_bytes, spill_dir=spill_dir)
+
+    def configure(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                  spill_dir: Optional[Union[str, Path]] = _MISSING) -> None:
+        """Update cache bounds and spillover directory, evicting as needed"""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if spill_dir is not _MISSING:
+                self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+                if self.spill_dir is not None:
+                    self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._evict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a cached value, falling back to disk spillover"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            value = self._load_spilled(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+
+            self.disk_hits += 1
+            self._store(key, value)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert a value, evicting least recently used entries if over bounds"""
+        with self._lock:
+            self._store(key, value)
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop all in-memory entries and optionally the spilled files"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            if disk and self.spill_dir is not None:
+                for spilled in self.spill_dir.glob('*.pkl'):
+                    spilled.unlink(missing_ok=True)
+
+    def reset_stats(self) -> None:
+        """Reset hit/miss counters"""
+        with self._lock:
+            self.hits = self.misses = self.disk_hits = 0
+            self.evictions = self.spills = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache metrics"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'spills': self.spills,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Insert under lock and enforce bounds"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous[1]
+
+        size = _approximate_size(value)
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until within bounds"""
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self.current_bytes > self.max_bytes):
+            key, (value, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+            self._spill(key, value)
+
+    def _spill_path(self, key: Hashable) -> Path:
+        """Filesystem path for a spilled entry"""
+        return self.spill_dir / f"{content_digest(repr(key))}.pkl"
+
+    def _spill(self, key: Hashable, value: Any) -> None:
+        """Write an evicted entry to the spillover directory"""
+        if self.spill_dir is None:
+            return
+        path = self._spill_path(key)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self.spills += 1
+        except OSError as e:
+            logger.warning(f"Failed to spill cache entry to {path}: {e}")
+
+    def _load_spilled(self, key: Hashable) -> Any:
+        """Read a spilled entry back from disk"""
+        if self.spill_dir is None:
+            return _MISSING
+        path = self._spill_path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_key, value = pickle.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache spill {path}: {e}")
+            return _MISSING
+        return value if stored_key == key else _MISSING
+
+
+def _key_part(value: Any) -> Hashable:
+    """Replace text values by their digest for use in a cache key"""
+    if isinstance(value, (str, bytes)):
+        return content_digest(value)
+    return value
+
+
+# Shared cache used by all analyzer entry points
+content_cache = ContentDigestCache()
+
+
+def memoize_content(cache: Optional[ContentDigestCache] = None) -> Callable:
+    """Memoize a function of text arguments by content digest
+
+    String and bytes arguments are replaced by their digest in the cache key,
+    other arguments are used as-is and must be hashable. Mutable results are
+    copied on the way out so callers cannot corrupt cached values.
+    """
+    def decorator(func: Callable) -> Callable:
+        namespace = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache if cache is not None else content_cache
+            key = (namespace,
+                   tuple(_key_part(a) for a in args),
+                   tuple(sorted((k, _key_part(v)) for k, v in kwargs.items())))
+            result = target.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                target.put(key, result)
+            return copy.copy(result) if isinstance(result, (dict, list, set)) else result
+
+        wrapper.cache_key_namespace = namespace
+        return wrapper
+
+    return decorator
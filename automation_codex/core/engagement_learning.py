@@ -0,0 +1,393 @@
+"""
+Engagement Learning Module
+Reinforcement learning for TrendPredictionMDP from post engagement events
+
+Each event reports the engagement (views, likes, shares, saves) a template
+earned after the last action taken for it, optionally with its current
+trend intensity. The learner keeps, per template, the trend state and the
+action in effect; an event becomes the transition
+
+    (state, action) --reward(engagement)--> next state
+
+after which the template's next action is chosen epsilon-greedily.
+Events are buffered into columnar NumPy batches: rewards, per-template
+transition chains (several events for one template in a batch are ordered
+by timestamp) and the Q-updates (TrendPredictionMDP.update_batch) are all
+array operations. Learned tables are checkpointed to an .npz file every
+checkpoint_every events and on close().
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from ..utils.lazy_import import lazy_import
+from ..utils.metrics import metrics
+from .mathematical_models import TrendPredictionMDP
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+ENGAGEMENT_FIELDS = ('views', 'likes', 'shares', 'saves')
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class EngagementEvent:
+    """Engagement observed for one template since its last action"""
+    template_id: str
+    views: float = 0.0
+    likes: float = 0.0
+    shares: float = 0.0
+    saves: float = 0.0
+    timestamp: float = 0.0
+    trend_intensity: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EngagementEvent':
+        """Event from a dict, accepting the bridge's camelCase keys"""
+        intensity = data.get('trend_intensity', data.get('trendIntensity'))
+        return cls(
+            template_id=_template_id_of(data),
+            views=float(data.get('views', 0)),
+            likes=float(data.get('likes', 0)),
+            shares=float(data.get('shares', 0)),
+            saves=float(data.get('saves', 0)),
+            timestamp=float(data.get('timestamp', 0) or 0),
+            trend_intensity=None if intensity is None else float(intensity)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class RewardWeights:
+    """Weights of log1p engagement counts in the reward"""
+    views: float = 0.1
+    likes: float = 0.5
+    shares: float = 1.5
+    saves: float = 1.0
+
+    def as_array(self) -> np.ndarray:
+        return np.array([getattr(self, name) for name in ENGAGEMENT_FIELDS], dtype=np.float64)
+
+
+def compute_rewards(engagement: Any, weights: Optional[RewardWeights] = None) -> np.ndarray:
+    """Rewards of an (events, 4) views/likes/shares/saves array
+
+    Counts are log-damped so a viral outlier does not swamp the table.
+    """
+    engagement = np.asarray(engagement, dtype=np.float64)
+    if engagement.ndim != 2 or engagement.shape[1] != len(ENGAGEMENT_FIELDS):
+        raise ValueError(f"engagement must have shape (n, 4), got {engagement.shape}")
+    return np.log1p(np.maximum(engagement, 0.0)) @ (weights or RewardWeights()).as_array()
+
+
+class EngagementLearner:
+    """Batched Q-learning for a TrendPredictionMDP driven by engagement events"""
+
+    def __init__(self, mdp: Optional[TrendPredictionMDP] = None,
+                 weights: Optional[RewardWeights] = None, epsilon: float = 0.1,
+                 batch_size: int = 65_536,
+                 checkpoint_path: Optional[Union[str, Path]] = None,
+                 checkpoint_every: int = 1_000_000, seed: Optional[int] = None):
+        if not 0.0 <= epsilon <= 1.0:
+            raise ValueError(f"epsilon must be in [0, 1], got {epsilon}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.mdp = mdp or TrendPredictionMDP()
+        self.weights = weights or RewardWeights()
+        self.epsilon = epsilon
+        self.batch_size = batch_size
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path is not None else None
+        self.checkpoint_every = checkpoint_every
+        self.rng = np.random.default_rng(seed)
+
+        self._index: Dict[str, int] = {}
+        self._keys: List[str] = []
+        # Per-template trend state and action in effect, as codes
+        self.template_states = np.zeros(1024, dtype=np.int8)
+        self.template_actions = np.zeros(1024, dtype=np.int8)
+
+        self._pending: List[EngagementEvent] = []
+        self.events_processed = 0
+        self.total_reward = 0.0
+        self._since_checkpoint = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ------------------------------------------------------------------
+    # Templates
+    # ------------------------------------------------------------------
+
+    def rows_of(self, template_ids: Iterable[str]) -> np.ndarray:
+        """Row of each template id, registering new templates"""
+        index = self._index
+        keys = self._keys
+        rows = []
+        for template_id in template_ids:
+            row = index.get(template_id)
+            if row is None:
+                row = index[template_id] = len(keys)
+                keys.append(template_id)
+            rows.append(row)
+        self._ensure_capacity(len(keys))
+        return np.asarray(rows, dtype=np.int64)
+
+    def _ensure_capacity(self, size: int) -> None:
+        if size <= len(self.template_states):
+            return
+        capacity = max(size, 2 * len(self.template_states))
+        for name in ('template_states', 'template_actions'):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def recommended_action(self, template_id: str) -> str:
+        """Action currently in effect for a template"""
+        row = self._index.get(template_id)
+        code = self.template_actions[row] if row is not None else self.mdp.greedy_policy()[0]
+        return self.mdp.actions[int(code)]
+
+    def template_state(self, template_id: str) -> str:
+        row = self._index.get(template_id)
+        return self.mdp.states[int(self.template_states[row]) if row is not None else 0]
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def ingest(self, events: Iterable[Union[EngagementEvent, Dict[str, Any]]]) -> int:
+        """Buffer events, learning from each full batch; returns events accepted"""
+        accepted = 0
+        for event in events:
+            if not isinstance(event, EngagementEvent):
+                event = EngagementEvent.from_dict(event)
+            self._pending.append(event)
+            accepted += 1
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+        return accepted
+
+    def ingest_ndjson(self, path: Union[str, Path]) -> int:
+        """Learn from an NDJSON file of engagement events; returns events read"""
+        count = 0
+        with open(path, 'r', encoding='utf-8') as stream:
+            for batch in _batched_lines(stream, self.batch_size):
+                count += self.learn_from_records([json.loads(line) for line in batch])
+        return count
+
+    def learn_from_records(self, records: Sequence[Dict[str, Any]]) -> int:
+        """Columnar fast path for already-parsed event dicts"""
+        if not records:
+            return 0
+        template_ids = [_template_id_of(record) for record in records]
+        engagement = np.array([[record.get(name, 0) for name in ENGAGEMENT_FIELDS]
+                               for record in records], dtype=np.float64)
+        timestamps = np.array([record.get('timestamp', 0) or 0 for record in records],
+                              dtype=np.float64)
+        intensities = np.array([_intensity_of(record) for record in records], dtype=np.float64)
+        return self.learn_batch(template_ids, engagement, timestamps, intensities)
+
+    def flush(self) -> int:
+        """Learn from buffered events"""
+        if not self._pending:
+            return 0
+        events, self._pending = self._pending, []
+        return self.learn_batch(
+            [event.template_id for event in events],
+            np.array([(event.views, event.likes, event.shares, event.saves) for event in events],
+                     dtype=np.float64),
+            np.fromiter((event.timestamp for event in events), dtype=np.float64, count=len(events)),
+            np.fromiter((np.nan if event.trend_intensity is None else event.trend_intensity
+                         for event in events), dtype=np.float64, count=len(events)))
+
+    def learn_batch(self, template_ids: Sequence[str], engagement: Any,
+                    timestamps: Optional[Any] = None, intensities: Optional[Any] = None) -> int:
+        """Learn from one columnar batch of events
+
+        engagement is (n, 4) views/likes/shares/saves; intensities may hold
+        NaN for events without a trend reading (the state is then kept).
+        """
+        count = len(template_ids)
+        if not count:
+            return 0
+        started = time.perf_counter()
+        rows = self.rows_of(template_ids)
+        rewards = compute_rewards(engagement, self.weights)
+        timestamps = np.zeros(count) if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        intensities = (np.full(count, np.nan) if intensities is None
+                       else np.asarray(intensities, dtype=np.float64))
+
+        # Order each template's events in time, keeping arrival order on ties
+        order = np.lexsort((np.arange(count), timestamps, rows))
+        rows, rewards, intensities = rows[order], rewards[order], intensities[order]
+        group_start = np.ones(count, dtype=bool)
+        group_start[1:] = rows[1:] != rows[:-1]
+
+        # Next state: the reported intensity, else the state carried forward
+        reported = ~np.isnan(intensities)
+        next_states = np.full(count, -1, dtype=np.intp)
+        next_states[reported] = self.mdp.intensity_state_codes(intensities[reported])
+        starts = self.template_states[rows].astype(np.intp)
+        next_states = _carry_forward(next_states, group_start, starts)
+
+        # State before each event: the template's stored state for its first
+        # event in the batch, else the previous event's next state
+        states = np.empty(count, dtype=np.intp)
+        states[group_start] = starts[group_start]
+        states[~group_start] = next_states[:-1][~group_start[1:]]
+
+        # Action in effect: stored action first, then what the policy chose
+        policy = self.mdp.greedy_policy()
+        chosen = self._choose_actions(policy, next_states)
+        actions = np.empty(count, dtype=np.intp)
+        actions[group_start] = self.template_actions[rows[group_start]]
+        actions[~group_start] = chosen[:-1][~group_start[1:]]
+
+        self.mdp.update_batch(states, actions, rewards, next_states)
+
+        group_end = np.ones(count, dtype=bool)
+        group_end[:-1] = group_start[1:]
+        last_rows = rows[group_end]
+        self.template_states[last_rows] = next_states[group_end]
+        self.template_actions[last_rows] = chosen[group_end]
+
+        self.events_processed += count
+        self.total_reward += float(rewards.sum())
+        self._since_checkpoint += count
+        if metrics.enabled:
+            metrics.inc('codex_engagement_events_total', count, 'Engagement events learned from')
+            metrics.observe('codex_engagement_batch_seconds', time.perf_counter() - started)
+        if (self.checkpoint_path is not None and self.checkpoint_every
+                and self._since_checkpoint >= self.checkpoint_every):
+            self.save_checkpoint()
+        return count
+
+    def _choose_actions(self, policy: np.ndarray, states: np.ndarray) -> np.ndarray:
+        """Epsilon-greedy actions for states"""
+        actions = policy[states].astype(np.intp)
+        if self.epsilon > 0:
+            explore = self.rng.random(len(states)) < self.epsilon
+            actions[explore] = self.rng.integers(0, len(self.mdp.actions), int(explore.sum()))
+        return actions
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def save_checkpoint(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Atomically write the Q-table and per-template state to an .npz file"""
+        path = Path(path or self.checkpoint_path or 'engagement_learner.npz')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = len(self._keys)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path,
+                 version=np.array(CHECKPOINT_VERSION),
+                 q_table=self.mdp.q_table,
+                 states=np.asarray(self.mdp.states),
+                 actions=np.asarray(self.mdp.actions),
+                 hyperparameters=np.array([self.mdp.learning_rate, self.mdp.discount_factor,
+                                           self.epsilon]),
+                 template_ids=np.asarray(self._keys, dtype=str),
+                 template_states=self.template_states[:size],
+                 template_actions=self.template_actions[:size],
+                 counters=np.array([self.events_processed, self.total_reward]))
+        os.replace(tmp_path, path)
+        self._since_checkpoint = 0
+        logger.info(f"Checkpointed engagement learner ({size} templates, "
+                    f"{self.events_processed} events) to {path}")
+        return path
+
+    def load_checkpoint(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """Restore a checkpoint; returns False if it does not exist"""
+        path = Path(path or self.checkpoint_path or 'engagement_learner.npz')
+        if not path.exists():
+            return False
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported engagement checkpoint version {version}")
+            if data['states'].tolist() != self.mdp.states or data['actions'].tolist() != self.mdp.actions:
+                raise ValueError(f"Checkpoint {path} was written for different states/actions")
+            self.mdp.q_table = data['q_table'].astype(np.float64)
+            self.mdp.learning_rate, self.mdp.discount_factor, self.epsilon = \
+                data['hyperparameters'].tolist()
+            self._keys = data['template_ids'].tolist()
+            self._index = {key: row for row, key in enumerate(self._keys)}
+            self.template_states = np.zeros(max(1024, len(self._keys)), dtype=np.int8)
+            self.template_actions = np.zeros_like(self.template_states)
+            self.template_states[:len(self._keys)] = data['template_states']
+            self.template_actions[:len(self._keys)] = data['template_actions']
+            events, total_reward = data['counters'].tolist()
+            self.events_processed, self.total_reward = int(events), total_reward
+        self._since_checkpoint = 0
+        return True
+
+    def close(self) -> None:
+        """Learn from buffered events and write a final checkpoint"""
+        self.flush()
+        if self.checkpoint_path is not None and self._since_checkpoint:
+            self.save_checkpoint()
+
+    def __enter__(self) -> 'EngagementLearner':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'templates': len(self._keys),
+            'events_processed': self.events_processed,
+            'mean_reward': self.total_reward / self.events_processed if self.events_processed else 0.0,
+            'policy': dict(zip(self.mdp.states,
+                               (self.mdp.actions[code] for code in self.mdp.greedy_policy())))
+        }
+
+
+def _template_id_of(record: Dict[str, Any]) -> str:
+    template_id = record.get('template_id', record.get('templateId'))
+    if template_id is None:
+        raise ValueError(f"Engagement event without template id: {record}")
+    return str(template_id)
+
+
+def _intensity_of(record: Dict[str, Any]) -> float:
+    value = record.get('trend_intensity', record.get('trendIntensity'))
+    return np.nan if value is None else float(value)
+
+
+def _carry_forward(values: np.ndarray, group_start: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Fill -1 entries with the previous value in their group (or the group's start value)"""
+    # Seed each group's first missing entry with its start value, then
+    # forward-fill by propagating the index of the last known entry
+    values = values.copy()
+    seed = group_start & (values < 0)
+    values[seed] = starts[seed]
+    known = np.where(values >= 0, np.arange(len(values)), 0)
+    np.maximum.accumulate(known, out=known)
+    return values[known]
+
+
+def _batched_lines(stream: Iterable[str], size: int) -> Iterable[List[str]]:
+    batch = []
+    for line in stream:
+        line = line.strip()
+        if line:
+            batch.append(line)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
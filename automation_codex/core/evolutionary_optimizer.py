@@ -0,0 +1,301 @@
+"""
+Evolutionary Optimizer Module
+Genetic algorithm over prompt element combinations
+
+A genome is one element index per prompt slot (the SUBJECT / STYLE / MOOD /
+CONTEXT / TECHNICAL lists of PromptElements), so a population is an
+(individuals, slots) integer array and selection, crossover and mutation
+are whole-array operations. Fitness is a weighted sum of the prompt's
+ContentComplexityAnalyzer complexity score and any pluggable engagement
+predictors (picklable callables taking genomes and rendered prompts and
+returning one score per individual). Fitness is cached per combination
+(keyed by its mixed-radix index, the same numbering as
+CombinatorialPromptGenerator.prompt_at), and uncached genomes are scored in
+chunks on a process pool when the batch is large enough to pay for it.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.lazy_import import lazy_import
+from ..utils.metrics import metrics
+from ..utils.process_pool import create_process_pool
+from .mathematical_models import ContentComplexityAnalyzer
+from .prompt_generator import CombinatorialPromptGenerator, PromptElements
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# (genomes, prompts) -> one engagement score per genome
+EngagementPredictor = Callable[[Any, List[str]], Any]
+
+
+@dataclass
+class GAConfig:
+    """Genetic algorithm hyperparameters"""
+    population_size: int = 1_000
+    generations: int = 50
+    tournament_size: int = 3
+    crossover_rate: float = 0.9
+    mutation_rate: float = 0.1
+    elite_fraction: float = 0.02
+    complexity_weight: float = 1.0
+    workers: Optional[int] = None
+    parallel_threshold: int = 20_000
+    chunk_size: int = 8_192
+    cache_limit: int = 5_000_000
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.population_size < 2:
+            raise ValueError(f"population_size must be at least 2, got {self.population_size}")
+        if self.tournament_size < 1:
+            raise ValueError(f"tournament_size must be positive, got {self.tournament_size}")
+        for name in ('crossover_rate', 'mutation_rate', 'elite_fraction'):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be in [0, 1], got {value}")
+
+
+@dataclass
+class KeywordEngagementPredictor:
+    """Engagement proxy: summed weights of keywords found in the prompt"""
+    keywords: Dict[str, float]
+    normalize: bool = True
+
+    def __call__(self, genomes: np.ndarray, prompts: List[str]) -> np.ndarray:
+        keywords = [(keyword.lower(), weight) for keyword, weight in self.keywords.items()]
+        scores = np.fromiter((sum(weight for keyword, weight in keywords if keyword in prompt.lower())
+                              for prompt in prompts), dtype=np.float64, count=len(prompts))
+        total = sum(abs(weight) for _, weight in keywords)
+        return scores / total if self.normalize and total else scores
+
+
+@dataclass
+class EvolutionResult:
+    """Outcome of a GA run"""
+    best_genome: np.ndarray
+    best_prompt: str
+    best_fitness: float
+    population: np.ndarray
+    fitness: np.ndarray
+    history: List[Dict[str, float]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def top(self, engine: 'TemplateEvolutionEngine', count: int = 5) -> List[Tuple[str, float]]:
+        """Best distinct prompts of the final population"""
+        keys = engine.genome_keys(self.population)
+        _, first = np.unique(keys, return_index=True)
+        ranked = first[np.argsort(-self.fitness[first], kind='stable')][:count]
+        return list(zip(engine.decode(self.population[ranked]), self.fitness[ranked].tolist()))
+
+
+def _evaluate_chunk(slots: List[List[str]], separator: str, genomes: np.ndarray,
+                    predictors: Sequence[Tuple[EngagementPredictor, float]],
+                    complexity_weight: float) -> np.ndarray:
+    """Fitness of a chunk of genomes (process pool worker)"""
+    prompts = [separator.join(slots[slot][gene] for slot, gene in enumerate(genome))
+               for genome in genomes.tolist()]
+    fitness = np.zeros(len(prompts), dtype=np.float64)
+    if complexity_weight:
+        fitness += complexity_weight * ContentComplexityAnalyzer.batch_complexity_scores(prompts)[:, 2]
+    for predictor, weight in predictors:
+        fitness += weight * np.asarray(predictor(genomes, prompts), dtype=np.float64)
+    return fitness
+
+
+class TemplateEvolutionEngine:
+    """Vectorized genetic algorithm over prompt element genomes"""
+
+    def __init__(self, elements: Optional[PromptElements] = None, config: Optional[GAConfig] = None,
+                 predictors: Optional[Sequence[Tuple[EngagementPredictor, float]]] = None,
+                 separator: str = ', '):
+        self.generator = CombinatorialPromptGenerator(elements, separator=separator)
+        self.slots = self.generator.elements.slots()
+        self.separator = separator
+        self.radices = np.asarray([len(values) for values in self.slots], dtype=np.int64)
+        # Place values of the mixed-radix combination index, last slot fastest
+        self._place_values = np.concatenate([np.cumprod(self.radices[::-1])[::-1][1:], [1]])
+        self.config = config or GAConfig()
+        self.predictors = list(predictors or [])
+        self.rng = np.random.default_rng(self.config.seed)
+        self._fitness_cache: Dict[int, float] = {}
+        self._pool = None
+
+    @property
+    def genome_length(self) -> int:
+        return len(self.slots)
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def genome_keys(self, genomes: np.ndarray) -> np.ndarray:
+        """Combination index of each genome (prompt_at numbering)"""
+        return np.asarray(genomes, dtype=np.int64) @ self._place_values
+
+    def decode(self, genomes: np.ndarray) -> List[str]:
+        join = self.separator.join
+        slots = self.slots
+        return [join(slots[slot][gene] for slot, gene in enumerate(genome))
+                for genome in np.asarray(genomes).tolist()]
+
+    def encode(self, prompt: str) -> np.ndarray:
+        """Closest genome to free-form prompt text
+
+        Each slot takes the longest element that occurs in the prompt
+        (case-insensitive); slots with no match get a random element.
+        """
+        text = prompt.lower()
+        genome = np.zeros(self.genome_length, dtype=np.int64)
+        for slot, values in enumerate(self.slots):
+            matches = [(len(value), gene) for gene, value in enumerate(values) if value.lower() in text]
+            genome[slot] = max(matches)[1] if matches else self.rng.integers(self.radices[slot])
+        return genome
+
+    def random_population(self, size: Optional[int] = None) -> np.ndarray:
+        size = size or self.config.population_size
+        return self.rng.integers(0, self.radices, size=(size, self.genome_length))
+
+    def seeded_population(self, seeds: Sequence[np.ndarray], size: Optional[int] = None) -> np.ndarray:
+        """Random population with the seed genomes and their mutants mixed in"""
+        population = self.random_population(size)
+        if len(seeds):
+            seeds = np.asarray(seeds, dtype=np.int64).reshape(-1, self.genome_length)
+            # A quarter of the population starts near the seeds
+            count = max(len(seeds), len(population) // 4)
+            near = self.mutate(seeds[np.arange(count) % len(seeds)])
+            near[:len(seeds)] = seeds
+            population[:count] = near
+        return population
+
+    # ------------------------------------------------------------------
+    # Fitness
+    # ------------------------------------------------------------------
+
+    def evaluate(self, genomes: np.ndarray) -> np.ndarray:
+        """Fitness of every genome, scoring each distinct combination once"""
+        keys = self.genome_keys(genomes)
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        cache = self._fitness_cache
+        unique_fitness = np.fromiter((cache.get(key, np.nan) for key in unique_keys.tolist()),
+                                     dtype=np.float64, count=len(unique_keys))
+        missing = np.flatnonzero(np.isnan(unique_fitness))
+        if len(missing):
+            scored = self._score(np.asarray(genomes)[first[missing]])
+            unique_fitness[missing] = scored
+            if len(cache) + len(missing) > self.config.cache_limit:
+                cache.clear()
+            cache.update(zip(unique_keys[missing].tolist(), scored.tolist()))
+            if metrics.enabled:
+                metrics.inc('codex_ga_fitness_evaluations_total', len(missing),
+                            'Distinct genomes scored by the GA')
+        return unique_fitness[inverse.reshape(-1)]
+
+    def _score(self, genomes: np.ndarray) -> np.ndarray:
+        config = self.config
+        args = (self.slots, self.separator)
+        if config.workers == 1 or len(genomes) < config.parallel_threshold:
+            return _evaluate_chunk(*args, genomes, self.predictors, config.complexity_weight)
+        pool = self._get_pool()
+        chunks = [genomes[start:start + config.chunk_size]
+                  for start in range(0, len(genomes), config.chunk_size)]
+        futures = [pool.submit(_evaluate_chunk, *args, chunk, self.predictors,
+                               config.complexity_weight) for chunk in chunks]
+        return np.concatenate([future.result() for future in futures])
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = create_process_pool(self.config.workers)
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the fitness worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> 'TemplateEvolutionEngine':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Operators
+    # ------------------------------------------------------------------
+
+    def select(self, fitness: np.ndarray, count: int) -> np.ndarray:
+        """Tournament selection; returns indices of the winners"""
+        contenders = self.rng.integers(0, len(fitness), size=(count, self.config.tournament_size))
+        winners = np.argmax(fitness[contenders], axis=1)
+        return contenders[np.arange(count), winners]
+
+    def crossover(self, parents_a: np.ndarray, parents_b: np.ndarray) -> np.ndarray:
+        """Uniform crossover for the pairs drawn to cross; others copy parent a"""
+        take_b = self.rng.random(parents_a.shape) < 0.5
+        take_b &= (self.rng.random(len(parents_a)) < self.config.crossover_rate)[:, None]
+        return np.where(take_b, parents_b, parents_a)
+
+    def mutate(self, genomes: np.ndarray) -> np.ndarray:
+        """Replace each gene with a random element at the mutation rate"""
+        mutated = self.rng.random(genomes.shape) < self.config.mutation_rate
+        replacements = self.rng.integers(0, self.radices, size=genomes.shape)
+        return np.where(mutated, replacements, genomes)
+
+    def next_generation(self, population: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        size = len(population)
+        elites = min(size, int(round(size * self.config.elite_fraction)))
+        offspring = size - elites
+        parents_a = population[self.select(fitness, offspring)]
+        parents_b = population[self.select(fitness, offspring)]
+        children = self.mutate(self.crossover(parents_a, parents_b))
+        if not elites:
+            return children
+        elite_rows = np.argpartition(-fitness, elites - 1)[:elites]
+        return np.concatenate([population[elite_rows], children])
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+
+    def run(self, generations: Optional[int] = None, population: Optional[np.ndarray] = None,
+            callback: Optional[Callable[[int, np.ndarray, np.ndarray], Any]] = None) -> EvolutionResult:
+        """Evolve a population; callback(generation, population, fitness) returning True stops early"""
+        generations = self.config.generations if generations is None else generations
+        population = self.random_population() if population is None else np.asarray(population,
+                                                                                      dtype=np.int64)
+        started = time.perf_counter()
+        fitness = self.evaluate(population)
+        history = [self._summary(0, fitness)]
+        for generation in range(1, generations + 1):
+            population = self.next_generation(population, fitness)
+            fitness = self.evaluate(population)
+            history.append(self._summary(generation, fitness))
+            if callback is not None and callback(generation, population, fitness):
+                break
+        best = int(np.argmax(fitness))
+        elapsed = time.perf_counter() - started
+        logger.info(f"GA finished {len(history) - 1} generations of {len(population)} in "
+                    f"{elapsed:.2f}s, best fitness {fitness[best]:.4f}")
+        return EvolutionResult(best_genome=population[best].copy(),
+                               best_prompt=self.decode(population[best:best + 1])[0],
+                               best_fitness=float(fitness[best]), population=population,
+                               fitness=fitness, history=history, seconds=elapsed)
+
+    @staticmethod
+    def _summary(generation: int, fitness: np.ndarray) -> Dict[str, float]:
+        return {'generation': generation, 'best': float(fitness.max()),
+                'mean': float(fitness.mean()), 'std': float(fitness.std())}
+
+
+def create_evolution_engine(config: Optional[GAConfig] = None,
+                            predictors: Optional[Sequence[Tuple[EngagementPredictor, float]]] = None
+                            ) -> TemplateEvolutionEngine:
+    """Create a GA engine over the Amphetamemes template structure"""
+    return TemplateEvolutionEngine(config=config, predictors=predictors)
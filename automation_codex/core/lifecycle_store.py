@@ -0,0 +1,369 @@
+"""
+Lifecycle Store Module
+Event-sourced persistence for TemplateAutomaton lifecycle transitions
+
+A store directory holds:
+- events.log: append-only fixed-width binary records (template row uint32,
+  from/to state uint8, flags uint16, timestamp float64 = 16 bytes) after a
+  16-byte header
+- templates.txt: template ids, one per line; line n is template row n
+- snapshot_<records>.npz: current state of every template after the first
+  <records> events
+- meta.json: format version and the state code table
+
+Restoring loads the newest snapshot and replays only the events after it:
+the last event per template (found with one unique() over the reversed
+template column) gives its current state, so a million automata come back
+in a few array operations. Full state_history lists are rebuilt lazily per
+template from a CSR index over the whole log.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..utils.lazy_import import lazy_import
+from .mathematical_models import TemplateAutomaton, TemplateState
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+LIFECYCLE_FORMAT_VERSION = 1
+STATE_ORDER: Tuple[TemplateState, ...] = tuple(TemplateState)
+STATE_CODES: Dict[TemplateState, int] = {state: code for code, state in enumerate(STATE_ORDER)}
+EVENT_DTYPE = np.dtype([('template', '<u4'), ('from_state', 'u1'), ('to_state', 'u1'),
+                        ('flags', '<u2'), ('timestamp', '<f8')])
+_MAGIC = b'CDXLIFE1'
+_HEADER_SIZE = 16
+_DRAFT = STATE_CODES[TemplateState.DRAFT]
+
+
+def _state_code(state: Union[TemplateState, str, int]) -> int:
+    if isinstance(state, TemplateState):
+        return STATE_CODES[state]
+    if isinstance(state, str):
+        return STATE_CODES[TemplateState(state)]
+    return int(state)
+
+
+def transition_matrix() -> np.ndarray:
+    """Boolean (from, to) matrix of the TemplateAutomaton transition table"""
+    allowed = np.zeros((len(STATE_ORDER), len(STATE_ORDER)), dtype=bool)
+    for source, targets in TemplateAutomaton()._build_transition_table().items():
+        for target in targets:
+            allowed[STATE_CODES[source], STATE_CODES[target]] = True
+    return allowed
+
+
+class LifecycleRestore:
+    """Current state of every template restored from a store"""
+
+    def __init__(self, store: 'LifecycleEventLog', states: np.ndarray):
+        self.store = store
+        self.states = states
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def state_of(self, template_id: str) -> TemplateState:
+        row = self.store.row_of(template_id)
+        return STATE_ORDER[self.states[row]] if row is not None else TemplateState.DRAFT
+
+    def state_counts(self) -> Dict[TemplateState, int]:
+        counts = np.bincount(self.states, minlength=len(STATE_ORDER))
+        return {state: int(counts[code]) for code, state in enumerate(STATE_ORDER)}
+
+    def templates_in(self, state: TemplateState) -> List[str]:
+        rows = np.flatnonzero(self.states == STATE_CODES[state])
+        return [self.store.template_ids[row] for row in rows.tolist()]
+
+    def automaton(self, template_id: str, with_history: bool = True) -> TemplateAutomaton:
+        """Rebuild one TemplateAutomaton, attached to the store for new transitions"""
+        automaton = TemplateAutomaton(template_id=template_id, event_log=self.store)
+        automaton.current_state = self.state_of(template_id)
+        if with_history:
+            automaton.state_history = self.store.history_of(template_id)
+        else:
+            automaton.state_history = [automaton.current_state]
+        return automaton
+
+    def automata(self, template_ids: Optional[Iterable[str]] = None,
+                 with_history: bool = False) -> Dict[str, TemplateAutomaton]:
+        """Materialize automata (all templates by default); prefer the arrays for bulk work"""
+        template_ids = self.store.template_ids if template_ids is None else template_ids
+        return {template_id: self.automaton(template_id, with_history)
+                for template_id in template_ids}
+
+
+class _EventWriter:
+    """Write buffer of an event log
+
+    Kept apart from LifecycleEventLog so a weakref.finalize callback can
+    flush it when the log is garbage collected or the interpreter exits.
+    """
+
+    def __init__(self, log_path: Path, ids_path: Path, buffer_records: int, records: int):
+        self.log_path = log_path
+        self.ids_path = ids_path
+        self.records = records
+        self.buffer = np.zeros(buffer_records, dtype=EVENT_DTYPE)
+        self.buffered = 0
+        self.new_ids: List[str] = []
+
+    def flush(self) -> None:
+        if self.buffered:
+            records = self.buffer[:self.buffered].copy()
+            self.buffered = 0
+            self.write(records)
+
+    def write(self, records: np.ndarray) -> None:
+        # Ids first, so every logged template row always has an id line
+        if self.new_ids:
+            with open(self.ids_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self.new_ids) + '\n')
+            self.new_ids = []
+        with open(self.log_path, 'ab') as f:
+            f.write(records.tobytes())
+        self.records += len(records)
+
+
+class LifecycleEventLog:
+    """Append-only binary transition log with snapshots
+
+    append() buffers up to buffer_records transitions before writing;
+    durable=True writes every append through instead. Buffered transitions
+    are also flushed by close(), when the log is garbage collected and at
+    interpreter exit.
+    """
+
+    def __init__(self, directory: Union[str, Path], buffer_records: int = 4096,
+                 durable: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.buffer_records = buffer_records
+        self.durable = durable
+        self._check_meta()
+
+        self.log_path = self.directory / 'events.log'
+        self.ids_path = self.directory / 'templates.txt'
+        self.template_ids: List[str] = self._read_ids()
+        self._index: Optional[Dict[str, int]] = None
+        self._writer = _EventWriter(self.log_path, self.ids_path, buffer_records, self._open_log())
+        self._finalizer = weakref.finalize(self, self._writer.flush)
+        self._history_index: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _check_meta(self) -> None:
+        meta_path = self.directory / 'meta.json'
+        states = [state.value for state in STATE_ORDER]
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            if meta.get('format_version') != LIFECYCLE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported lifecycle store version {meta.get('format_version')}")
+            if meta.get('states') != states:
+                raise ValueError(f"Lifecycle store {self.directory} uses state codes {meta.get('states')}, "
+                                 f"expected {states}")
+        else:
+            meta_path.write_text(json.dumps({'format_version': LIFECYCLE_FORMAT_VERSION,
+                                             'states': states}, indent=2), encoding='utf-8')
+
+    def _read_ids(self) -> List[str]:
+        if not self.ids_path.exists():
+            return []
+        text = self.ids_path.read_text(encoding='utf-8')
+        return text.split('\n')[:-1] if text else []
+
+    def _open_log(self) -> int:
+        """Create or validate the log; returns the number of whole records"""
+        if not self.log_path.exists() or self.log_path.stat().st_size == 0:
+            header = _MAGIC + np.array([LIFECYCLE_FORMAT_VERSION, EVENT_DTYPE.itemsize],
+                                       dtype='<u4').tobytes()
+            self.log_path.write_bytes(header)
+            return 0
+        with open(self.log_path, 'rb') as f:
+            header = f.read(_HEADER_SIZE)
+        if header[:8] != _MAGIC:
+            raise ValueError(f"{self.log_path} is not a lifecycle event log")
+        version, record_size = np.frombuffer(header[8:], dtype='<u4').tolist()
+        if version != LIFECYCLE_FORMAT_VERSION or record_size != EVENT_DTYPE.itemsize:
+            raise ValueError(f"Unsupported event log layout (version {version}, "
+                             f"record size {record_size})")
+        size = self.log_path.stat().st_size - _HEADER_SIZE
+        records, torn = divmod(size, EVENT_DTYPE.itemsize)
+        if torn:
+            # A crash mid-write leaves a partial record; drop it
+            logger.warning(f"Truncating {torn} trailing bytes of a partial record in {self.log_path}")
+            os.truncate(self.log_path, _HEADER_SIZE + records * EVENT_DTYPE.itemsize)
+        return records
+
+    @property
+    def _records(self) -> int:
+        """Number of events on disk"""
+        return self._writer.records
+
+    def __len__(self) -> int:
+        """Number of events, including buffered ones"""
+        return self._writer.records + self._writer.buffered
+
+    # ------------------------------------------------------------------
+    # Templates
+    # ------------------------------------------------------------------
+
+    def row_of(self, template_id: str) -> Optional[int]:
+        if self._index is None:
+            self._index = {key: row for row, key in enumerate(self.template_ids)}
+        return self._index.get(template_id)
+
+    def _register(self, template_id: str) -> int:
+        row = self.row_of(template_id)
+        if row is None:
+            if '\n' in template_id:
+                raise ValueError(f"Template ids cannot contain newlines: {template_id!r}")
+            row = self._index[template_id] = len(self.template_ids)
+            self.template_ids.append(template_id)
+            self._writer.new_ids.append(template_id)
+        return row
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def append(self, template_id: str, from_state: Union[TemplateState, str, int],
+               to_state: Union[TemplateState, str, int], timestamp: Optional[float] = None) -> None:
+        """Record one transition (buffered unless durable; see flush)"""
+        writer = self._writer
+        if writer.buffered == self.buffer_records:
+            self.flush()
+        record = writer.buffer[writer.buffered]
+        record['template'] = self._register(template_id)
+        record['from_state'] = _state_code(from_state)
+        record['to_state'] = _state_code(to_state)
+        record['timestamp'] = time.time() if timestamp is None else timestamp
+        writer.buffered += 1
+        self._history_index = None
+        if self.durable:
+            self.flush()
+
+    def append_many(self, template_ids: Sequence[str], from_states: Sequence[int],
+                    to_states: Sequence[int], timestamps: Optional[Sequence[float]] = None) -> int:
+        """Record many transitions given as state codes; written immediately"""
+        self.flush()
+        records = np.zeros(len(template_ids), dtype=EVENT_DTYPE)
+        records['template'] = [self._register(template_id) for template_id in template_ids]
+        records['from_state'] = from_states
+        records['to_state'] = to_states
+        records['timestamp'] = time.time() if timestamps is None else timestamps
+        self._write(records)
+        return len(records)
+
+    def flush(self) -> None:
+        """Write buffered transitions (and any new template ids) to disk"""
+        if self._writer.buffered:
+            self._writer.flush()
+            self._history_index = None
+
+    def _write(self, records: np.ndarray) -> None:
+        self._writer.write(records)
+        self._history_index = None
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'LifecycleEventLog':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def events(self, start: int = 0) -> np.ndarray:
+        """Memory-mapped view of records start.. (flushes buffered ones first)"""
+        self.flush()
+        count = self._records - start
+        if count <= 0:
+            return np.zeros(0, dtype=EVENT_DTYPE)
+        return np.memmap(self.log_path, dtype=EVENT_DTYPE, mode='r',
+                         offset=_HEADER_SIZE + start * EVENT_DTYPE.itemsize, shape=(count,))
+
+    def snapshot(self) -> Path:
+        """Write the current state of every template; older snapshots are removed"""
+        restored = self.restore()
+        path = self.directory / f"snapshot_{self._records:012d}.npz"
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, states=restored.states, records=np.array(self._records),
+                 templates=np.array(len(restored.states)))
+        os.replace(tmp_path, path)
+        for old in self._snapshots():
+            if old != path:
+                old.unlink()
+        logger.info(f"Snapshotted {len(restored.states)} template states at event {self._records}")
+        return path
+
+    def _snapshots(self) -> List[Path]:
+        return sorted(path for path in self.directory.glob('snapshot_*.npz')
+                      if '.tmp' not in path.name)
+
+    def _load_snapshot(self) -> Tuple[np.ndarray, int]:
+        for path in reversed(self._snapshots()):
+            with np.load(path) as data:
+                records = int(data['records'])
+                if records <= self._records:
+                    return data['states'], records
+            logger.warning(f"Ignoring snapshot {path} beyond the end of the event log")
+        return np.zeros(0, dtype=np.uint8), 0
+
+    def restore(self, validate: bool = False) -> LifecycleRestore:
+        """Current states from the newest snapshot plus the events after it
+
+        With validate=True the replayed events are checked against the
+        automaton transition table and invalid ones are counted in a warning.
+        """
+        snapshot_states, start = self._load_snapshot()
+        states = np.full(len(self.template_ids), _DRAFT, dtype=np.uint8)
+        states[:len(snapshot_states)] = snapshot_states
+        events = self.events(start)
+        if len(events):
+            templates = np.asarray(events['template'])
+            to_states = np.asarray(events['to_state'])
+            # Last event per template: first occurrence in the reversed column
+            rows, reversed_index = np.unique(templates[::-1], return_index=True)
+            states[rows] = to_states[len(templates) - 1 - reversed_index]
+            if validate:
+                invalid = ~transition_matrix()[np.asarray(events['from_state']), to_states]
+                if invalid.any():
+                    logger.warning(f"{int(invalid.sum())} of {len(events)} replayed transitions "
+                                   f"are not allowed by the automaton")
+        return LifecycleRestore(self, states)
+
+    def history_of(self, template_id: str) -> List[TemplateState]:
+        """Full state_history of one template (DRAFT followed by each transition)"""
+        row = self.row_of(template_id)
+        if row is None:
+            return [TemplateState.DRAFT]
+        order, offsets, to_states = self._history()
+        codes = to_states[order[offsets[row]:offsets[row + 1]]]
+        return [TemplateState.DRAFT] + [STATE_ORDER[code] for code in codes.tolist()]
+
+    def _history(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSR index over the whole log: events grouped by template, in log order"""
+        if self._history_index is None:
+            events = self.events()
+            templates = np.asarray(events['template'])
+            order = np.argsort(templates, kind='stable')
+            offsets = np.zeros(len(self.template_ids) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(templates, minlength=len(self.template_ids)), out=offsets[1:])
+            self._history_index = (order, offsets, np.asarray(events['to_state']))
+        return self._history_index
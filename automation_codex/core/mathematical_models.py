@@ -22,18 +22,24 @@ AI Development Credits:
 License: Proprietary - See LICENSE file
 """
 
-import numpy as np
-import networkx as nx
-from typing import Dict, List, Tuple, Any, Optional, Set
+from __future__ import annotations
+
+from typing import Dict, List, Tuple, Any, Optional, Set, FrozenSet, Union
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from abc import ABC, abstractmethod
-import json
-import pickle
-from collections import defaultdict, deque
-import random
+from collections import defaultdict
 import math
+import sys
+
+from ..utils.lazy_import import lazy_import
+from ..utils.metrics import metrics, timed
+from .content_cache import memoize_content
+from .trend_forecasting import HoltForecaster, forecast_history
+
+# Heavy dependencies are loaded on first use, not at import time
+np = lazy_import('numpy')
+nx = lazy_import('networkx')
 
 logger = logging.getLogger(__name__)
 
@@ -57,25 +63,82 @@ class TemplateNode:
     dependencies: Set[str]
     metadata: Dict[str, Any]
 
+_NO_DEPENDENCIES: FrozenSet[str] = frozenset()
+
+@dataclass(slots=True)
+class CompactTemplateNode:
+    """Memory-lean template node
+
+    Slotted (no per-instance __dict__), with interned id/category and
+    dependency ids, a shared empty dependency set and optional metadata.
+    TemplateEvolutionGraph keeps its metadata on the node only instead of
+    copying it into the networkx node attributes.
+    """
+    id: str
+    category: str
+    trend_intensity: float
+    energy_score: float
+    dependencies: FrozenSet[str] = _NO_DEPENDENCIES
+    metadata: Optional[Dict[str, Any]] = None
+    
+    def __post_init__(self):
+        self.id = sys.intern(self.id)
+        self.category = sys.intern(self.category)
+        if self.dependencies:
+            self.dependencies = frozenset(sys.intern(dep) for dep in self.dependencies)
+        else:
+            self.dependencies = _NO_DEPENDENCIES
+
 class TemplateEvolutionGraph:
     """Graph theory implementation for template evolution optimization"""
     
-    def __init__(self):
+    def __init__(self, search_index: Optional[Any] = None):
         self.graph = nx.DiGraph()
-        self.nodes: Dict[str, TemplateNode] = {}
+        self.nodes: Dict[str, Union[TemplateNode, CompactTemplateNode]] = {}
+        # Optional TemplateSearchIndex kept in sync with add/remove_template
+        self.search_index = None
+        if search_index is not None:
+            search_index.attach(self)
         
-    def add_template(self, node: TemplateNode) -> None:
+    def add_template(self, node: Union[TemplateNode, CompactTemplateNode]) -> None:
         """Add template to evolution graph"""
         self.nodes[node.id] = node
-        self.graph.add_node(node.id, **node.metadata)
-        logger.debug(f"Added template {node.id} to evolution graph")
+        if isinstance(node, CompactTemplateNode):
+            self.graph.add_node(node.id)
+        else:
+            self.graph.add_node(node.id, **node.metadata)
+        if self.search_index is not None:
+            self.search_index.add_node(node)
+        if metrics.enabled:
+            metrics.inc('codex_graph_mutations_total', graph='template', op='add_node')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Added template {node.id} to evolution graph")
+    
+    def remove_template(self, template_id: str) -> bool:
+        """Remove template and its evolution links from the graph"""
+        node = self.nodes.pop(template_id, None)
+        if node is None:
+            return False
+        self.graph.remove_node(template_id)
+        if self.search_index is not None:
+            self.search_index.remove(template_id)
+        if metrics.enabled:
+            metrics.inc('codex_graph_mutations_total', graph='template', op='remove_node')
+        return True
     
     def add_evolution_link(self, source_id: str, target_id: str, similarity: float = 0.0) -> None:
         """Add evolution relationship between templates"""
         self.graph.add_edge(source_id, target_id, similarity=similarity)
+        if metrics.enabled:
+            metrics.inc('codex_graph_mutations_total', graph='template', op='add_edge')
         if source_id in self.nodes:
-            self.nodes[source_id].dependencies.add(target_id)
+            node = self.nodes[source_id]
+            if isinstance(node.dependencies, frozenset):
+                node.dependencies = node.dependencies | {target_id}
+            else:
+                node.dependencies.add(target_id)
     
+    @timed('codex_graph_analysis_seconds', graph='template', op='evolution_opportunities')
     def find_evolution_opportunities(self) -> List[Tuple[str, str, float]]:
         """Find templates that should evolve based on graph analysis"""
         opportunities = []
@@ -91,6 +154,7 @@ class TemplateEvolutionGraph:
         
         return opportunities
     
+    @timed('codex_graph_analysis_seconds', graph='template', op='template_mix')
     def optimize_template_mix(self) -> Dict[str, float]:
         """Optimize template portfolio using graph metrics"""
         if not self.graph.nodes():
@@ -106,10 +170,15 @@ class TemplateEvolutionGraph:
 class TemplateAutomaton:
     """Finite state automaton for template lifecycle management"""
     
-    def __init__(self):
+    def __init__(self, template_id: Optional[str] = None, event_log: Optional[Any] = None):
         self.current_state = TemplateState.DRAFT
         self.state_transitions = self._build_transition_table()
         self.state_history: List[TemplateState] = [TemplateState.DRAFT]
+        # Optional LifecycleEventLog recording every accepted transition
+        self.template_id = template_id
+        self.event_log = event_log
+        if event_log is not None and template_id is None:
+            raise ValueError("template_id is required when logging transitions")
         
     def _build_transition_table(self) -> Dict[TemplateState, Set[TemplateState]]:
         """Build valid state transition table"""
@@ -129,6 +198,10 @@ class TemplateAutomaton:
             logger.error(f"Invalid transition from {self.current_state} to {new_state}")
             return False
         
+        if self.event_log is not None:
+            # An accepted transition must survive a restart, so write it through
+            self.event_log.append(self.template_id, self.current_state, new_state)
+            self.event_log.flush()
         self.current_state = new_state
         self.state_history.append(new_state)
         return True
@@ -143,6 +216,8 @@ class ContentComplexityAnalyzer:
     """Information theory tools for content analysis"""
     
     @staticmethod
+    @timed('codex_analyzer_seconds', analyzer='content_complexity', method='calculate_entropy')
+    @memoize_content()
     def calculate_entropy(content: str) -> float:
         """Calculate Shannon entropy of content"""
         if not content:
@@ -162,6 +237,8 @@ class ContentComplexityAnalyzer:
         return entropy
     
     @staticmethod
+    @timed('codex_analyzer_seconds', analyzer='content_complexity', method='content_complexity_score')
+    @memoize_content()
     def content_complexity_score(content: str) -> Dict[str, float]:
         """Calculate comprehensive content complexity metrics"""
         if not content:
@@ -178,15 +255,67 @@ class ContentComplexityAnalyzer:
             'complexity_score': entropy * lexical_diversity
         }
 
+    @staticmethod
+    @timed('codex_analyzer_seconds', analyzer='content_complexity', method='batch_complexity_scores')
+    def batch_complexity_scores(contents: List[str]) -> np.ndarray:
+        """Complexity metrics for many texts at once
+
+        Returns an (n, 3) array of entropy, lexical_diversity and
+        complexity_score, matching content_complexity_score row by row.
+        Character counts for the whole batch come from one bincount, and
+        results bypass the memoization cache, which would only churn on
+        large batches of unique texts.
+        """
+        scores = np.zeros((len(contents), 3), dtype=np.float64)
+        if not contents:
+            return scores
+
+        lengths = np.fromiter((len(content) for content in contents), dtype=np.int64,
+                              count=len(contents))
+        codepoints = np.frombuffer(''.join(contents).encode('utf-32-le'), dtype=np.uint32)
+        if codepoints.size:
+            if int(codepoints.max()) < 128:
+                alphabet_size = 128
+                symbols = codepoints.astype(np.int64)
+            else:
+                alphabet, symbols = np.unique(codepoints, return_inverse=True)
+                alphabet_size = len(alphabet)
+            rows = np.repeat(np.arange(len(contents), dtype=np.int64), lengths)
+            counts = np.bincount(rows * alphabet_size + symbols,
+                                 minlength=len(contents) * alphabet_size)
+            counts = counts.reshape(len(contents), alphabet_size).astype(np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                probabilities = counts / lengths[:, None]
+                terms = np.where(counts > 0, probabilities * np.log2(probabilities), 0.0)
+            scores[:, 0] = -terms.sum(axis=1)
+
+        for row, content in enumerate(contents):
+            words = content.lower().split()
+            if words:
+                scores[row, 1] = len(set(words)) / len(words)
+        scores[:, 2] = scores[:, 0] * scores[:, 1]
+        return scores
+
 class TrendPredictionMDP:
     """Markov Decision Process for trend prediction"""
     
-    def __init__(self):
+    # Upper bounds (exclusive) of the low, medium and high intensity states
+    INTENSITY_THRESHOLDS = (30.0, 60.0, 85.0)
+    
+    def __init__(self, forecaster: Optional[HoltForecaster] = None):
         self.states = ['low', 'medium', 'high', 'peak']
         self.actions = ['wait', 'boost', 'evolve']
+        self.state_codes = {state: i for i, state in enumerate(self.states)}
+        self._state_names = np.asarray(self.states)
+        self._action_names = np.asarray(self.actions)
         self.q_table = np.zeros((len(self.states), len(self.actions)))
         self.learning_rate = 0.1
         self.discount_factor = 0.9
+        # Greedy action per state, valid while q_table matches _policy_key
+        self._policy: Optional[np.ndarray] = None
+        self._policy_key: Optional[bytes] = None
+        # Online per-template intensity forecasts, created on first observe()
+        self.forecaster = forecaster
         
     def predict_next_trend(self, current_intensity: float) -> str:
         """Predict next trend state"""
@@ -198,8 +327,114 @@ class TrendPredictionMDP:
             return 'high'
         return 'peak'
     
+    def intensity_state_codes(self, intensities: Any) -> np.ndarray:
+        """Vectorized predict_next_trend, as indices into self.states"""
+        return np.searchsorted(self.INTENSITY_THRESHOLDS,
+                               np.asarray(intensities, dtype=np.float64), side='right')
+    
+    def predict_many(self, intensities_history: Any, horizon: int = 1,
+                     return_codes: bool = False) -> np.ndarray:
+        """Predicted trend states for many templates in one call
+
+        intensities_history is either current intensities (1-D, classified
+        as-is like predict_next_trend) or a (templates, time steps) history,
+        oldest first, which is Holt-smoothed and forecast horizon steps
+        ahead. Returns state names, or state indices with return_codes.
+        """
+        history = np.asarray(intensities_history, dtype=np.float64)
+        if history.ndim == 2 and history.shape[1] > 1:
+            params = self.forecaster or HoltForecaster(capacity=0)
+            intensities = forecast_history(history, horizon, params.alpha, params.beta,
+                                           params.damping)
+        else:
+            intensities = history.reshape(len(history)) if history.ndim == 2 else history
+        codes = self.intensity_state_codes(intensities)
+        return codes if return_codes else self._state_names[codes]
+    
+    def observe(self, intensities: Any, rows: Optional[Any] = None) -> None:
+        """Fold the latest intensity per template into the online forecaster"""
+        if self.forecaster is None:
+            self.forecaster = HoltForecaster()
+        self.forecaster.update(intensities, rows)
+    
+    def forecast_states(self, horizon: int = 1, rows: Optional[Any] = None,
+                        return_codes: bool = False) -> np.ndarray:
+        """Predicted states of observed templates from the online forecaster"""
+        if self.forecaster is None:
+            return np.zeros(0, dtype=np.int64) if return_codes else np.asarray([], dtype=str)
+        codes = self.intensity_state_codes(self.forecaster.forecast(horizon, rows))
+        return codes if return_codes else self._state_names[codes]
+    
     def recommend_action(self, state: str) -> str:
         """Recommend action based on current state"""
-        state_idx = self.states.index(state) if state in self.states else 0
-        action_idx = np.argmax(self.q_table[state_idx, :])
-        return self.actions[action_idx]
+        return self.actions[self.greedy_policy()[self.state_codes.get(state, 0)]]
+    
+    @timed('codex_mdp_update_seconds', model='trend')
+    def update_q_value(self, state: str, action: str, reward: float, next_state: str) -> None:
+        """Update Q-value using Q-learning"""
+        s_idx = self.state_codes.get(state, 0)
+        a_idx = self.actions.index(action) if action in self.actions else 0
+        ns_idx = self.state_codes.get(next_state, 0)
+        current_q = self.q_table[s_idx, a_idx]
+        target = reward + self.discount_factor * np.max(self.q_table[ns_idx, :])
+        self.q_table[s_idx, a_idx] = current_q + self.learning_rate * (target - current_q)
+    
+    @timed('codex_mdp_batch_update_seconds', model='trend')
+    def update_batch(self, state_codes: Any, action_codes: Any, rewards: Any,
+                     next_state_codes: Any) -> int:
+        """Apply many Q-learning transitions at once; returns how many
+
+        Targets use the table as it was at the start of the batch. A cell hit
+        k times moves towards its mean target by 1 - (1 - learning_rate)^k,
+        which is exactly k sequential updates when the targets agree.
+        """
+        states = np.asarray(state_codes, dtype=np.intp)
+        actions = np.asarray(action_codes, dtype=np.intp)
+        rewards = np.asarray(rewards, dtype=np.float64)
+        if not len(states):
+            return 0
+        targets = rewards + self.discount_factor * self.q_table.max(axis=1)[
+            np.asarray(next_state_codes, dtype=np.intp)]
+        cells = states * len(self.actions) + actions
+        size = self.q_table.size
+        hits = np.bincount(cells, minlength=size)
+        target_sums = np.bincount(cells, weights=targets, minlength=size)
+        touched = hits > 0
+        if not self.q_table.flags.c_contiguous:
+            self.q_table = np.ascontiguousarray(self.q_table)
+        flat = self.q_table.reshape(-1)
+        mean_targets = target_sums[touched] / hits[touched]
+        retained = (1.0 - self.learning_rate) ** hits[touched]
+        flat[touched] = mean_targets + retained * (flat[touched] - mean_targets)
+        return len(states)
+    
+    def greedy_policy(self) -> np.ndarray:
+        """Best action index per state, recomputed only after q_table changes
+
+        The table is tiny, so comparing its bytes detects in-place edits
+        as well as reassignment at a fraction of an argmax per state.
+        """
+        key = self.q_table.tobytes()
+        if self._policy is None or key != self._policy_key:
+            self._policy = np.argmax(self.q_table, axis=1)
+            self._policy_key = key
+        return self._policy
+    
+    def state_codes_of(self, states: Any) -> np.ndarray:
+        """State indices of an array of state names (unknown names map to 0)
+
+        Integer arrays are taken to be codes already.
+        """
+        states = np.asarray(states)
+        if states.dtype.kind in 'iu':
+            return states.astype(np.intp, copy=False)
+        codes = np.zeros(states.shape, dtype=np.intp)
+        for state, code in self.state_codes.items():
+            if code:
+                codes[states == state] = code
+        return codes
+    
+    def recommend_actions(self, states: Any, return_codes: bool = False) -> np.ndarray:
+        """Vectorized recommend_action: one policy gather for all templates"""
+        actions = self.greedy_policy()[self.state_codes_of(states)]
+        return actions if return_codes else self._action_names[actions]
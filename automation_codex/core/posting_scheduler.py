@@ -0,0 +1,351 @@
+"""
+Posting Scheduler Module
+Game-theoretic choice of posting times against competitor accounts
+
+Posting is modelled as a zero-sum game per platform: we pick a time slot,
+the competition picks the slot it concentrates on, and our payoff is the
+platform's audience activity in our slot minus the share taken by
+competitors posting nearby:
+
+    A[s, c] = activity[s] * (1 - strength * habit[c] * crowding(s, c))
+
+strength (0..1) summarises how much audience the competitors command,
+habit[c] how credible a competitor push at slot c is given their posting
+history, and crowding is a circular Gaussian kernel over slot distance.
+Payoff matrices for many platforms/profiles are stacked into one
+(games, slots, strategies) array and solved together by smooth fictitious
+play, which converges to the mixed-strategy equilibrium of zero-sum games;
+each iteration is two batched matrix-vector products over the stack.
+Solutions are cached by platform and (quantized) competitor profile, so
+accounts sharing a profile share a solve.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.lazy_import import lazy_import
+from ..utils.metrics import metrics, timed
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Hours (local time) of audience activity peaks and their relative heights
+PLATFORM_PEAKS: Dict[str, List[Tuple[float, float]]] = {
+    'instagram': [(8.0, 0.6), (12.0, 0.9), (19.5, 1.0)],
+    'tiktok': [(9.0, 0.5), (15.0, 0.7), (21.0, 1.0)],
+    'twitter': [(8.5, 0.9), (12.5, 1.0), (17.5, 0.8)],
+    'facebook': [(9.0, 0.7), (13.5, 1.0), (19.0, 0.7)],
+    'linkedin': [(8.0, 1.0), (12.0, 0.8), (17.0, 0.6)],
+    'youtube': [(15.0, 0.8), (20.5, 1.0)],
+    'pinterest': [(14.0, 0.6), (21.0, 1.0)],
+    'reddit': [(7.0, 0.8), (13.0, 0.7), (22.0, 1.0)]
+}
+DEFAULT_PEAKS = [(12.0, 0.8), (19.0, 1.0)]
+PEAK_WIDTH_HOURS = 2.0
+ACTIVITY_FLOOR = 0.05
+
+
+def platform_activity(platform: str, slots: int = 24) -> np.ndarray:
+    """Relative audience activity per slot for a platform (peak 1.0)"""
+    peaks = PLATFORM_PEAKS.get(platform.lower(), DEFAULT_PEAKS)
+    hours = (np.arange(slots) + 0.5) * 24.0 / slots
+    activity = np.full(slots, ACTIVITY_FLOOR)
+    for hour, height in peaks:
+        distance = np.abs(hours - hour)
+        distance = np.minimum(distance, 24.0 - distance)
+        activity += height * np.exp(-0.5 * (distance / PEAK_WIDTH_HOURS) ** 2)
+    return activity / activity.max()
+
+
+def slot_label(slot: int, slots: int = 24) -> str:
+    """Start time of a slot as HH:MM"""
+    minutes = slot * 1440 // slots
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _parse_hour(value: Any) -> float:
+    if isinstance(value, str) and ':' in value:
+        hours, minutes = value.split(':')[:2]
+        return int(hours) + int(minutes) / 60.0
+    return float(value)
+
+
+@dataclass
+class CompetitorProfile:
+    """Aggregate competition on one platform"""
+    strength: float
+    habit: np.ndarray
+
+    @classmethod
+    def from_records(cls, competitors: Sequence[Dict[str, Any]], slots: int = 24,
+                     habit_floor: float = 0.25, reference_followers: float = 1e6
+                     ) -> 'CompetitorProfile':
+        """Profile from competitor dicts
+
+        Each competitor may give followers, postsPerDay and postingHours /
+        postingTimes (hours or "HH:MM" strings); snake_case keys work too.
+        A competitor's audience share is followers / (followers + reference),
+        and the shares combine as independent audiences.
+        """
+        habit = np.zeros(slots, dtype=np.float64)
+        unclaimed = 1.0
+        for competitor in competitors:
+            followers = float(competitor.get('followers', 0) or 0)
+            if followers < 0:
+                raise ValueError(f"Negative follower count: {competitor}")
+            share = followers / (followers + reference_followers)
+            unclaimed *= 1.0 - share
+            posts = float(competitor.get('postsPerDay', competitor.get('posts_per_day', 1)) or 1)
+            times = (competitor.get('postingHours') or competitor.get('posting_hours')
+                     or competitor.get('postingTimes') or competitor.get('posting_times') or [])
+            if times:
+                slot_of = [int(_parse_hour(t) * slots / 24.0) % slots for t in times]
+                np.add.at(habit, slot_of, (share or 1e-9) * posts / len(slot_of))
+            else:
+                habit += (share or 1e-9) * posts / slots
+        if habit.max() > 0:
+            habit /= habit.max()
+        else:
+            habit[:] = 1.0
+        return cls(strength=1.0 - unclaimed, habit=np.maximum(habit, habit_floor))
+
+    def key(self, decimals: int = 3) -> bytes:
+        """Cache key: the profile rounded to a few decimals"""
+        return np.round(np.concatenate([[self.strength], self.habit]), decimals).tobytes()
+
+
+@dataclass
+class ScheduleSolution:
+    """Mixed-strategy equilibrium of one posting game"""
+    platform: str
+    strategy: np.ndarray
+    competitor_strategy: np.ndarray
+    value: float
+    gap: float
+    iterations: int = 0
+
+    def daily_schedule(self, posts_per_day: int = 3, rng: Optional[Any] = None) -> List[str]:
+        """Slot start times for a day's posts
+
+        Without rng the most likely equilibrium slots are used; with a NumPy
+        Generator the slots are drawn from the mixed strategy, which is what
+        keeps the schedule unexploitable across days.
+        """
+        slots = len(self.strategy)
+        count = min(max(posts_per_day, 0), slots)
+        if rng is None:
+            chosen = np.argsort(-self.strategy, kind='stable')[:count]
+        else:
+            support = int(np.count_nonzero(self.strategy))
+            chosen = rng.choice(slots, size=min(count, support), replace=False, p=self.strategy)
+        return [slot_label(int(slot), slots) for slot in np.sort(chosen)]
+
+    def to_dict(self, posts_per_day: int = 3) -> Dict[str, Any]:
+        slots = len(self.strategy)
+        return {
+            'platform': self.platform,
+            'schedule': self.daily_schedule(posts_per_day),
+            'strategy': {slot_label(slot, slots): round(float(p), 4)
+                         for slot, p in enumerate(self.strategy) if p >= 5e-4},
+            'expected_value': round(self.value, 6),
+            'exploitability': round(self.gap, 6),
+            'iterations': self.iterations
+        }
+
+
+def _logit(totals: np.ndarray, eta: np.ndarray) -> np.ndarray:
+    scaled = eta[:, None] * totals
+    scaled -= scaled.max(axis=1, keepdims=True)
+    weights = np.exp(scaled)
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def solve_zero_sum(payoffs: np.ndarray, iterations: int = 1000, tolerance: float = 2e-3,
+                   learning_rate: float = 5.0, check_every: int = 25
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """Batched smooth fictitious play for zero-sum games (row player maximizes)
+
+    payoffs is a (games, rows, columns) array. Each player plays a logit
+    response to its cumulative payoffs plus the latest payoff (optimistic
+    smooth fictitious play); the average strategies converge to an
+    equilibrium markedly faster than with pure best responses, and every
+    step is two batched matrix-vector products. A game leaves the batch as
+    soon as its duality gap is below tolerance times its payoff range, so
+    easy games stop costing anything. Returns the average row and column
+    strategies, the value estimate and the duality gap per game, and the
+    number of iterations run.
+    """
+    payoffs = np.ascontiguousarray(payoffs, dtype=np.float64)
+    if payoffs.ndim == 2:
+        payoffs = payoffs[None]
+    games, rows, columns = payoffs.shape
+    scale = np.maximum(np.ptp(payoffs.reshape(games, -1), axis=1), 1e-12)
+
+    row_result = np.zeros((games, rows))
+    column_result = np.zeros((games, columns))
+    value = np.zeros(games)
+    gap = np.zeros(games)
+
+    active = np.arange(games)
+    matrices = payoffs
+    eta = learning_rate / scale
+    row_strategy = np.full((games, rows), 1.0 / rows)
+    column_strategy = np.full((games, columns), 1.0 / columns)
+    # Cumulative payoff of every pure strategy against the opponent's history
+    row_totals = np.zeros((games, rows))
+    column_totals = np.zeros((games, columns))
+    row_average = np.zeros((games, rows))
+    column_average = np.zeros((games, columns))
+
+    done = 0
+    for done in range(1, iterations + 1):
+        row_gain = np.matmul(matrices, column_strategy[:, :, None])[:, :, 0]
+        column_loss = np.matmul(row_strategy[:, None, :], matrices)[:, 0, :]
+        row_totals += row_gain
+        column_totals += column_loss
+        row_strategy = _logit(row_totals + row_gain, eta)
+        column_strategy = _logit(-(column_totals + column_loss), eta)
+        row_average += row_strategy
+        column_average += column_strategy
+        if done % check_every and done != iterations:
+            continue
+
+        row_mean = row_average / done
+        column_mean = column_average / done
+        upper = np.matmul(matrices, column_mean[:, :, None])[:, :, 0].max(axis=1)
+        lower = np.matmul(row_mean[:, None, :], matrices)[:, 0, :].min(axis=1)
+        finished = (upper - lower <= tolerance * scale[active]) | (done == iterations)
+        if not finished.any():
+            continue
+        games_done = active[finished]
+        row_result[games_done] = row_mean[finished]
+        column_result[games_done] = column_mean[finished]
+        value[games_done] = (upper[finished] + lower[finished]) / 2.0
+        gap[games_done] = upper[finished] - lower[finished]
+        if finished.all():
+            break
+        keep = ~finished
+        active = active[keep]
+        matrices, eta = matrices[keep], eta[keep]
+        row_strategy, column_strategy = row_strategy[keep], column_strategy[keep]
+        row_totals, column_totals = row_totals[keep], column_totals[keep]
+        row_average, column_average = row_average[keep], column_average[keep]
+
+    return row_result, column_result, value, gap, done
+
+
+class GameTheoryScheduler:
+    """Posting-time equilibria for many platforms and competitor profiles"""
+
+    def __init__(self, slots: int = 24, crowding_width: float = 1.0, habit_floor: float = 0.25,
+                 iterations: int = 1000, tolerance: float = 2e-3, cache_size: int = 100_000):
+        if slots < 1:
+            raise ValueError(f"slots must be positive, got {slots}")
+        self.slots = slots
+        self.crowding_width = crowding_width
+        self.habit_floor = habit_floor
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Tuple[str, bytes], ScheduleSolution]' = OrderedDict()
+        self._activity: Dict[str, np.ndarray] = {}
+        self._crowding = self._crowding_kernel()
+
+    def _crowding_kernel(self) -> np.ndarray:
+        # Circular slot distance in hours, so 23:00 crowds 00:00
+        hours = np.arange(self.slots) * 24.0 / self.slots
+        distance = np.abs(hours[:, None] - hours[None, :])
+        distance = np.minimum(distance, 24.0 - distance)
+        return np.exp(-0.5 * (distance / self.crowding_width) ** 2)
+
+    def activity(self, platform: str) -> np.ndarray:
+        platform = platform.lower()
+        if platform not in self._activity:
+            self._activity[platform] = platform_activity(platform, self.slots)
+        return self._activity[platform]
+
+    def profile(self, competitors: Sequence[Dict[str, Any]]) -> CompetitorProfile:
+        return CompetitorProfile.from_records(competitors, self.slots, self.habit_floor)
+
+    def payoff_matrices(self, platforms: Sequence[str],
+                        profiles: Sequence[CompetitorProfile]) -> np.ndarray:
+        """(games, slots, competitor slots) payoff array"""
+        if len(platforms) != len(profiles):
+            raise ValueError(f"Got {len(platforms)} platforms but {len(profiles)} profiles")
+        activity = np.stack([self.activity(platform) for platform in platforms])
+        pressure = np.stack([profile.strength * profile.habit for profile in profiles])
+        return activity[:, :, None] * (1.0 - pressure[:, None, :] * self._crowding[None, :, :])
+
+    @timed('codex_schedule_solve_seconds', 'Posting-game equilibrium solve latency')
+    def equilibria(self, platforms: Sequence[str],
+                   profiles: Sequence[CompetitorProfile]) -> List[ScheduleSolution]:
+        """Equilibrium per (platform, profile), solving only uncached games"""
+        keys = [(platform.lower(), profile.key()) for platform, profile in zip(platforms, profiles)]
+        found: Dict[Tuple[str, bytes], ScheduleSolution] = {}
+        pending: Dict[Tuple[str, bytes], int] = {}
+        for position, key in enumerate(keys):
+            if key in found or key in pending:
+                continue
+            cached = self._cache.get(key)
+            if cached is None:
+                pending[key] = position
+            else:
+                self._cache.move_to_end(key)
+                found[key] = cached
+
+        if pending:
+            positions = list(pending.values())
+            payoffs = self.payoff_matrices([platforms[p] for p in positions],
+                                           [profiles[p] for p in positions])
+            strategies, competitor, values, gaps, done = solve_zero_sum(
+                payoffs, self.iterations, self.tolerance)
+            for row, key in enumerate(pending):
+                found[key] = self._cache[key] = ScheduleSolution(
+                    key[0], strategies[row], competitor[row], float(values[row]),
+                    float(gaps[row]), done)
+            logger.debug(f"Solved {len(pending)} posting games in {done} iterations")
+        # Evict only after this batch has its answers, so a batch larger than
+        # the cache still gets every solution back
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        if metrics.enabled:
+            metrics.inc('codex_schedule_cache_hits_total', len(keys) - len(pending),
+                        'Posting games answered from the solution cache')
+        return [found[key] for key in keys]
+
+    def solve(self, platform: str, competitors: Sequence[Dict[str, Any]]) -> ScheduleSolution:
+        return self.equilibria([platform], [self.profile(competitors)])[0]
+
+    def schedule_accounts(self, accounts: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Daily schedules for many accounts
+
+        Each account dict holds platform, competitors (competitor dicts)
+        and optionally account_id / accountId and postsPerDay.
+        """
+        platforms = [str(account.get('platform', '')) for account in accounts]
+        profiles = [self.profile(account.get('competitors', [])) for account in accounts]
+        solutions = self.equilibria(platforms, profiles)
+        schedules = []
+        for account, solution in zip(accounts, solutions):
+            posts = int(account.get('postsPerDay', account.get('posts_per_day', 3)))
+            result = solution.to_dict(posts)
+            result['account_id'] = account.get('account_id', account.get('accountId'))
+            schedules.append(result)
+        return schedules
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    @property
+    def cache_info(self) -> Dict[str, int]:
+        return {'size': len(self._cache), 'max_size': self.cache_size}
+
+
+def create_posting_scheduler(slots: int = 24) -> GameTheoryScheduler:
+    """Create a game-theoretic posting scheduler"""
+    return GameTheoryScheduler(slots=slots)
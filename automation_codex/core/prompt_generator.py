@@ -0,0 +1,221 @@
+"""
+Prompt Generator Module
+Combinatorial prompt generation from the Amphetamemes template structure
+
+Prompts follow the template's [SUBJECT] + [STYLE] + [MOOD] + [CONTEXT] +
+[TECHNICAL] format. Element lists come from the template's core elements,
+with subjects and contexts taken from the hand-written prompt series.
+Combinations are produced lazily (full enumeration or sampling without
+replacement), scored in batches with
+ContentComplexityAnalyzer.batch_complexity_scores and streamed to disk, so
+memory stays bounded by the batch size. Element lists are deduplicated, so
+distinct combinations are distinct prompts unless an element contains the
+separator; an opt-in, bounded digest window drops repeats for that case.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import math
+import random
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..utils.lazy_import import lazy_import
+from .mathematical_models import ContentComplexityAnalyzer
+from .prompt_templates import AMPHETAMEMES_TEMPLATE, PROMPT_TEMPLATES
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELDS = ('entropy', 'lexical_diversity', 'complexity_score')
+_YEAR_SUFFIX = re.compile(r'\s*\(\d{4}\)$')
+
+
+@dataclass
+class PromptElements:
+    """Element lists for each slot of the prompt format"""
+    subjects: List[str]
+    styles: List[str]
+    moods: List[str]
+    contexts: List[str]
+    technical: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_template(cls, template: Optional[Dict[str, Any]] = None,
+                      templates: Optional[List[Dict[str, str]]] = None) -> 'PromptElements':
+        """Elements of the template structure plus subjects/contexts from a prompt series"""
+        template = template or AMPHETAMEMES_TEMPLATE
+        templates = PROMPT_TEMPLATES if templates is None else templates
+        core = template['core_elements']
+        # A hand-written prompt opens with its subject clause
+        subjects = [t['full_prompt'].split(', ')[0] for t in templates if t.get('full_prompt')]
+        contexts = [f"commenting on {_YEAR_SUFFIX.sub('', t['current_narrative'])}"
+                    for t in templates if t.get('current_narrative')]
+        return cls(subjects=subjects, styles=list(core['visual_style']),
+                   moods=list(core['mood_keywords']), contexts=contexts,
+                   technical=list(core['technical_specs']))
+
+    def slots(self) -> List[List[str]]:
+        """Element lists in format order, empty slots left out"""
+        return [values for values in (self.subjects, self.styles, self.moods,
+                                      self.contexts, self.technical) if values]
+
+    def deduplicated(self) -> 'PromptElements':
+        """Copy with duplicate and blank elements removed, order kept"""
+        def unique(values: List[str]) -> List[str]:
+            return list(dict.fromkeys(value.strip() for value in values if value.strip()))
+        return PromptElements(unique(self.subjects), unique(self.styles), unique(self.moods),
+                              unique(self.contexts), unique(self.technical))
+
+
+class CombinatorialPromptGenerator:
+    """Lazy enumerator/sampler over every combination of prompt elements"""
+
+    def __init__(self, elements: Optional[PromptElements] = None, separator: str = ', ',
+                 dedupe: bool = False, dedupe_window: int = 1_000_000):
+        self.elements = (elements or PromptElements.from_template()).deduplicated()
+        self.separator = separator
+        self.dedupe = dedupe
+        self.dedupe_window = dedupe_window
+        self._slots = self.elements.slots()
+        if not self._slots:
+            raise ValueError("At least one prompt element list must be non-empty")
+        self._radices = [len(values) for values in self._slots]
+
+    @property
+    def total_combinations(self) -> int:
+        """Number of distinct element combinations"""
+        return math.prod(self._radices)
+
+    def prompt_at(self, index: int) -> str:
+        """Prompt for combination index (mixed-radix, last slot varies fastest)"""
+        if not 0 <= index < self.total_combinations:
+            raise ValueError(f"Combination index out of range: {index}")
+        parts = []
+        for values, radix in zip(reversed(self._slots), reversed(self._radices)):
+            index, digit = divmod(index, radix)
+            parts.append(values[digit])
+        return self.separator.join(reversed(parts))
+
+    def iter_prompts(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """Enumerate prompts for combination indexes [start, stop) in order"""
+        join = self.separator.join
+        combinations = itertools.product(*self._slots)
+        return self._deduplicate(join(parts)
+                                 for parts in itertools.islice(combinations, start, stop))
+
+    def sample(self, count: int, seed: Optional[int] = None) -> Iterator[str]:
+        """Up to count distinct prompts in pseudo-random order, in O(1) memory
+
+        Walks the combination indexes through a random affine permutation
+        (offset + i * step) mod total with step coprime to total, so no index
+        list is ever materialized and no index repeats.
+        """
+        if count < 0:
+            raise ValueError(f"count must be non-negative, got {count}")
+        total = self.total_combinations
+        rng = random.Random(seed)
+        step = 1
+        if total > 2:
+            step = rng.randrange(1, total)
+            while math.gcd(step, total) != 1:
+                step = rng.randrange(1, total)
+        offset = rng.randrange(total)
+        return self._deduplicate(self.prompt_at((offset + i * step) % total)
+                                 for i in range(min(count, total)))
+
+    def score_batches(self, prompts: Iterable[str],
+                      batch_size: int = 4096) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """Yield (prompts, scores) per batch; scores rows are SCORE_FIELDS"""
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        iterator = iter(prompts)
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch, ContentComplexityAnalyzer.batch_complexity_scores(batch)
+
+    def stream_to_file(self, path: Union[str, Path], count: Optional[int] = None,
+                       sample: bool = False, seed: Optional[int] = None,
+                       batch_size: int = 4096,
+                       min_complexity: Optional[float] = None) -> Dict[str, Any]:
+        """Generate, score and write prompts to path, one batch in memory at a time
+
+        Writes CSV for .csv paths and NDJSON otherwise; a trailing .gz
+        compresses the output. Enumerates the first count combinations, or
+        samples count of them when sample is set. Returns run statistics.
+        """
+        path = Path(path)
+        if sample:
+            prompts = self.sample(count if count is not None else self.total_combinations, seed)
+        else:
+            prompts = self.iter_prompts(0, count)
+
+        is_csv = path.suffixes[-2:-1] == ['.csv'] if path.suffix == '.gz' else path.suffix == '.csv'
+        opener = gzip.open if path.suffix == '.gz' else open
+        generated = written = 0
+        started = time.perf_counter()
+        with opener(path, 'wt', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f) if is_csv else None
+            if writer is not None:
+                writer.writerow(['prompt', *SCORE_FIELDS])
+            for batch, scores in self.score_batches(prompts, batch_size):
+                generated += len(batch)
+                keep = (np.arange(len(batch)) if min_complexity is None
+                        else np.flatnonzero(scores[:, 2] >= min_complexity))
+                rows = scores[keep].tolist()
+                if writer is not None:
+                    writer.writerows([batch[i], *row] for i, row in zip(keep.tolist(), rows))
+                else:
+                    f.write(''.join(json.dumps({'prompt': batch[i], **dict(zip(SCORE_FIELDS, row))}) + '\n'
+                                    for i, row in zip(keep.tolist(), rows)))
+                written += len(rows)
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            'path': str(path),
+            'generated': generated,
+            'written': written,
+            'seconds': elapsed,
+            'prompts_per_minute': generated / elapsed * 60 if elapsed > 0 else 0.0
+        }
+        logger.info(f"Wrote {written} of {generated} generated prompts to {path} "
+                    f"({stats['prompts_per_minute']:,.0f}/min)")
+        return stats
+
+    def _deduplicate(self, prompts: Iterable[str]) -> Iterator[str]:
+        """Drop prompts repeated within the last dedupe_window distinct prompts
+
+        Off by default. Prompts are keyed by a 128-bit BLAKE2b digest, and
+        the oldest digests are evicted once the window is full, so memory is
+        bounded at about 100 bytes per window slot.
+        """
+        if not self.dedupe:
+            yield from prompts
+            return
+        seen: 'OrderedDict[bytes, None]' = OrderedDict()
+        for prompt in prompts:
+            digest = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest()
+            if digest in seen:
+                continue
+            seen[digest] = None
+            if len(seen) > self.dedupe_window:
+                seen.popitem(last=False)
+            yield prompt
+
+
+def create_prompt_generator(elements: Optional[PromptElements] = None) -> CombinatorialPromptGenerator:
+    """Create a prompt generator over the Amphetamemes template structure"""
+    return CombinatorialPromptGenerator(elements)
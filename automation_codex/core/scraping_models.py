@@ -0,0 +1,993 @@
+"""
+Mathematical Models Core Module
+Advanced mathematical foundations for scraper orchestration and optimization
+
+This module implements state-of-the-art mathematical models including:
+- Graph Theory for network analysis and traversal optimization
+- Automata Theory for state-based scraper behavior
+- Information Theory for entropy-based content classification
+- Markov Decision Processes for self-healing pipelines
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple, Any, Optional, Set, FrozenSet, Iterable, Iterator, IO, Union, TYPE_CHECKING
+from dataclasses import dataclass, fields
+from enum import Enum
+import logging
+import json
+from collections import defaultdict
+import random
+import math
+import heapq
+import gzip
+import sys
+from itertools import islice
+from pathlib import Path
+
+from ..utils.lazy_import import lazy_import
+from ..utils.metrics import metrics, timed
+from ..utils.process_pool import create_process_pool
+from ..utils.sampling_profiler import maybe_start_profiler
+from .content_cache import memoize_content
+from .execution_plan import ExecutionPlan, build_execution_plan
+
+# Heavy dependencies are loaded on first use, not at import time
+np = lazy_import('numpy')
+nx = lazy_import('networkx')
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class ScraperState(Enum):
+    """Automata states for scraper behavior"""
+    IDLE = "idle"
+    CONNECTING = "connecting" 
+    AUTHENTICATED = "authenticated"
+    SCRAPING = "scraping"
+    PROCESSING = "processing"
+    ERROR = "error"
+    RECOVERY = "recovery"
+    COMPLETED = "completed"
+
+@dataclass
+class GraphNode:
+    """Represents a node in the scraping dependency graph"""
+    id: str
+    url: str
+    content_type: str
+    priority: float
+    dependencies: Set[str]
+    metadata: Dict[str, Any]
+
+_NO_DEPENDENCIES: FrozenSet[str] = frozenset()
+
+@dataclass(slots=True)
+class CompactGraphNode:
+    """Memory-lean scraping graph node
+
+    Slotted (no per-instance __dict__), with interned id/content_type and
+    dependency ids, a shared empty dependency set and optional metadata.
+    ScrapingGraph keeps its metadata on the node only instead of copying it
+    into the networkx node attributes.
+    """
+    id: str
+    url: str
+    content_type: str
+    priority: float
+    dependencies: FrozenSet[str] = _NO_DEPENDENCIES
+    metadata: Optional[Dict[str, Any]] = None
+    
+    def __post_init__(self):
+        self.id = sys.intern(self.id)
+        self.content_type = sys.intern(self.content_type)
+        if self.dependencies:
+            self.dependencies = frozenset(sys.intern(dep) for dep in self.dependencies)
+        else:
+            self.dependencies = _NO_DEPENDENCIES
+    
+def _batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _node_fields(node: Any) -> Dict[str, Any]:
+    """Field values of a (possibly slotted) node dataclass"""
+    return {f.name: getattr(node, f.name) for f in fields(node)}
+
+def _iter_ndjson(stream: IO[str], source_name: str) -> Iterator[Dict[str, Any]]:
+    """Parse NDJSON records lazily, skipping blank and malformed lines"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed record at {source_name}:{line_number}: {e}")
+
+class DependencyScheduler:
+    """Incremental dependency-aware priority scheduler
+
+    Keeps a max-heap over the ready set (nodes whose predecessors have all
+    completed) using the same ordering constraint as topological traversal:
+    an edge u -> v schedules u before v. That is the graph's convention
+    throughout (ScrapingGraph.add_dependency(u, v) and load_records store
+    node -> dependency edges, so a node is taken before its listed
+    dependencies), and push(predecessors=) adds edges of the same direction.
+    Jobs are taken with pop() and
+    reported back with complete(), which releases successors in O(out-degree
+    * log n). Priority changes are applied lazily: stale heap entries are
+    skipped when popped.
+    """
+    
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._priority: Dict[str, float] = {}
+        self._pending_count: Dict[str, int] = {}
+        self._successors: Dict[str, List[str]] = defaultdict(list)
+        self._in_flight: Set[str] = set()
+        self._completed: Set[str] = set()
+        self._sequence = 0
+    
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph, priorities: Dict[str, float],
+                   default_priority: float = 1.0) -> 'DependencyScheduler':
+        """Build a scheduler over every node and edge of graph
+
+        An edge u -> v makes v wait for u, as push(v, predecessors=[u]) does.
+        """
+        scheduler = cls()
+        for node_id in graph.nodes():
+            scheduler._priority[node_id] = priorities.get(node_id, default_priority)
+            scheduler._pending_count[node_id] = graph.in_degree(node_id)
+        for source_id, target_id in graph.edges():
+            scheduler._successors[source_id].append(target_id)
+        for node_id, count in scheduler._pending_count.items():
+            if count == 0:
+                scheduler._push_ready(node_id)
+        return scheduler
+    
+    def push(self, node_id: str, priority: float = 1.0, predecessors: Iterable[str] = ()) -> None:
+        """Add a node, or change its priority if already known
+
+        predecessors lists nodes that must complete before node_id becomes
+        ready, i.e. the sources of edges pred -> node_id in from_graph's
+        convention; nodes that have already completed are ignored.
+        """
+        if node_id in self._priority:
+            self.update_priority(node_id, priority)
+            if predecessors:
+                logger.warning(f"Ignoring new predecessors for already scheduled node {node_id}")
+            return
+        
+        self._priority[node_id] = priority
+        blockers = [pred for pred in set(predecessors) if pred not in self._completed]
+        for pred in blockers:
+            self._successors[pred].append(node_id)
+        self._pending_count[node_id] = len(blockers)
+        if not blockers:
+            self._push_ready(node_id)
+    
+    def update_priority(self, node_id: str, priority: float) -> None:
+        """Change the priority of a scheduled node"""
+        if node_id not in self._priority:
+            raise KeyError(node_id)
+        self._priority[node_id] = priority
+        if self._is_ready(node_id):
+            self._push_ready(node_id)
+    
+    def pop(self) -> Optional[str]:
+        """Take the highest-priority ready node, or None if nothing is ready"""
+        while self._heap:
+            neg_priority, _, node_id = heapq.heappop(self._heap)
+            if self._is_ready(node_id) and -neg_priority == self._priority[node_id]:
+                self._in_flight.add(node_id)
+                return node_id
+        return None
+    
+    def complete(self, node_id: str) -> List[str]:
+        """Mark a node finished and return the successors it made ready"""
+        if node_id in self._completed:
+            return []
+        self._in_flight.discard(node_id)
+        self._completed.add(node_id)
+        self._pending_count[node_id] = 0
+        
+        released = []
+        for succ in self._successors.pop(node_id, ()):
+            if succ in self._completed:
+                continue
+            self._pending_count[succ] -= 1
+            if self._pending_count[succ] == 0:
+                self._push_ready(succ)
+                released.append(succ)
+        return released
+    
+    def release(self, node_id: str) -> None:
+        """Make a blocked node ready regardless of its predecessors"""
+        if self._is_ready(node_id) or node_id in self._in_flight or node_id in self._completed:
+            return
+        self._pending_count[node_id] = 0
+        self._push_ready(node_id)
+    
+    def blocked(self) -> List[str]:
+        """Nodes still waiting on at least one predecessor"""
+        return [node_id for node_id, count in self._pending_count.items()
+                if count > 0 and node_id not in self._completed]
+    
+    @property
+    def in_flight(self) -> Set[str]:
+        """Nodes popped but not yet completed"""
+        return set(self._in_flight)
+    
+    def priority_of(self, node_id: str) -> float:
+        """Current priority of a scheduled node"""
+        return self._priority[node_id]
+    
+    def ready_count(self) -> int:
+        """Number of nodes ready to be popped"""
+        return sum(1 for node_id in self._priority if self._is_ready(node_id))
+    
+    def has_pending(self) -> bool:
+        """Whether any node has not completed yet"""
+        return len(self._completed) < len(self._priority)
+    
+    def __len__(self) -> int:
+        return len(self._priority) - len(self._completed)
+    
+    def _is_ready(self, node_id: str) -> bool:
+        return (self._pending_count.get(node_id) == 0
+                and node_id not in self._in_flight
+                and node_id not in self._completed)
+    
+    def _push_ready(self, node_id: str) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (-self._priority[node_id], self._sequence, node_id))
+
+class ScrapingGraph:
+    """Graph theory implementation for scraping optimization"""
+    
+    def __init__(self):
+        self.graph = nx.DiGraph()
+        self.nodes: Dict[str, Union[GraphNode, CompactGraphNode]] = {}
+        self.traversal_strategies = {
+            'dfs': self._dfs_traversal,
+            'bfs': self._bfs_traversal, 
+            'priority': self._priority_traversal,
+            'dependency': self._dependency_traversal,
+            'scheduled': self._scheduled_traversal,
+            'condensed': self._condensed_traversal
+        }
+    
+    def add_node(self, node: Union[GraphNode, CompactGraphNode]) -> None:
+        """Add node to scraping graph"""
+        self.nodes[node.id] = node
+        if isinstance(node, CompactGraphNode):
+            self.graph.add_node(node.id)
+        else:
+            self.graph.add_node(node.id, **node.metadata)
+        if metrics.enabled:
+            metrics.inc('codex_graph_mutations_total', graph='scraping', op='add_node')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Added node {node.id} to scraping graph")
+    
+    def add_dependency(self, source_id: str, target_id: str, weight: float = 1.0) -> None:
+        """Add dependency edge between nodes"""
+        self.graph.add_edge(source_id, target_id, weight=weight)
+        if metrics.enabled:
+            metrics.inc('codex_graph_mutations_total', graph='scraping', op='add_edge')
+        if source_id in self.nodes:
+            node = self.nodes[source_id]
+            if isinstance(node.dependencies, frozenset):
+                node.dependencies = node.dependencies | {target_id}
+            else:
+                node.dependencies.add(target_id)
+    
+    def load_records(self, records: Iterable[Dict[str, Any]], batch_size: int = 10_000,
+                     link_dependencies: bool = True, compact: bool = False) -> int:
+        """Stream URL records into the graph in bounded batches
+
+        Records use the same shape as scenario 'urls' entries (id, url, type,
+        priority, dependencies, metadata). Ids, content types and dependency
+        ids are interned so repeated references share one string object, and
+        nodes/edges are bulk-inserted once per batch. Only one batch of
+        records is held in memory at a time. With compact=True nodes are
+        stored as CompactGraphNode. Returns the number of nodes added.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        
+        total = 0
+        for batch in _batched(records, batch_size):
+            nodes = []
+            edges = []
+            for record in batch:
+                node_id = sys.intern(str(record['id']))
+                dependencies = {sys.intern(str(dep)) for dep in record.get('dependencies', ())}
+                if compact:
+                    node = CompactGraphNode(
+                        id=node_id,
+                        url=record['url'],
+                        content_type=record.get('type', 'unknown'),
+                        priority=record.get('priority', 1.0),
+                        dependencies=dependencies,
+                        metadata=record.get('metadata')
+                    )
+                    nodes.append(node_id)
+                else:
+                    node = GraphNode(
+                        id=node_id,
+                        url=record['url'],
+                        content_type=sys.intern(record.get('type', 'unknown')),
+                        priority=record.get('priority', 1.0),
+                        dependencies=dependencies,
+                        metadata=record.get('metadata', {})
+                    )
+                    nodes.append((node_id, node.metadata))
+                self.nodes[node_id] = node
+                if link_dependencies:
+                    edges.extend((node_id, dep, {'weight': 1.0}) for dep in dependencies)
+            
+            self.graph.add_nodes_from(nodes)
+            self.graph.add_edges_from(edges)
+            total += len(nodes)
+            if metrics.enabled:
+                metrics.inc('codex_graph_mutations_total', len(nodes), graph='scraping', op='add_node')
+                metrics.inc('codex_graph_mutations_total', len(edges), graph='scraping', op='add_edge')
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Loaded batch of {len(nodes)} nodes and {len(edges)} edges "
+                             f"into scraping graph")
+        
+        return total
+    
+    def load_ndjson(self, source: Union[str, Path, IO[str]], batch_size: int = 10_000,
+                    link_dependencies: bool = True, compact: bool = False) -> int:
+        """Stream an NDJSON/JSONL feed of URL records into the graph
+
+        source may be a path (gzip-compressed if it ends in .gz) or an open
+        text stream. Blank lines are ignored and malformed lines are skipped
+        with a warning.
+        """
+        if isinstance(source, (str, Path)):
+            path = Path(source)
+            opener = gzip.open if path.suffix == '.gz' else open
+            with opener(path, 'rt', encoding='utf-8') as stream:
+                return self.load_records(_iter_ndjson(stream, str(path)), batch_size,
+                                         link_dependencies, compact)
+        return self.load_records(_iter_ndjson(source, getattr(source, 'name', '<stream>')),
+                                 batch_size, link_dependencies, compact)
+    
+    def optimize_traversal_order(self, strategy: str = 'dependency',
+                                 lazy: bool = False) -> Union[List[str], Iterator[str]]:
+        """Optimize node traversal order using graph algorithms
+
+        With lazy=True an iterator is returned instead of a list; for the
+        'scheduled' strategy nodes are then produced one at a time as the
+        consumer advances.
+        """
+        if strategy not in self.traversal_strategies:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        
+        if lazy and strategy == 'scheduled':
+            return self.iter_scheduled()
+        with metrics.timer('codex_graph_analysis_seconds', graph='scraping',
+                           op=f"traversal_{strategy}"):
+            order = self.traversal_strategies[strategy]()
+        return iter(order) if lazy else order
+    
+    def create_scheduler(self) -> DependencyScheduler:
+        """Create an incremental priority scheduler over the current graph"""
+        priorities = {node_id: node.priority for node_id, node in self.nodes.items()}
+        return DependencyScheduler.from_graph(self.graph, priorities)
+    
+    def iter_scheduled(self, scheduler: Optional[DependencyScheduler] = None) -> Iterator[str]:
+        """Lazily yield nodes in dependency-respecting priority order
+
+        Each yielded node is marked complete when the consumer asks for the
+        next one. If only cyclic nodes remain, the highest-priority blocked
+        node is released to break the cycle.
+        """
+        scheduler = scheduler or self.create_scheduler()
+        while scheduler.has_pending():
+            node_id = scheduler.pop()
+            if node_id is None:
+                if scheduler.in_flight:
+                    return
+                blocked = scheduler.blocked()
+                if not blocked:
+                    return
+                forced = max(blocked, key=scheduler.priority_of)
+                logger.warning(f"Circular dependencies detected, releasing {forced}")
+                scheduler.release(forced)
+                continue
+            yield node_id
+            scheduler.complete(node_id)
+    
+    def _scheduled_traversal(self) -> List[str]:
+        """Dependency-aware priority traversal using an incremental heap scheduler"""
+        return list(self.iter_scheduled())
+    
+    def _dependency_traversal(self) -> List[str]:
+        """Topological sort for dependency-aware traversal"""
+        try:
+            return list(nx.topological_sort(self.graph))
+        except nx.NetworkXUnfeasible:
+            logger.warning("Circular dependencies detected, falling back to SCC condensation")
+            return self._condensed_traversal()
+    
+    def strongly_connected_batches(self) -> List[List[str]]:
+        """Strongly connected components in dependency order
+
+        The graph is condensed into a DAG of SCCs which is sorted
+        topologically; nodes inside each component are ordered by priority
+        (highest first, insertion order on ties). Every node appears exactly
+        once, and each cycle forms one batch that can be fetched together.
+        """
+        condensed = nx.condensation(self.graph)
+        insertion_order = {node_id: i for i, node_id in enumerate(self.graph.nodes())}
+        
+        def sort_key(node_id: str) -> Tuple[float, int]:
+            return (-self._node_priority(node_id), insertion_order[node_id])
+        
+        return [sorted(condensed.nodes[component]['members'], key=sort_key)
+                for component in nx.topological_sort(condensed)]
+    
+    def cyclic_components(self) -> List[List[str]]:
+        """SCC batches that actually contain a cycle"""
+        return [batch for batch in self.strongly_connected_batches()
+                if len(batch) > 1 or self.graph.has_edge(batch[0], batch[0])]
+    
+    def build_execution_plan(self, costs: Optional[Dict[str, float]] = None,
+                             max_concurrency: Optional[int] = None) -> ExecutionPlan:
+        """Group nodes into concurrently fetchable levels
+
+        costs are per-node fetch cost estimates; levels hold at most
+        max_concurrency nodes and are filled critical-path first. Drive the
+        plan with execution_plan.run_execution_plan and an async fetch
+        coroutine.
+        """
+        priorities = {node_id: node.priority for node_id, node in self.nodes.items()}
+        return build_execution_plan(self.graph, costs=costs, max_concurrency=max_concurrency,
+                                    priorities=priorities)
+    
+    def _condensed_traversal(self) -> List[str]:
+        """Cycle-tolerant traversal over the SCC condensation"""
+        return [node_id for batch in self.strongly_connected_batches() for node_id in batch]
+    
+    def _node_priority(self, node_id: str) -> float:
+        """Priority of a node, defaulting for nodes only known through edges"""
+        node = self.nodes.get(node_id)
+        return node.priority if node is not None else 1.0
+    
+    def _priority_traversal(self) -> List[str]:
+        """Priority-based traversal using node priorities"""
+        return sorted(self.nodes.keys(), 
+                     key=lambda x: self.nodes[x].priority, 
+                     reverse=True)
+    
+    def _dfs_traversal(self) -> List[str]:
+        """Depth-first search traversal"""
+        if not self.graph.nodes():
+            return []
+        start_node = next(iter(self.graph.nodes()))
+        return list(nx.dfs_preorder_nodes(self.graph, start_node))
+    
+    def _bfs_traversal(self) -> List[str]:
+        """Breadth-first search traversal"""
+        if not self.graph.nodes():
+            return []
+        start_node = next(iter(self.graph.nodes()))
+        return list(nx.bfs_tree(self.graph, start_node))
+    
+    @timed('codex_graph_analysis_seconds', graph='scraping', op='bottlenecks')
+    def detect_bottlenecks(self) -> List[str]:
+        """Identify bottleneck nodes using centrality measures"""
+        betweenness = nx.betweenness_centrality(self.graph)
+        threshold = np.percentile(list(betweenness.values()), 80)
+        return [node for node, centrality in betweenness.items() 
+                if centrality > threshold]
+    
+    def export_visualization(self, filepath: str) -> None:
+        """Export graph visualization data"""
+        graph_data = {
+            'nodes': [{'id': node_id, **_node_fields(self.nodes[node_id])} 
+                     for node_id in self.graph.nodes()],
+            'edges': [{'source': u, 'target': v, **data} 
+                     for u, v, data in self.graph.edges(data=True)]
+        }
+        with open(filepath, 'w') as f:
+            json.dump(graph_data, f, indent=2, default=str)
+
+class ScraperAutomaton:
+    """Finite state automaton for scraper behavior modeling"""
+    
+    def __init__(self):
+        self.current_state = ScraperState.IDLE
+        self.state_transitions = self._build_transition_table()
+        self.state_history: List[ScraperState] = [ScraperState.IDLE]
+        self.transition_counts = defaultdict(int)
+    
+    def _build_transition_table(self) -> Dict[ScraperState, Set[ScraperState]]:
+        """Build valid state transition table"""
+        return {
+            ScraperState.IDLE: {ScraperState.CONNECTING},
+            ScraperState.CONNECTING: {ScraperState.AUTHENTICATED, ScraperState.ERROR},
+            ScraperState.AUTHENTICATED: {ScraperState.SCRAPING, ScraperState.ERROR},
+            ScraperState.SCRAPING: {ScraperState.PROCESSING, ScraperState.ERROR, ScraperState.COMPLETED},
+            ScraperState.PROCESSING: {ScraperState.SCRAPING, ScraperState.COMPLETED, ScraperState.ERROR},
+            ScraperState.ERROR: {ScraperState.RECOVERY, ScraperState.IDLE},
+            ScraperState.RECOVERY: {ScraperState.CONNECTING, ScraperState.IDLE},
+            ScraperState.COMPLETED: {ScraperState.IDLE}
+        }
+    
+    def transition_to(self, new_state: ScraperState) -> bool:
+        """Attempt state transition with validation"""
+        if new_state not in self.state_transitions[self.current_state]:
+            logger.error(f"Invalid transition from {self.current_state} to {new_state}")
+            return False
+        
+        old_state = self.current_state
+        self.current_state = new_state
+        self.state_history.append(new_state)
+        self.transition_counts[(old_state, new_state)] += 1
+        if metrics.enabled:
+            metrics.inc('codex_scraper_transitions_total', from_state=old_state.value,
+                        to_state=new_state.value)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"State transition: {old_state} -> {new_state}")
+        return True
+    
+    def get_valid_transitions(self) -> Set[ScraperState]:
+        """Get all valid transitions from current state"""
+        return self.state_transitions[self.current_state]
+    
+    def analyze_transition_patterns(self) -> Dict[str, Any]:
+        """Analyze state transition patterns for optimization"""
+        total_transitions = sum(self.transition_counts.values())
+        if total_transitions == 0:
+            return {}
+        
+        patterns = {}
+        for (from_state, to_state), count in self.transition_counts.items():
+            probability = count / total_transitions
+            patterns[f"{from_state.value}->{to_state.value}"] = {
+                'count': count,
+                'probability': probability
+            }
+        
+        # Identify problematic patterns
+        error_rate = sum(count for (_, to_state), count in self.transition_counts.items() 
+                        if to_state == ScraperState.ERROR) / total_transitions
+        
+        patterns['analysis'] = {
+            'total_transitions': total_transitions,
+            'error_rate': error_rate,
+            'most_common_path': max(patterns.keys(), key=lambda x: patterns[x]['count']) if patterns else None
+        }
+        
+        return patterns
+
+class InformationTheoryAnalyzer:
+    """Information theory tools for content classification and entropy analysis"""
+    
+    @staticmethod
+    @timed('codex_analyzer_seconds', analyzer='information_theory', method='calculate_entropy')
+    @memoize_content()
+    def calculate_entropy(content: str) -> float:
+        """Calculate Shannon entropy of content"""
+        if not content:
+            return 0.0
+        
+        # Character frequency analysis
+        char_counts = defaultdict(int)
+        for char in content:
+            char_counts[char] += 1
+        
+        total_chars = len(content)
+        entropy = 0.0
+        
+        for count in char_counts.values():
+            probability = count / total_chars
+            entropy -= probability * math.log2(probability)
+        
+        return entropy
+    
+    @staticmethod
+    @timed('codex_analyzer_seconds', analyzer='information_theory', method='mutual_information')
+    @memoize_content()
+    def mutual_information(content1: str, content2: str) -> float:
+        """Calculate mutual information between two content pieces"""
+        # Simplified implementation using character bigrams
+        def get_bigram_distribution(text):
+            bigrams = defaultdict(int)
+            for i in range(len(text) - 1):
+                bigrams[text[i:i+2]] += 1
+            total = sum(bigrams.values())
+            return {k: v/total for k, v in bigrams.items()} if total > 0 else {}
+        
+        dist1 = get_bigram_distribution(content1)
+        dist2 = get_bigram_distribution(content2)
+        
+        if not dist1 or not dist2:
+            return 0.0
+        
+        # Calculate mutual information
+        mi = 0.0
+        all_bigrams = set(dist1.keys()) | set(dist2.keys())
+        
+        for bigram in all_bigrams:
+            p1 = dist1.get(bigram, 0)
+            p2 = dist2.get(bigram, 0)
+            joint_prob = (p1 + p2) / 2  # Simplified joint probability
+            
+            if joint_prob > 0 and p1 > 0 and p2 > 0:
+                mi += joint_prob * math.log2(joint_prob / (p1 * p2))
+        
+        return max(0, mi)
+    
+    @staticmethod
+    @timed('codex_analyzer_seconds', analyzer='information_theory', method='content_complexity_score')
+    @memoize_content()
+    def content_complexity_score(content: str) -> Dict[str, float]:
+        """Calculate comprehensive content complexity metrics"""
+        if not content:
+            return {'entropy': 0, 'compression_ratio': 0, 'lexical_diversity': 0}
+        
+        # Shannon entropy
+        entropy = InformationTheoryAnalyzer.calculate_entropy(content)
+        
+        # Compression ratio (using simple run-length encoding approximation)
+        compressed_length = len(''.join(set(content)))
+        compression_ratio = compressed_length / len(content)
+        
+        # Lexical diversity (unique words / total words)
+        words = content.lower().split()
+        lexical_diversity = len(set(words)) / len(words) if words else 0
+        
+        return {
+            'entropy': entropy,
+            'compression_ratio': compression_ratio,
+            'lexical_diversity': lexical_diversity,
+            'complexity_score': entropy * lexical_diversity / compression_ratio if compression_ratio > 0 else 0
+        }
+
+class MarkovDecisionProcess:
+    """MDP for self-healing scraping pipeline decisions"""
+    
+    def __init__(self, states: List[str], actions: List[str]):
+        self.states = states
+        self.actions = actions
+        self.q_table = np.zeros((len(states), len(actions)))
+        self.transition_probs = np.ones((len(states), len(actions), len(states))) / len(states)
+        self.rewards = np.zeros((len(states), len(actions)))
+        self.state_to_index = {state: i for i, state in enumerate(states)}
+        self.action_to_index = {action: i for i, action in enumerate(actions)}
+        self.learning_rate = 0.1
+        self.discount_factor = 0.9
+        self.epsilon = 0.1
+    
+    def get_state_index(self, state: str) -> int:
+        """Get index for state"""
+        return self.state_to_index.get(state, 0)
+    
+    def get_action_index(self, action: str) -> int:
+        """Get index for action"""
+        return self.action_to_index.get(action, 0)
+    
+    @timed('codex_mdp_update_seconds', model='scraping')
+    def update_q_value(self, state: str, action: str, reward: float, next_state: str) -> None:
+        """Update Q-value using Q-learning"""
+        s_idx = self.get_state_index(state)
+        a_idx = self.get_action_index(action)
+        ns_idx = self.get_state_index(next_state)
+        
+        # Q-learning update rule
+        current_q = self.q_table[s_idx, a_idx]
+        max_next_q = np.max(self.q_table[ns_idx, :])
+        new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
+        
+        self.q_table[s_idx, a_idx] = new_q
+    
+    def select_action(self, state: str) -> str:
+        """Select action using epsilon-greedy policy"""
+        s_idx = self.get_state_index(state)
+        
+        if random.random() < self.epsilon:
+            # Exploration: random action
+            return random.choice(self.actions)
+        else:
+            # Exploitation: best known action
+            best_action_idx = np.argmax(self.q_table[s_idx, :])
+            return self.actions[best_action_idx]
+    
+    def get_policy(self) -> Dict[str, str]:
+        """Get current optimal policy"""
+        policy = {}
+        for state in self.states:
+            s_idx = self.get_state_index(state)
+            best_action_idx = np.argmax(self.q_table[s_idx, :])
+            policy[state] = self.actions[best_action_idx]
+        return policy
+    
+    def save_model(self, filepath: str) -> None:
+        """Save MDP model to file"""
+        model_data = {
+            'states': self.states,
+            'actions': self.actions,
+            'q_table': self.q_table.tolist(),
+            'transition_probs': self.transition_probs.tolist(),
+            'rewards': self.rewards.tolist(),
+            'hyperparameters': {
+                'learning_rate': self.learning_rate,
+                'discount_factor': self.discount_factor,
+                'epsilon': self.epsilon
+            }
+        }
+        with open(filepath, 'w') as f:
+            json.dump(model_data, f, indent=2)
+
+def _score_content_chunk(samples: List[str]) -> List[Dict[str, float]]:
+    """Score a chunk of content samples (process pool worker)"""
+    return [InformationTheoryAnalyzer.content_complexity_score(content) for content in samples]
+
+class MathematicalModelsOrchestrator:
+    """Main orchestrator for all mathematical models"""
+    
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 256,
+                 min_parallel_samples: int = 512):
+        self.graph = ScrapingGraph()
+        self.automaton = ScraperAutomaton()
+        self.info_analyzer = InformationTheoryAnalyzer()
+        self.mdp = None  # Initialize when states/actions are defined
+        self.models_registry = {}
+        
+        # Parallel analysis settings; pools are created on first use
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.min_parallel_samples = min_parallel_samples
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Opt-in sampling profiler for long jobs (CODEX_PROFILE_HZ)
+        maybe_start_profiler()
+    
+    def register_model(self, name: str, model: Any) -> None:
+        """Register a mathematical model"""
+        self.models_registry[name] = model
+        logger.info(f"Registered mathematical model: {name}")
+    
+    @timed('codex_scenario_analysis_seconds', mode='single')
+    def analyze_scraping_scenario(self, scenario_data: Dict[str, Any],
+                                  parallel: bool = False) -> Dict[str, Any]:
+        """Comprehensive analysis using all mathematical models
+
+        With parallel=True the graph stage runs on a worker thread while
+        content samples are scored in chunks on a process pool.
+        """
+        if parallel:
+            return self.analyze_scenarios([scenario_data])[0]
+
+        results = self._empty_results()
+        
+        # Graph theory analysis
+        if 'urls' in scenario_data or 'url_feed' in scenario_data:
+            results['graph_analysis'] = self._analyze_graph(scenario_data)
+        
+        # Information theory analysis
+        if 'content_samples' in scenario_data:
+            content_metrics = [self.info_analyzer.content_complexity_score(content)
+                               for content in scenario_data['content_samples']]
+            results['information_analysis'] = self._summarize_content_metrics(content_metrics)
+        
+        # Generate recommendations
+        results['recommendations'] = self._generate_recommendations(results)
+        
+        return results
+    
+    @timed('codex_scenario_analysis_seconds', mode='batch')
+    def analyze_scenarios(self, scenarios: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze many scenarios, reusing the worker pools across all of them
+
+        Content chunks for every scenario are submitted to the process pool
+        up front; graph stages run one after another on the graph worker
+        thread (the graph is shared state) while the chunks are scored.
+        content_samples may be any iterable. Pool workers are started with
+        forkserver or spawn, so scripts calling this need an
+        `if __name__ == '__main__':` guard or the pool fails with
+        BrokenProcessPool.
+        """
+        scenarios = list(scenarios)
+        process_pool, thread_pool = self._get_worker_pools()
+        
+        graph_futures = [
+            thread_pool.submit(self._analyze_graph, scenario_data)
+            if 'urls' in scenario_data or 'url_feed' in scenario_data else None
+            for scenario_data in scenarios
+        ]
+        
+        # Small sample sets are cheaper to score inline than to ship to a worker
+        content_stages: List[Optional[Tuple[str, Any]]] = []
+        for scenario_data in scenarios:
+            samples = scenario_data.get('content_samples')
+            if samples is None:
+                content_stages.append(None)
+                continue
+            samples = list(samples)
+            if len(samples) < self.min_parallel_samples:
+                content_stages.append(('inline', samples))
+            else:
+                content_stages.append(('pool', [
+                    process_pool.submit(_score_content_chunk, samples[i:i + self.chunk_size])
+                    for i in range(0, len(samples), self.chunk_size)
+                ]))
+        
+        all_results = []
+        for graph_future, content_stage in zip(graph_futures, content_stages):
+            results = self._empty_results()
+            
+            if graph_future is not None:
+                results['graph_analysis'] = graph_future.result()
+            
+            if content_stage is not None:
+                mode, payload = content_stage
+                if mode == 'pool':
+                    content_metrics = [content_metric for future in payload
+                                       for content_metric in future.result()]
+                else:
+                    content_metrics = _score_content_chunk(payload)
+                results['information_analysis'] = self._summarize_content_metrics(content_metrics)
+            
+            results['recommendations'] = self._generate_recommendations(results)
+            all_results.append(results)
+        
+        return all_results
+    
+    def close(self) -> None:
+        """Shut down worker pools used by parallel analysis"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown()
+            self._thread_pool = None
+    
+    def __enter__(self) -> 'MathematicalModelsOrchestrator':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _get_worker_pools(self) -> Tuple[ProcessPoolExecutor, ThreadPoolExecutor]:
+        """Lazily create the worker pools shared by all parallel analyses
+
+        Worker processes are started with forkserver (spawn where that is
+        unavailable): by the time the pool is first used the graph worker,
+        logging listener or metrics threads may be running, and forking a
+        threaded process can copy held locks into the children.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if self._process_pool is None:
+            self._process_pool = create_process_pool(self.max_workers)
+        if self._thread_pool is None:
+            # Single graph worker: ScrapingGraph is not safe for concurrent mutation
+            self._thread_pool = ThreadPoolExecutor(max_workers=1,
+                                                   thread_name_prefix='codex-graph')
+        return self._process_pool, self._thread_pool
+    
+    @staticmethod
+    def _empty_results() -> Dict[str, Any]:
+        """Result skeleton shared by serial and parallel analysis"""
+        return {
+            'graph_analysis': {},
+            'automaton_analysis': {},
+            'information_analysis': {},
+            'mdp_analysis': {},
+            'recommendations': []
+        }
+    
+    def _analyze_graph(self, scenario_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Graph theory stage of scenario analysis
+
+        'urls' may be any iterable of URL records; 'url_feed' names an NDJSON
+        file that is streamed into the graph in batches.
+        """
+        if 'urls' in scenario_data:
+            self.graph.load_records(scenario_data['urls'], link_dependencies=False)
+        if 'url_feed' in scenario_data:
+            self.graph.load_ndjson(scenario_data['url_feed'])
+        
+        return {
+            'optimal_order': self.graph.optimize_traversal_order(),
+            'bottlenecks': self.graph.detect_bottlenecks()
+        }
+    
+    @staticmethod
+    def _summarize_content_metrics(content_metrics: List[Dict[str, float]]) -> Dict[str, Any]:
+        """Information theory stage summary"""
+        return {
+            'avg_entropy': np.mean([m['entropy'] for m in content_metrics]),
+            'avg_complexity': np.mean([m['complexity_score'] for m in content_metrics]),
+            'content_metrics': content_metrics
+        }
+    
+    def _generate_recommendations(self, analysis_results: Dict[str, Any]) -> List[str]:
+        """Generate actionable recommendations based on analysis"""
+        recommendations = []
+        
+        # Graph-based recommendations
+        if analysis_results['graph_analysis'].get('bottlenecks'):
+            recommendations.append("Implement parallel processing for bottleneck nodes")
+        
+        # Information theory recommendations
+        info_analysis = analysis_results.get('information_analysis', {})
+        if info_analysis.get('avg_entropy', 0) > 7.0:
+            recommendations.append("High content entropy detected - implement content filtering")
+        
+        if info_analysis.get('avg_complexity', 0) > 0.8:
+            recommendations.append("Complex content structure - use advanced parsing strategies")
+        
+        return recommendations
+    
+    def export_models(self, export_dir: str) -> Dict[str, str]:
+        """Export all mathematical models"""
+        export_paths = {}
+        
+        # Export graph
+        graph_path = f"{export_dir}/scraping_graph.json"
+        self.graph.export_visualization(graph_path)
+        export_paths['graph'] = graph_path
+        
+        # Export automaton state analysis
+        automaton_path = f"{export_dir}/automaton_analysis.json"
+        with open(automaton_path, 'w') as f:
+            json.dump(self.automaton.analyze_transition_patterns(), f, indent=2)
+        export_paths['automaton'] = automaton_path
+        
+        # Export MDP if available
+        if self.mdp:
+            mdp_path = f"{export_dir}/mdp_model.json"
+            self.mdp.save_model(mdp_path)
+            export_paths['mdp'] = mdp_path
+        
+        return export_paths
+
+# Factory function for quick model creation
+def create_mathematical_models_suite() -> MathematicalModelsOrchestrator:
+    """Create a complete mathematical models suite"""
+    orchestrator = MathematicalModelsOrchestrator()
+    
+    # Initialize MDP with common scraping states and actions
+    states = ['idle', 'connecting', 'scraping', 'error', 'success']
+    actions = ['continue', 'retry', 'skip', 'escalate', 'terminate']
+    orchestrator.mdp = MarkovDecisionProcess(states, actions)
+    
+    logger.info("Mathematical models suite created successfully")
+    return orchestrator
+
+if __name__ == "__main__":
+    # Example usage
+    models = create_mathematical_models_suite()
+    
+    # Example scenario
+    scenario = {
+        'urls': [
+            {'id': 'page1', 'url': 'https://example.com/1', 'priority': 1.0},
+            {'id': 'page2', 'url': 'https://example.com/2', 'priority': 0.8, 'dependencies': ['page1']}
+        ],
+        'content_samples': [
+            "Lorem ipsum dolor sit amet consectetur adipiscing elit",
+            "Complex technical documentation with specialized terminology"
+        ]
+    }
+    
+    results = models.analyze_scraping_scenario(scenario)
+    print("Analysis complete:", results)
@@ -0,0 +1,414 @@
+"""
+Template Catalog Module
+Columnar store for the Amphetamemes prompt templates
+
+Templates are held column by column instead of as a list of dicts:
+- text fields as one UTF-8 byte buffer plus int64 offsets per column
+- category dictionary-encoded as int32 codes, with a CSR row index per category
+- ids as a fixed-width byte array with a sorted order for binary-search lookup
+- optional float64 numeric columns (complexity scores, trend intensity, ...)
+
+save() writes one .npy file per array plus a small JSON manifest, and load()
+memory-maps them, so opening a million-template catalog and filtering it by
+category or id touches only the pages it reads. CSV import/export uses the
+published prompt template layout; Parquet/Arrow export is available when
+pyarrow is installed.
+"""
+
+from __future__ import annotations
+
+import csv
+import importlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from ..utils.lazy_import import lazy_import
+from .prompt_templates import CSV_COLUMNS
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ('title', 'full_prompt', 'current_narrative', 'use_case')
+FIELDS = ('id', 'title', 'category', 'full_prompt', 'current_narrative', 'use_case')
+CATALOG_FORMAT_VERSION = 1
+_HEADER_TO_FIELD = {header: field for field, header in CSV_COLUMNS.items()}
+
+
+def _require_pyarrow():
+    """Import pyarrow on demand, with a clear error when it is not installed"""
+    try:
+        return importlib.import_module('pyarrow')
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Arrow/Parquet support "
+                          "(pip install pyarrow)") from e
+
+
+class StringColumn:
+    """Variable-length UTF-8 strings stored as one byte buffer plus offsets"""
+
+    __slots__ = ('data', 'offsets')
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> 'StringColumn':
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(data, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = self.data.tobytes() if len(self.data) else b''
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield buffer[start:end].decode('utf-8')
+
+    def lengths(self) -> np.ndarray:
+        """Byte length of every value"""
+        return np.diff(self.offsets)
+
+    def take(self, rows: np.ndarray) -> 'StringColumn':
+        """New column holding only the given rows, in order"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if offsets[-1] == 0:
+            return StringColumn(np.zeros(0, dtype=np.uint8), offsets)
+        # Byte positions of every selected value, gathered in one vectorized take
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return StringColumn(np.asarray(self.data)[positions], offsets)
+
+
+class TemplateCatalog:
+    """Columnar, memory-mappable catalog of prompt templates"""
+
+    def __init__(self, ids: np.ndarray, category_codes: np.ndarray, categories: List[str],
+                 text: Dict[str, StringColumn], numeric: Optional[Dict[str, np.ndarray]] = None,
+                 id_order: Optional[np.ndarray] = None,
+                 category_order: Optional[np.ndarray] = None,
+                 category_offsets: Optional[np.ndarray] = None):
+        self.ids = ids
+        self.category_codes = category_codes
+        self.categories = categories
+        self.text = text
+        self.numeric = numeric or {}
+        self._category_lookup = {category: code for code, category in enumerate(categories)}
+        self.id_order = id_order if id_order is not None else np.argsort(ids, kind='stable')
+        if category_order is None or category_offsets is None:
+            category_order, category_offsets = self._build_category_index()
+        self.category_order = category_order
+        self.category_offsets = category_offsets
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]],
+                     numeric_fields: Sequence[str] = ()) -> 'TemplateCatalog':
+        """Build a catalog from template dicts keyed by field name or CSV header"""
+        columns: Dict[str, List[str]] = {field: [] for field in FIELDS}
+        numbers: Dict[str, List[float]] = {name: [] for name in numeric_fields}
+        for count, record in enumerate(records, start=1):
+            for key, value in record.items():
+                field = _HEADER_TO_FIELD.get(key, key)
+                if field in columns and len(columns[field]) < count:
+                    columns[field].append(value or '')
+            for field in FIELDS:
+                if len(columns[field]) < count:
+                    columns[field].append('')
+            for name in numeric_fields:
+                value = record.get(name)
+                numbers[name].append(float(value) if value not in (None, '') else np.nan)
+
+        if not all(columns['id']):
+            raise ValueError("Every template needs a non-empty id")
+        ids = np.array([value.encode('utf-8') for value in columns['id']], dtype=np.bytes_)
+        if len(ids) and len(np.unique(ids)) != len(ids):
+            raise ValueError("Template ids must be unique")
+
+        categories = list(dict.fromkeys(columns['category']))
+        lookup = {category: code for code, category in enumerate(categories)}
+        category_codes = np.fromiter((lookup[value] for value in columns['category']),
+                                     dtype=np.int32, count=len(columns['category']))
+        text = {field: StringColumn.from_strings(columns[field]) for field in TEXT_FIELDS}
+        numeric = {name: np.asarray(values, dtype=np.float64) for name, values in numbers.items()}
+        return cls(ids if len(ids) else np.zeros(0, dtype='S1'), category_codes, categories,
+                   text, numeric)
+
+    @classmethod
+    def from_csv(cls, path: Union[str, Path], numeric_fields: Sequence[str] = ()) -> 'TemplateCatalog':
+        """Bulk import a CSV in the published template layout (or keyed by field names)"""
+        with open(path, newline='', encoding='utf-8') as f:
+            catalog = cls.from_records(csv.DictReader(f), numeric_fields)
+        logger.info(f"Imported {len(catalog)} templates from {path}")
+        return catalog
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> 'TemplateCatalog':
+        """Open a catalog written by save(), memory-mapping its arrays by default"""
+        directory = Path(directory)
+        manifest = json.loads((directory / 'catalog.json').read_text(encoding='utf-8'))
+        if manifest.get('format_version') != CATALOG_FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalog format: {manifest.get('format_version')}")
+        mmap_mode = 'r' if mmap else None
+
+        def array(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+
+        text = {field: StringColumn(array(f"{field}.data"), array(f"{field}.offsets"))
+                for field in TEXT_FIELDS}
+        numeric = {name: array(f"numeric.{name}") for name in manifest['numeric_fields']}
+        return cls(array('ids'), array('category_codes'), manifest['categories'], text, numeric,
+                   id_order=array('id_order'), category_order=array('category_order'),
+                   category_offsets=array('category_offsets'))
+
+    @classmethod
+    def from_parquet(cls, path: Union[str, Path]) -> 'TemplateCatalog':
+        """Import a Parquet file written by write_parquet (requires pyarrow)"""
+        _require_pyarrow()
+        parquet = importlib.import_module('pyarrow.parquet')
+        table = parquet.read_table(path)
+        numeric_fields = [name for name in table.column_names if name not in FIELDS]
+        return cls.from_records(table.to_pylist(), numeric_fields)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, template_id: str) -> bool:
+        return self.row_of(template_id) is not None
+
+    def row_of(self, template_id: str) -> Optional[int]:
+        """Row of template_id via binary search over the sorted ids, or None"""
+        if not len(self.ids):
+            return None
+        key = template_id.encode('utf-8')
+        position = int(np.searchsorted(self.ids, key, sorter=self.id_order))
+        if position < len(self.ids):
+            row = int(self.id_order[position])
+            if self.ids[row] == key:
+                return row
+        return None
+
+    def rows_of(self, template_ids: Iterable[str]) -> np.ndarray:
+        """Rows of the given ids (unknown ids are dropped), vectorized
+
+        Keys keep their full width: casting them to the catalog's id width
+        would truncate a longer unknown id onto a real one.
+        """
+        keys = np.array([template_id.encode('utf-8') for template_id in template_ids],
+                        dtype=np.bytes_)
+        if not len(keys) or not len(self.ids):
+            return np.zeros(0, dtype=np.int64)
+        positions = np.searchsorted(self.ids, keys, sorter=self.id_order)
+        positions = np.minimum(positions, len(self.ids) - 1)
+        rows = np.asarray(self.id_order)[positions]
+        return rows[np.asarray(self.ids)[rows] == keys].astype(np.int64)
+
+    def rows_for_category(self, category: str) -> np.ndarray:
+        """Rows in a category, as a view of the category index (no scan)"""
+        code = self._category_lookup.get(category)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.category_order[self.category_offsets[code]:self.category_offsets[code + 1]]
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of templates per category"""
+        counts = np.diff(self.category_offsets)
+        return {category: int(counts[code]) for code, category in enumerate(self.categories)}
+
+    def filter(self, category: Optional[Union[str, Sequence[str]]] = None,
+               ids: Optional[Iterable[str]] = None,
+               mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Sorted rows matching every given criterion
+
+        category may be one name or several; mask is a boolean array over
+        rows, e.g. built from a numeric column.
+        """
+        selected = None
+        if category is not None:
+            names = [category] if isinstance(category, str) else list(category)
+            selected = np.sort(np.concatenate([self.rows_for_category(name) for name in names]
+                                              or [np.zeros(0, dtype=np.int64)]))
+        if ids is not None:
+            rows = np.unique(self.rows_of(ids))
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if len(mask) != len(self):
+                raise ValueError(f"mask has {len(mask)} entries for {len(self)} templates")
+            rows = np.flatnonzero(mask)
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        if selected is None:
+            return np.arange(len(self), dtype=np.int64)
+        return selected.astype(np.int64, copy=False)
+
+    def column(self, field: str) -> Union[np.ndarray, StringColumn]:
+        """Raw column: id bytes, category codes, a StringColumn or a numeric array"""
+        if field == 'id':
+            return self.ids
+        if field == 'category':
+            return self.category_codes
+        if field in self.text:
+            return self.text[field]
+        if field in self.numeric:
+            return self.numeric[field]
+        raise ValueError(f"Unknown catalog column: {field}")
+
+    def values(self, field: str, rows: Optional[np.ndarray] = None) -> List[Any]:
+        """Decoded Python values of a column, for all rows or the given ones"""
+        if rows is None:
+            rows = np.arange(len(self))
+        if field == 'id':
+            return [value.decode('utf-8') for value in np.asarray(self.ids)[rows].tolist()]
+        if field == 'category':
+            return [self.categories[code] for code in np.asarray(self.category_codes)[rows].tolist()]
+        if field in self.text:
+            column = self.text[field]
+            return [column[row] for row in np.asarray(rows).tolist()]
+        return np.asarray(self.column(field))[rows].tolist()
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """One template as a dict keyed by field name"""
+        result: Dict[str, Any] = {
+            'id': self.ids[row].decode('utf-8'),
+            'category': self.categories[int(self.category_codes[row])]
+        }
+        for field in TEXT_FIELDS:
+            result[field] = self.text[field][row]
+        for name, values in self.numeric.items():
+            result[name] = float(values[row])
+        return {field: result[field] for field in (*FIELDS, *self.numeric)}
+
+    def get(self, template_id: str) -> Optional[Dict[str, Any]]:
+        """Template dict for an id, or None"""
+        row = self.row_of(template_id)
+        return self.record(row) if row is not None else None
+
+    def iter_records(self, rows: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield template dicts for all rows or the given ones"""
+        for row in (range(len(self)) if rows is None else rows):
+            yield self.record(int(row))
+
+    def select(self, rows: np.ndarray) -> 'TemplateCatalog':
+        """New in-memory catalog holding only the given rows"""
+        rows = np.asarray(rows, dtype=np.int64)
+        codes = np.asarray(self.category_codes)[rows]
+        used = np.unique(codes)
+        remap = np.full(len(self.categories), -1, dtype=np.int32)
+        remap[used] = np.arange(len(used), dtype=np.int32)
+        return TemplateCatalog(np.asarray(self.ids)[rows], remap[codes],
+                               [self.categories[code] for code in used.tolist()],
+                               {field: column.take(rows) for field, column in self.text.items()},
+                               {name: np.asarray(values)[rows] for name, values in self.numeric.items()})
+
+    def add_column(self, name: str, values: Sequence[float]) -> None:
+        """Attach or replace a numeric column"""
+        if name in FIELDS:
+            raise ValueError(f"Cannot replace template field: {name}")
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) != len(self):
+            raise ValueError(f"Column {name} has {len(values)} values for {len(self)} templates")
+        self.numeric[name] = values
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """Write the catalog as .npy arrays plus a JSON manifest"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            'ids': self.ids,
+            'category_codes': self.category_codes,
+            'id_order': self.id_order,
+            'category_order': self.category_order,
+            'category_offsets': self.category_offsets
+        }
+        for field, column in self.text.items():
+            arrays[f"{field}.data"] = column.data
+            arrays[f"{field}.offsets"] = column.offsets
+        for name, values in self.numeric.items():
+            arrays[f"numeric.{name}"] = values
+        for name, values in arrays.items():
+            np.save(directory / f"{name}.npy", np.asarray(values), allow_pickle=False)
+
+        manifest = {
+            'format_version': CATALOG_FORMAT_VERSION,
+            'count': len(self),
+            'categories': self.categories,
+            'numeric_fields': list(self.numeric)
+        }
+        (directory / 'catalog.json').write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        logger.info(f"Saved {len(self)} templates to {directory}")
+        return directory
+
+    def to_csv(self, path: Union[str, Path], rows: Optional[Iterable[int]] = None) -> Path:
+        """Bulk export in the published CSV layout, numeric columns appended"""
+        path = Path(path)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([*CSV_COLUMNS.values(), *self.numeric])
+            for record in self.iter_records(rows):
+                writer.writerow([record[field] for field in (*FIELDS, *self.numeric)])
+        return path
+
+    def to_arrow(self):
+        """pyarrow Table of the catalog (category as a dictionary column)"""
+        pa = _require_pyarrow()
+        columns = {
+            'id': pa.array(self.values('id'), type=pa.string()),
+            'category': pa.DictionaryArray.from_arrays(
+                pa.array(np.asarray(self.category_codes)),
+                pa.array(self.categories, type=pa.string()))
+        }
+        for field, column in self.text.items():
+            columns[field] = pa.LargeStringArray.from_buffers(
+                len(column), pa.py_buffer(np.asarray(column.offsets)),
+                pa.py_buffer(np.asarray(column.data)))
+        for name, values in self.numeric.items():
+            columns[name] = pa.array(np.asarray(values))
+        return pa.table({name: columns[name] for name in (*FIELDS, *self.numeric)})
+
+    def write_parquet(self, path: Union[str, Path]) -> Path:
+        """Write the catalog as Parquet (requires pyarrow)"""
+        _require_pyarrow()
+        parquet = importlib.import_module('pyarrow.parquet')
+        parquet.write_table(self.to_arrow(), path)
+        return Path(path)
+
+    def _build_category_index(self):
+        codes = np.asarray(self.category_codes)
+        order = np.argsort(codes, kind='stable').astype(np.int64)
+        offsets = np.zeros(len(self.categories) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(self.categories)), out=offsets[1:])
+        return order, offsets
+
+
+def create_template_catalog(records: Optional[Iterable[Dict[str, Any]]] = None) -> TemplateCatalog:
+    """Catalog of the given templates, or of the built-in prompt template series"""
+    if records is None:
+        from .prompt_templates import PROMPT_TEMPLATES
+        records = PROMPT_TEMPLATES
+    return TemplateCatalog.from_records(records)
@@ -0,0 +1,320 @@
+"""
+Template Search Module
+In-process keyword and substring search over template prompt text
+
+Each template (full_prompt, current_narrative and category by default) is
+one document:
+- a tokenized inverted index whose posting lists are NumPy arrays of doc
+  ids and term frequencies, ranked with BM25
+- a trigram index for substring queries, verified against the stored text
+- incremental add/remove: new postings go to append buffers that are merged
+  into the arrays on the next query touching that term, removed documents
+  are tombstoned and purged by compact()
+
+attach() keeps an index in sync with a TemplateEvolutionGraph, so every
+template added to (or removed from) the graph is indexed immediately.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..utils.lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ('full_prompt', 'current_narrative', 'category')
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of text"""
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(text: str) -> set:
+    """Distinct character trigrams of lowercased text"""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _PostingList:
+    """Sorted doc ids (and term frequencies) as arrays plus an append buffer"""
+
+    __slots__ = ('doc_ids', 'freqs', '_pending_ids', '_pending_freqs')
+
+    def __init__(self, with_freqs: bool = True):
+        self.doc_ids = np.zeros(0, dtype=np.int32)
+        self.freqs = np.zeros(0, dtype=np.int32) if with_freqs else None
+        self._pending_ids = array('i')
+        self._pending_freqs = array('i') if with_freqs else None
+
+    def append(self, doc_id: int, freq: int = 1) -> None:
+        # Doc ids only grow, so appending keeps the list sorted
+        self._pending_ids.append(doc_id)
+        if self._pending_freqs is not None:
+            self._pending_freqs.append(freq)
+
+    def arrays(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Doc ids and frequencies with pending appends merged in"""
+        if self._pending_ids:
+            self.doc_ids = np.concatenate([self.doc_ids,
+                                           np.frombuffer(self._pending_ids, dtype=np.int32)])
+            self._pending_ids = array('i')
+            if self._pending_freqs is not None:
+                self.freqs = np.concatenate([self.freqs,
+                                             np.frombuffer(self._pending_freqs, dtype=np.int32)])
+                self._pending_freqs = array('i')
+        return self.doc_ids, self.freqs
+
+    def prune(self, alive: np.ndarray) -> int:
+        """Drop tombstoned docs; returns the number of postings left"""
+        doc_ids, freqs = self.arrays()
+        keep = alive[doc_ids]
+        self.doc_ids = doc_ids[keep]
+        if freqs is not None:
+            self.freqs = freqs[keep]
+        return len(self.doc_ids)
+
+
+class TemplateSearchIndex:
+    """Inverted index with BM25 ranking and trigram substring search"""
+
+    def __init__(self, fields: Sequence[str] = SEARCH_FIELDS, k1: float = 1.5, b: float = 0.75,
+                 substring_index: bool = True):
+        self.fields = tuple(fields)
+        self.k1 = k1
+        self.b = b
+        self.substring_index = substring_index
+        self._postings: Dict[str, _PostingList] = {}
+        self._trigrams: Dict[str, _PostingList] = {}
+        self._doc_freq: Counter = Counter()
+        self._doc_keys: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        self._key_to_doc: Dict[str, int] = {}
+        self._lengths = np.zeros(1024, dtype=np.float64)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._total_length = 0.0
+        self._tombstones = 0
+        # Cached BM25 weights per term, valid while _generation is unchanged
+        self._weight_cache: Dict[str, Tuple[int, np.ndarray, np.ndarray]] = {}
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._key_to_doc)
+
+    def __contains__(self, template_id: str) -> bool:
+        return template_id in self._key_to_doc
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def add(self, template_id: str, fields: Dict[str, Any]) -> None:
+        """Index (or re-index) one template from its field values"""
+        if template_id in self._key_to_doc:
+            self.remove(template_id)
+        text = '\n'.join(str(fields.get(name) or '') for name in self.fields).lower()
+
+        doc_id = len(self._doc_keys)
+        self._ensure_capacity(doc_id + 1)
+        self._generation += 1
+        self._doc_keys.append(template_id)
+        self._texts.append(text)
+        self._key_to_doc[template_id] = doc_id
+
+        counts = Counter(tokenize(text))
+        for term, freq in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = _PostingList()
+            posting.append(doc_id, freq)
+        self._doc_freq.update(counts.keys())
+        length = float(sum(counts.values()))
+        self._lengths[doc_id] = length
+        self._alive[doc_id] = True
+        self._total_length += length
+
+        if self.substring_index:
+            for gram in trigrams(text):
+                posting = self._trigrams.get(gram)
+                if posting is None:
+                    posting = self._trigrams[gram] = _PostingList(with_freqs=False)
+                posting.append(doc_id)
+
+    def add_many(self, records: Iterable[Dict[str, Any]], id_field: str = 'id') -> int:
+        """Index template dicts; returns how many were added"""
+        added = 0
+        for record in records:
+            self.add(record[id_field], record)
+            added += 1
+        return added
+
+    def add_node(self, node: Any) -> None:
+        """Index a template node from its metadata and category"""
+        fields = dict(node.metadata or {})
+        fields.setdefault('category', node.category)
+        self.add(node.id, fields)
+
+    def remove(self, template_id: str) -> bool:
+        """Tombstone a template; postings are purged lazily by compact()"""
+        doc_id = self._key_to_doc.pop(template_id, None)
+        if doc_id is None:
+            return False
+        text = self._texts[doc_id]
+        self._doc_freq.subtract(set(tokenize(text)))
+        self._alive[doc_id] = False
+        self._generation += 1
+        self._total_length -= self._lengths[doc_id]
+        self._texts[doc_id] = None
+        self._doc_keys[doc_id] = None
+        self._tombstones += 1
+        if self._tombstones > 1024 and self._tombstones > len(self._key_to_doc):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Purge tombstoned documents from every posting list"""
+        alive = self._alive[:len(self._doc_keys)]
+        for index in (self._postings, self._trigrams):
+            for term in [term for term, posting in index.items() if not posting.prune(alive)]:
+                del index[term]
+        self._doc_freq = +self._doc_freq
+        self._weight_cache.clear()
+        self._tombstones = 0
+        logger.debug(f"Compacted search index to {len(self)} templates")
+
+    def attach(self, graph: Any) -> 'TemplateSearchIndex':
+        """Keep this index in sync with a TemplateEvolutionGraph"""
+        graph.search_index = self
+        for node in graph.nodes.values():
+            self.add_node(node)
+        return self
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """BM25-ranked (template id, score) pairs for a keyword query"""
+        terms = set(tokenize(query))
+        if not self._key_to_doc or not terms or limit < 1:
+            return []
+
+        doc_parts = []
+        weight_parts = []
+        for term in terms:
+            weighted = self._term_weights(term)
+            if weighted is not None:
+                doc_parts.append(weighted[0])
+                weight_parts.append(weighted[1])
+        if not doc_parts:
+            return []
+
+        if sum(len(part) for part in doc_parts) * 8 > len(self._doc_keys):
+            # Long posting lists: accumulate into a dense score vector (doc ids
+            # are unique within a posting list, so fancy-index += is exact)
+            dense = np.zeros(len(self._doc_keys), dtype=np.float32)
+            for part, weights in zip(doc_parts, weight_parts):
+                dense[part] += weights
+            dense *= self._alive[:len(dense)]
+            count = min(limit, len(dense))
+            doc_ids = np.argpartition(-dense, count - 1)[:count]
+            scores = dense[doc_ids]
+        else:
+            if len(doc_parts) == 1:
+                doc_ids, scores = doc_parts[0], weight_parts[0]
+            else:
+                doc_ids, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate(weight_parts),
+                                     minlength=len(doc_ids))
+            # Drop tombstoned documents before the top-k cut, or they crowd out
+            # live matches
+            live = self._alive[doc_ids]
+            if not live.all():
+                doc_ids, scores = doc_ids[live], scores[live]
+            if len(scores) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                doc_ids, scores = doc_ids[top], scores[top]
+        keep = self._alive[doc_ids] & (scores > 0)
+        doc_ids, scores = doc_ids[keep], scores[keep]
+        order = np.lexsort((doc_ids, -scores))
+        return [(self._doc_keys[doc_id], float(score))
+                for doc_id, score in zip(doc_ids[order].tolist(), scores[order].tolist())]
+
+    def _term_weights(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Doc ids and BM25 weights of a term, cached until the index changes"""
+        cached = self._weight_cache.get(term)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1], cached[2]
+        posting = self._postings.get(term)
+        doc_freq = self._doc_freq.get(term, 0)
+        if posting is None or doc_freq <= 0:
+            return None
+
+        live = len(self._key_to_doc)
+        average_length = self._total_length / live if self._total_length else 1.0
+        doc_ids, freqs = posting.arrays()
+        idf = math.log(1.0 + (live - doc_freq + 0.5) / (doc_freq + 0.5))
+        freqs = freqs.astype(np.float32)
+        norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc_ids] / average_length)
+        weights = (idf * (self.k1 + 1.0)) * freqs / (freqs + norm.astype(np.float32))
+        self._weight_cache[term] = (self._generation, doc_ids, weights)
+        return doc_ids, weights
+
+    def find_substring(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Template ids whose indexed text contains text (case-insensitive)"""
+        needle = text.lower()
+        if not needle:
+            return []
+        if len(needle) < 3 or not self.substring_index:
+            candidates = (doc_id for doc_id, alive in enumerate(self._alive[:len(self._doc_keys)])
+                          if alive)
+        else:
+            postings = []
+            for gram in trigrams(needle):
+                posting = self._trigrams.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting.arrays()[0])
+            postings.sort(key=len)
+            doc_ids = postings[0]
+            for other in postings[1:]:
+                doc_ids = np.intersect1d(doc_ids, other, assume_unique=True)
+                if not len(doc_ids):
+                    return []
+            candidates = doc_ids[self._alive[doc_ids]].tolist()
+
+        matches = []
+        for doc_id in candidates:
+            if needle in self._texts[doc_id]:
+                matches.append(self._doc_keys[doc_id])
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def _ensure_capacity(self, size: int) -> None:
+        if size <= len(self._lengths):
+            return
+        capacity = max(size, 2 * len(self._lengths))
+        lengths = np.zeros(capacity, dtype=np.float64)
+        lengths[:len(self._lengths)] = self._lengths
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        self._lengths, self._alive = lengths, alive
+
+
+def build_search_index(catalog: Any, fields: Sequence[str] = SEARCH_FIELDS,
+                       substring_index: bool = True) -> TemplateSearchIndex:
+    """Index every template of a TemplateCatalog (or an iterable of template dicts)"""
+    index = TemplateSearchIndex(fields, substring_index=substring_index)
+    records = catalog.iter_records() if hasattr(catalog, 'iter_records') else catalog
+    index.add_many(records)
+    return index
@@ -0,0 +1,178 @@
+"""
+Trend Forecasting Module
+Online Holt (double exponential smoothing) forecasts of trend intensity
+
+State is one level and one trend value per template, held in NumPy arrays
+and addressed by row index (template ids are mapped to rows on first
+sight). An update folds one new observation per template into the state in
+O(1), vectorized across any subset of rows, so refreshing a million
+templates every minute is a handful of array operations. Forecasts for
+several horizons come out as one (templates, horizons) matrix.
+
+Templates with a single observation forecast their last value (trend 0);
+an optional damping factor below 1 flattens long-horizon trends.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from ..utils.lazy_import import lazy_import
+from ..utils.metrics import timed
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+Horizons = Union[int, Sequence[int]]
+
+
+class HoltForecaster:
+    """Per-template Holt linear-trend smoothing state"""
+
+    def __init__(self, alpha: float = 0.3, beta: float = 0.1, damping: float = 1.0,
+                 capacity: int = 1024):
+        for name, value in (('alpha', alpha), ('beta', beta), ('damping', damping)):
+            if not 0.0 < value <= 1.0:
+                raise ValueError(f"{name} must be in (0, 1], got {value}")
+        self.alpha = alpha
+        self.beta = beta
+        self.damping = damping
+        self.size = 0
+        self.level = np.zeros(capacity, dtype=np.float64)
+        self.trend = np.zeros(capacity, dtype=np.float64)
+        self.observations = np.zeros(capacity, dtype=np.int64)
+        self._index: Dict[str, int] = {}
+        self._keys: List[str] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+
+    def reserve(self, size: int) -> None:
+        """Make sure rows 0..size-1 exist"""
+        if size > len(self.level):
+            capacity = max(size, 2 * len(self.level))
+            for name in ('level', 'trend', 'observations'):
+                old = getattr(self, name)
+                grown = np.zeros(capacity, dtype=old.dtype)
+                grown[:len(old)] = old
+                setattr(self, name, grown)
+        self.size = max(self.size, size)
+
+    def rows_of(self, template_ids: Iterable[str]) -> np.ndarray:
+        """Row indices of template ids, assigning rows to unseen ids"""
+        index = self._index
+        rows = []
+        for template_id in template_ids:
+            row = index.get(template_id)
+            if row is None:
+                row = index[template_id] = len(self._keys)
+                self._keys.append(template_id)
+            rows.append(row)
+        rows = np.asarray(rows, dtype=np.int64)
+        self.reserve(len(self._keys))
+        return rows
+
+    def key_of(self, row: int) -> Optional[str]:
+        return self._keys[row] if row < len(self._keys) else None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    @timed('codex_forecast_update_seconds', model='holt')
+    def update(self, values: Sequence[float], rows: Optional[Sequence[int]] = None) -> None:
+        """Fold one observation per row into the state
+
+        rows defaults to 0..len(values)-1. NaN values leave their row
+        untouched, so a partial refresh can pass a full-width array.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if rows is None:
+            self.reserve(len(values))
+            rows = slice(0, len(values))
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            if rows.shape != values.shape:
+                raise ValueError(f"rows and values differ in shape: {rows.shape} vs {values.shape}")
+            if len(rows):
+                self.reserve(int(rows.max()) + 1)
+
+        observed = ~np.isnan(values)
+        if not observed.all():
+            if isinstance(rows, slice):
+                rows = np.arange(rows.start, rows.stop)
+            rows, values = rows[observed], values[observed]
+
+        level = self.level[rows]
+        trend = self.trend[rows]
+        counts = self.observations[rows]
+        damped = self.damping * trend
+        new_level = self.alpha * values + (1.0 - self.alpha) * (level + damped)
+        new_trend = self.beta * (new_level - level) + (1.0 - self.beta) * damped
+        # Standard initialization: level x1, then level x2 and slope x2 - x1
+        first = counts == 0
+        second = counts == 1
+        new_level = np.where(first | second, values, new_level)
+        new_trend = np.where(first, 0.0, np.where(second, values - level, new_trend))
+
+        self.level[rows] = new_level
+        self.trend[rows] = new_trend
+        self.observations[rows] = counts + 1
+
+    def update_ids(self, template_ids: Iterable[str], values: Sequence[float]) -> np.ndarray:
+        """update() addressed by template id; returns the rows used"""
+        rows = self.rows_of(template_ids)
+        self.update(values, rows)
+        return rows
+
+    def fit(self, history: Sequence[Sequence[float]],
+            rows: Optional[Sequence[int]] = None) -> 'HoltForecaster':
+        """Replay a (templates, time steps) history, oldest column first"""
+        history = np.asarray(history, dtype=np.float64)
+        if history.ndim == 1:
+            history = history[:, None]
+        if history.ndim != 2:
+            raise ValueError(f"history must be 1-D or 2-D, got {history.ndim} dimensions")
+        for column in range(history.shape[1]):
+            self.update(history[:, column], rows)
+        return self
+
+    # ------------------------------------------------------------------
+    # Forecasts
+    # ------------------------------------------------------------------
+
+    def _trend_multipliers(self, horizons: np.ndarray) -> np.ndarray:
+        if self.damping == 1.0:
+            return horizons.astype(np.float64)
+        # phi + phi^2 + ... + phi^h
+        phi = self.damping
+        return phi * (1.0 - phi ** horizons) / (1.0 - phi)
+
+    def forecast(self, horizon: Horizons = 1, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Forecast intensities h steps ahead
+
+        An int horizon gives one value per row; a sequence of horizons gives
+        a (rows, horizons) matrix.
+        """
+        horizons = np.atleast_1d(np.asarray(horizon, dtype=np.int64))
+        if (horizons < 1).any():
+            raise ValueError(f"Horizons must be >= 1, got {horizon}")
+        selector = slice(0, self.size) if rows is None else np.asarray(rows, dtype=np.int64)
+        level = self.level[selector]
+        trend = self.trend[selector]
+        forecasts = level[:, None] + trend[:, None] * self._trend_multipliers(horizons)[None, :]
+        return forecasts[:, 0] if np.ndim(horizon) == 0 else forecasts
+
+
+def forecast_history(history: Sequence[Sequence[float]], horizon: Horizons = 1,
+                     alpha: float = 0.3, beta: float = 0.1, damping: float = 1.0) -> np.ndarray:
+    """One-shot Holt forecast of every row of a (templates, time steps) history"""
+    history = np.asarray(history, dtype=np.float64)
+    forecaster = HoltForecaster(alpha, beta, damping, capacity=max(1, len(history)))
+    return forecaster.fit(history).forecast(horizon)
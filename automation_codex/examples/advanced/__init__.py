@@ -0,0 +1 @@
+# AutomationCodex module
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Game Theory Scheduler
+Equilibrium posting times against competitor accounts
+
+Entry point for codex_bridge.calculateOptimalSchedule:
+
+    python3 automation_codex/examples/advanced/game_theory_scheduler.py <platform> '<competitor json>'
+
+where the competitor JSON is a list of competitor dicts (followers,
+postsPerDay, postingHours or postingTimes; entries with a different
+platform are ignored). Many accounts can be scheduled in one run with
+--accounts <file.ndjson>, one {accountId, platform, competitors,
+postsPerDay} object per line. The result is printed as one JSON object on
+stdout.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Allow running by path (as the Node bridge does) as well as with -m
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from automation_codex.core.posting_scheduler import GameTheoryScheduler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('platform', nargs='?')
+    parser.add_argument('competitors', nargs='?', default='[]', help='competitor list JSON')
+    parser.add_argument('--accounts', type=Path, help='NDJSON file of accounts to schedule')
+    parser.add_argument('--posts-per-day', type=int, default=3)
+    parser.add_argument('--slots', type=int, default=24, help='time slots per day')
+    args = parser.parse_args()
+    if args.accounts is None and args.platform is None:
+        parser.error('platform is required unless --accounts is given')
+
+    scheduler = GameTheoryScheduler(slots=args.slots)
+    result = {}
+    try:
+        if args.platform is not None:
+            competitors = json.loads(args.competitors)
+            if not isinstance(competitors, list):
+                raise ValueError("competitor data must be a JSON list")
+            competitors = [c for c in competitors
+                           if str(c.get('platform', args.platform)).lower() == args.platform.lower()]
+            solution = scheduler.solve(args.platform, competitors)
+            result.update(solution.to_dict(args.posts_per_day))
+            result['competitors'] = len(competitors)
+        if args.accounts is not None:
+            with open(args.accounts, encoding='utf-8') as f:
+                accounts = [json.loads(line) for line in f if line.strip()]
+            result['accounts'] = scheduler.schedule_accounts(accounts)
+    except (ValueError, TypeError, AttributeError) as e:
+        print(json.dumps({'error': f"Invalid competitor data: {e}"}), file=sys.stderr)
+        sys.exit(1)
+
+    result['cache'] = scheduler.cache_info
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
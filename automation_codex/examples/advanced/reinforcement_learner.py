@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Reinforcement Learner
+Learn TrendPredictionMDP actions from template engagement
+
+Entry point for codex_bridge.learnFromEngagement:
+
+    python3 automation_codex/examples/advanced/reinforcement_learner.py <template_id> '<metrics json>'
+
+where the metrics JSON holds views/likes/shares/saves and optionally
+trendIntensity. Bulk feeds can be replayed with --events <file.ndjson>.
+The learned table is restored from and saved to a checkpoint in the models
+directory, and the result is printed as one JSON object on stdout.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Allow running by path (as the Node bridge does) as well as with -m
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from automation_codex.config import PROJECT_ROOT
+from automation_codex.core.engagement_learning import EngagementEvent, EngagementLearner, compute_rewards
+
+DEFAULT_CHECKPOINT = PROJECT_ROOT / 'models' / 'engagement_learner.npz'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('template_id', nargs='?')
+    parser.add_argument('metrics', nargs='?', help='engagement metrics JSON')
+    parser.add_argument('--events', type=Path, help='NDJSON file of engagement events to learn from')
+    parser.add_argument('--checkpoint', type=Path, default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--epsilon', type=float, default=0.1)
+    args = parser.parse_args()
+    if args.events is None and (args.template_id is None or args.metrics is None):
+        parser.error('template_id and metrics are required unless --events is given')
+
+    learner = EngagementLearner(epsilon=args.epsilon, checkpoint_path=args.checkpoint)
+    learner.load_checkpoint()
+
+    result = {}
+    if args.events is not None:
+        result['events_learned'] = learner.ingest_ndjson(args.events)
+    if args.template_id is not None:
+        try:
+            event = EngagementEvent.from_dict({'template_id': args.template_id,
+                                               **json.loads(args.metrics)})
+        except (ValueError, TypeError) as e:
+            print(json.dumps({'error': f"Invalid engagement metrics: {e}"}), file=sys.stderr)
+            sys.exit(1)
+        learner.ingest([event])
+        learner.flush()
+        result.update(
+            template_id=event.template_id,
+            reward=float(compute_rewards([[event.views, event.likes, event.shares, event.saves]],
+                                         learner.weights)[0]),
+            state=learner.template_state(event.template_id),
+            recommended_action=learner.recommended_action(event.template_id)
+        )
+    learner.close()
+
+    result.update(learner.stats())
+    result['q_table'] = learner.mdp.q_table.round(6).tolist()
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
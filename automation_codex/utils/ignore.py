@@ -0,0 +1,247 @@
+"""
+Ignore Rules Engine
+Compiled .gitignore-style matcher shared by the uploader and filesystem analysis
+
+Rules follow gitignore semantics:
+- blank lines and '#' comments are skipped, '\\#' and '\\!' escape them
+- '!' re-includes paths excluded by an earlier rule (last match wins)
+- a trailing '/' only matches directories
+- a pattern containing '/' is anchored to the directory of its rule file,
+  otherwise it matches the name at any depth
+- '*' and '?' never match '/', '**' spans directories, '[...]' is a class
+- nothing inside an ignored directory can be re-included
+
+Consecutive rules of the same sign are compiled into alternation regexes,
+unanchored rules are matched against the bare name rather than the whole
+path, and walk() prunes ignored directories without descending into them.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex fragment"""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**', i):
+                at_start = i == 0 or pattern[i - 1] == '/'
+                at_end = i + 2 == n
+                followed_by_slash = pattern.startswith('/', i + 2)
+                if at_start and followed_by_slash:
+                    out.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if at_start and at_end:
+                    out.append('.*')
+                    i += 2
+                    continue
+            out.append('[^/]*')
+            while i < n and pattern[i] == '*':
+                i += 1
+            continue
+        if char == '?':
+            out.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 2 if pattern.startswith(('[!', '[^', '[]'), i) else i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif char == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return ''.join(out)
+
+
+def parse_rule(line: str, base: str = '') -> Optional[Tuple[str, bool, bool, bool]]:
+    """Parse one gitignore line into (regex, negated, directory_only, name_only)
+
+    base is the posix directory (relative to the matcher root, no trailing
+    slash) of the file the rule came from. name_only regexes are matched
+    against the last path component, all others against the whole relative
+    path. Returns None for blank lines and comments.
+    """
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip('\n').rstrip('\r')
+    while stripped.endswith(' ') and not stripped.endswith('\\ '):
+        stripped = stripped[:-1]
+    if not stripped or stripped.startswith('#'):
+        return None
+
+    negated = stripped.startswith('!')
+    if negated:
+        stripped = stripped[1:]
+    elif stripped.startswith(('\\#', '\\!')):
+        stripped = stripped[1:]
+
+    directory_only = stripped.endswith('/')
+    stripped = stripped.rstrip('/')
+    if not stripped:
+        return None
+
+    anchored = '/' in stripped
+    stripped = stripped.lstrip('/')
+    if not anchored and not base:
+        # Matching the bare name avoids backtracking over leading directories
+        return _translate_glob(stripped) + '$', negated, directory_only, True
+    prefix = re.escape(base + '/') if base else ''
+    if anchored:
+        regex = prefix + _translate_glob(stripped) + '$'
+    else:
+        regex = prefix + '(?:.*/)?' + _translate_glob(stripped) + '$'
+    return regex, negated, directory_only, False
+
+
+class _RuleGroup:
+    """Consecutive rules of one sign compiled into alternation regexes
+
+    Regexes are kept apart by what they match against (name or path) and
+    whether they only apply to directories, so each is a single search.
+    """
+
+    __slots__ = ('negated', 'sources', 'name_re', 'name_dir_re', 'path_re', 'path_dir_re')
+
+    def __init__(self, negated: bool):
+        self.negated = negated
+        # (name_only, directory_only) -> regexes
+        self.sources: Dict[Tuple[bool, bool], List[str]] = {}
+
+    def add(self, regex: str, directory_only: bool, name_only: bool) -> None:
+        self.sources.setdefault((name_only, directory_only), []).append(f'(?:{regex})')
+
+    def compile(self) -> None:
+        def build(key: Tuple[bool, bool]) -> Optional[Pattern[str]]:
+            regexes = self.sources.get(key)
+            return re.compile('|'.join(regexes)) if regexes else None
+        self.name_re = build((True, False))
+        self.name_dir_re = build((True, True))
+        self.path_re = build((False, False))
+        self.path_dir_re = build((False, True))
+
+    def matches(self, path: str, name: str, is_dir: bool) -> bool:
+        if self.name_re is not None and self.name_re.match(name):
+            return True
+        if self.path_re is not None and self.path_re.match(path):
+            return True
+        if not is_dir:
+            return False
+        if self.name_dir_re is not None and self.name_dir_re.match(name):
+            return True
+        return self.path_dir_re is not None and self.path_dir_re.match(path) is not None
+
+
+class IgnoreMatcher:
+    """Compiled set of gitignore-style rules"""
+
+    def __init__(self, patterns: Iterable[str] = (), base: str = ''):
+        self._rules: List[Tuple[str, bool, bool, bool]] = []
+        self._groups: List[_RuleGroup] = []
+        self._add(patterns, base)
+        self._compile()
+
+    @classmethod
+    def from_file(cls, path: PathLike, extra_patterns: Iterable[str] = ()) -> 'IgnoreMatcher':
+        """Build a matcher from extra patterns followed by a .gitignore file"""
+        patterns = list(extra_patterns)
+        path = Path(path)
+        if path.exists():
+            patterns.extend(path.read_text(encoding='utf-8', errors='replace').splitlines())
+        return cls(patterns)
+
+    def with_rules(self, patterns: Iterable[str], base: str = '') -> 'IgnoreMatcher':
+        """New matcher with extra rules (e.g. a nested .gitignore) appended"""
+        child = IgnoreMatcher.__new__(IgnoreMatcher)
+        child._rules = list(self._rules)
+        child._groups = []
+        child._add(patterns, base)
+        child._compile()
+        return child
+
+    def matches(self, path: str, is_dir: bool = False) -> bool:
+        """Whether the rules exclude this exact relative posix path
+
+        Ancestor directories are not consulted; see is_ignored.
+        """
+        name = path.rpartition('/')[2]
+        for group in reversed(self._groups):
+            if group.matches(path, name, is_dir):
+                return not group.negated
+        return False
+
+    def is_ignored(self, path: PathLike, is_dir: bool = False) -> bool:
+        """Whether a relative path is excluded, including via an ignored ancestor"""
+        path = Path(path).as_posix().strip('/')
+        if not path or path == '.':
+            return False
+        parts = path.split('/')
+        for depth in range(1, len(parts)):
+            if self.matches('/'.join(parts[:depth]), is_dir=True):
+                return True
+        return self.matches(path, is_dir)
+
+    def walk(self, root: PathLike, nested_gitignores: bool = False) -> Iterator[Tuple[Path, str]]:
+        """Yield (absolute path, relative posix path) of every non-ignored file
+
+        Ignored directories are pruned without being listed. With
+        nested_gitignores, .gitignore files found along the way add rules
+        scoped to their directory.
+        """
+        root = Path(root)
+        stack: List[Tuple[Path, str, IgnoreMatcher]] = [(root, '', self)]
+        while stack:
+            directory, relative_dir, matcher = stack.pop()
+            if nested_gitignores:
+                gitignore = directory / '.gitignore'
+                if gitignore.is_file():
+                    lines = gitignore.read_text(encoding='utf-8', errors='replace').splitlines()
+                    matcher = matcher.with_rules(lines, relative_dir)
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            subdirectories = []
+            for entry in entries:
+                relative = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if matcher.matches(relative, is_dir):
+                    continue
+                if is_dir:
+                    subdirectories.append((Path(entry.path), relative, matcher))
+                elif entry.is_file():
+                    yield Path(entry.path), relative
+            stack.extend(reversed(subdirectories))
+
+    def _add(self, patterns: Iterable[str], base: str) -> None:
+        base = base.strip('/')
+        for line in patterns:
+            rule = parse_rule(line, base)
+            if rule is not None:
+                self._rules.append(rule)
+
+    def _compile(self) -> None:
+        self._groups = []
+        for regex, negated, directory_only, name_only in self._rules:
+            if not self._groups or self._groups[-1].negated != negated:
+                self._groups.append(_RuleGroup(negated))
+            self._groups[-1].add(regex, directory_only, name_only)
+        for group in self._groups:
+            group.compile()
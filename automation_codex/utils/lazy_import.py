@@ -0,0 +1,53 @@
+"""
+Lazy Import Utilities
+Defer heavy optional dependencies (numpy, networkx, ...) until first use
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Dict, List
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return a module that is only executed on first attribute access
+
+    Already-imported modules are returned as-is. Missing modules raise
+    ImportError immediately, so optional-dependency checks still work.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def lazy_exports(package: str, exports: Dict[str, str]):
+    """Build PEP 562 __getattr__/__dir__ for a package re-exporting submodule names
+
+    exports maps attribute name -> relative submodule (e.g. '.scraping_models').
+    The submodule is imported when the attribute is first accessed and the
+    value is cached on the package module.
+    """
+    def __getattr__(name: str):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        module = importlib.import_module(submodule, package)
+        value = module if submodule.lstrip('.') == name else getattr(module, name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,423 @@
+"""
+Metrics Instrumentation
+In-process counters, gauges and latency histograms for hot paths
+
+Metrics are disabled by default (set CODEX_METRICS=1 or call
+enable_metrics()). While disabled, @timed/@counted wrappers only check one
+attribute before calling through, and timer() hands back a shared no-op
+context manager, so instrumented code pays next to nothing. Per-item hot
+paths (graph mutations, state transitions) guard inline with
+`if metrics.enabled:` instead of wrapping.
+
+snapshot() returns plain dicts; to_prometheus()/to_openmetrics() render
+the text exposition formats, and serve_metrics() exposes them over HTTP
+for scraping.
+"""
+
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Seconds; covers sub-microsecond graph ops up to minute-long gh calls
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5,
+                   1.0, 5.0, 10.0, 60.0)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """Monotonically increasing value"""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+
+class Gauge:
+    """Value that can go up and down"""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+
+class Histogram:
+    """Observations counted into fixed cumulative buckets, plus sum and count"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket plus the +Inf overflow
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.sum = 0.0
+            self.count = 0
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) pairs ending with +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, fraction: float) -> float:
+        """Upper bucket bound containing the given quantile (0 when empty)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        for bound, cumulative in self.cumulative():
+            if cumulative >= rank:
+                return bound
+        return math.inf
+
+
+class _Timer:
+    """Context manager observing elapsed seconds into a histogram"""
+
+    __slots__ = ('histogram', '_started')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self) -> '_Timer':
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.histogram.observe(time.perf_counter() - self._started)
+
+
+class _NullTimer:
+    """Shared do-nothing timer handed out while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+_KINDS = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}
+
+
+class MetricsRegistry:
+    """Named metric families keyed by label values"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._families: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _child(self, kind: str, name: str, help_text: str, labels: Dict[str, Any],
+               buckets: Optional[Sequence[float]] = None) -> Any:
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.setdefault(name, {
+                    'type': kind, 'help': help_text, 'children': {},
+                    'buckets': tuple(buckets or DEFAULT_BUCKETS)})
+        if family['type'] != kind:
+            raise ValueError(f"Metric {name} is a {family['type']}, not a {kind}")
+        key: LabelKey = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        child = family['children'].get(key)
+        if child is None:
+            with self._lock:
+                child = family['children'].get(key)
+                if child is None:
+                    child = (Histogram(family['buckets']) if kind == 'histogram'
+                             else _KINDS[kind]())
+                    family['children'][key] = child
+        return child
+
+    def counter(self, name: str, help_text: str = '', **labels: Any) -> Counter:
+        return self._child('counter', name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str = '', **labels: Any) -> Gauge:
+        return self._child('gauge', name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = '', buckets: Optional[Sequence[float]] = None,
+                  **labels: Any) -> Histogram:
+        return self._child('histogram', name, help_text, labels, buckets)
+
+    def inc(self, name: str, amount: float = 1.0, help_text: str = '', **labels: Any) -> None:
+        """Increment a counter if metrics are enabled"""
+        if self.enabled:
+            self._child('counter', name, help_text, labels).inc(amount)
+
+    def observe(self, name: str, value: float, help_text: str = '', **labels: Any) -> None:
+        """Record a histogram observation if metrics are enabled"""
+        if self.enabled:
+            self._child('histogram', name, help_text, labels).observe(value)
+
+    def timer(self, name: str, help_text: str = '', **labels: Any):
+        """Context manager timing its block in seconds (no-op while disabled)"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self._child('histogram', name, help_text, labels))
+
+    def reset(self) -> None:
+        """Zero every metric in place (decorators keep their histogram references)"""
+        with self._lock:
+            for family in self._families.values():
+                for child in family['children'].values():
+                    child.reset()
+
+    def collect(self) -> List[Tuple[str, Dict[str, Any], List[Tuple[LabelKey, Any]]]]:
+        """Consistent (name, family, sorted children) listing for exporters"""
+        with self._lock:
+            return [(name, family, sorted(family['children'].items()))
+                    for name, family in sorted(self._families.items())]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current values as plain dicts, one entry per metric family"""
+        result = {}
+        for name, family, children in self.collect():
+            samples = []
+            for key, child in children:
+                sample: Dict[str, Any] = {'labels': dict(key)}
+                if family['type'] == 'histogram':
+                    sample.update(count=child.count, sum=child.sum,
+                                  buckets={_format_bound(bound): count
+                                           for bound, count in child.cumulative()},
+                                  p50=child.quantile(0.5), p99=child.quantile(0.99))
+                else:
+                    sample['value'] = child.value
+                samples.append(sample)
+            result[name] = {'type': family['type'], 'help': family['help'], 'samples': samples}
+        return result
+
+
+metrics = MetricsRegistry(enabled=os.environ.get('CODEX_METRICS', '').lower() in ('1', 'true', 'yes'))
+
+
+def enable_metrics() -> MetricsRegistry:
+    metrics.enabled = True
+    return metrics
+
+
+def disable_metrics() -> None:
+    metrics.enabled = False
+
+
+# ----------------------------------------------------------------------
+# Decorators
+# ----------------------------------------------------------------------
+
+def timed(name: str, help_text: str = '', registry: Optional[MetricsRegistry] = None,
+          **labels: Any) -> Callable:
+    """Decorator recording call latency (seconds) into a histogram
+
+    Works on plain functions and coroutine functions. Calls that raise are
+    timed too, and additionally counted in {name}_errors_total.
+    """
+    registry = registry or metrics
+
+    def decorator(func: Callable) -> Callable:
+        histogram: List[Histogram] = []
+
+        def record(started: float, failed: bool) -> None:
+            if not histogram:
+                histogram.append(registry.histogram(name, help_text, **labels))
+            histogram[0].observe(time.perf_counter() - started)
+            if failed:
+                registry.counter(f"{_base_name(name)}_errors_total",
+                                 f"Failed calls of {func.__qualname__}", **labels).inc()
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    record(started, failed)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record(started, failed)
+        return wrapper
+    return decorator
+
+
+def counted(name: str, help_text: str = '', registry: Optional[MetricsRegistry] = None,
+            **labels: Any) -> Callable:
+    """Decorator counting calls"""
+    registry = registry or metrics
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if registry.enabled:
+                registry.counter(name, help_text, **labels).inc()
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# Exposition formats
+# ----------------------------------------------------------------------
+
+def _base_name(name: str) -> str:
+    for suffix in ('_seconds', '_total'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == math.inf else repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{label}="{_escape(value)}"' for label, value in pairs) + '}'
+
+
+def _render(registry: MetricsRegistry, openmetrics: bool) -> str:
+    lines = []
+    for name, family, children in registry.collect():
+        kind = family['type']
+        # OpenMetrics names counter families without the _total suffix
+        family_name = name[:-len('_total')] if openmetrics and kind == 'counter' \
+            and name.endswith('_total') else name
+        help_text = _escape(family['help'] or name)
+        lines.append(f"# HELP {family_name} {help_text}")
+        lines.append(f"# TYPE {family_name} {kind}")
+        for key, child in children:
+            if kind == 'histogram':
+                for bound, count in child.cumulative():
+                    lines.append(f"{name}_bucket{_format_labels(key, (('le', _format_bound(bound)),))} "
+                                 f"{count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(child.sum)}")
+                lines.append(f"{name}_count{_format_labels(key)} {child.count}")
+            else:
+                sample_name = f"{family_name}_total" if openmetrics and kind == 'counter' else name
+                lines.append(f"{sample_name}{_format_labels(key)} {_format_value(child.value)}")
+    if openmetrics:
+        lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def to_prometheus(registry: Optional[MetricsRegistry] = None) -> str:
+    """Prometheus text exposition format 0.0.4"""
+    return _render(registry or metrics, openmetrics=False)
+
+
+def to_openmetrics(registry: Optional[MetricsRegistry] = None) -> str:
+    """OpenMetrics 1.0 text format"""
+    return _render(registry or metrics, openmetrics=True)
+
+
+def serve_metrics(port: int = 9464, host: str = '127.0.0.1',
+                  registry: Optional[MetricsRegistry] = None) -> 'ThreadingHTTPServer':
+    """Serve /metrics on a daemon thread; OpenMetrics when the scraper asks for it"""
+    # Imported here: http.server is slow to import and only needed when serving
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or metrics
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            if 'application/openmetrics-text' in self.headers.get('Accept', ''):
+                body, content_type = to_openmetrics(registry), OPENMETRICS_CONTENT_TYPE
+            else:
+                body, content_type = to_prometheus(registry), PROMETHEUS_CONTENT_TYPE
+            payload = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='codex-metrics', daemon=True).start()
+    return server
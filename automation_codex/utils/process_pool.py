@@ -0,0 +1,32 @@
+"""
+Process Pool Utilities
+Worker process pools that are safe to create from a threaded process
+
+By the time a pool is first needed, the logging listener, metrics server,
+sampling profiler or graph worker threads may already be running, and
+forking a threaded process can copy locks held by those threads into the
+children. Pools here start their workers with forkserver (spawn where that
+is unavailable). Scripts that use them therefore need an
+`if __name__ == '__main__':` guard, as the children re-import __main__.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+def start_method() -> str:
+    """forkserver where the platform supports it, spawn otherwise"""
+    import multiprocessing
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def create_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """ProcessPoolExecutor whose workers are never forked from this process"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context(start_method()))
@@ -0,0 +1,106 @@
+"""
+Queued Logging
+Non-blocking logging for hot paths: callers only enqueue records, a
+background listener thread formats and writes them with batched flushes
+and size-based file rotation.
+"""
+
+import atexit
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional
+
+
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """Size-rotating file handler that flushes in batches instead of per record"""
+
+    def __init__(self, filename, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5,
+                 flush_every: int = 256, flush_interval: float = 1.0, encoding: str = 'utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            if (self._pending >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        super().flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+class FlushingQueueListener(QueueListener):
+    """Queue listener that flushes its handlers whenever the queue goes idle"""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler,
+                 flush_interval: float = 1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush()
+
+
+_active_listener: Optional[FlushingQueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def start_queued_logging(handlers: List[logging.Handler], level: int = logging.INFO,
+                         flush_interval: float = 1.0,
+                         logger: Optional[logging.Logger] = None) -> FlushingQueueListener:
+    """Route logger (root by default) through a queue drained by a writer thread
+
+    Replaces any listener started earlier, so repeated configuration does
+    not attach duplicate handlers.
+    """
+    global _active_listener, _queue_handler
+    target = logger or logging.getLogger()
+    stop_queued_logging(target)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _active_listener = FlushingQueueListener(log_queue, *handlers, flush_interval=flush_interval)
+    _active_listener.start()
+
+    target.addHandler(_queue_handler)
+    target.setLevel(level)
+    return _active_listener
+
+
+def stop_queued_logging(logger: Optional[logging.Logger] = None) -> None:
+    """Drain the queue, stop the writer thread and close its handlers"""
+    global _active_listener, _queue_handler
+    if _queue_handler is not None:
+        (logger or logging.getLogger()).removeHandler(_queue_handler)
+        _queue_handler = None
+    if _active_listener is not None:
+        _active_listener.stop()
+        for handler in _active_listener.handlers:
+            handler.close()
+        _active_listener = None
+
+
+atexit.register(stop_queued_logging)
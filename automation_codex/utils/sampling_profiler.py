@@ -0,0 +1,318 @@
+"""
+Sampling Profiler
+Low-overhead in-process stack sampler for long-running jobs
+
+A daemon thread wakes up at a fixed rate, snapshots every thread's Python
+stack through sys._current_frames() and counts identical stacks (as tuples
+of code objects; labels are only built when dumping). Results are written
+as collapsed stacks (flamegraph.pl / inferno / speedscope import) or as a
+native speedscope JSON file with one profile per thread.
+
+Profiling is opt-in: create a SamplingProfiler explicitly, or set
+CODEX_PROFILE_HZ (e.g. 100) so maybe_start_profiler() starts a process-wide
+profiler that dumps on SIGUSR2 and at exit. Files go to CodexConfig.logs_dir
+unless an output directory is given.
+"""
+
+import atexit
+import json
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('collapsed', 'speedscope')
+# (file basename, function) leaf frames of threads that are blocked waiting
+_IDLE_LEAVES = {
+    ('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'), ('selectors.py', 'select'), ('socketserver.py', 'serve_forever'),
+    ('socket.py', 'accept'), ('connection.py', 'wait'),
+    ('thread.py', '_worker')
+}
+
+Stack = Tuple[CodeType, ...]
+
+
+def _frame_label(code: CodeType) -> str:
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Background thread aggregating sampled Python stacks per thread"""
+
+    def __init__(self, hz: float = 100.0, output_dir: Optional[Union[str, Path]] = None,
+                 include_idle: bool = False, max_depth: int = 256):
+        if not (hz > 0 and math.isfinite(hz)):
+            raise ValueError(f"hz must be finite and positive, got {hz}")
+        self.hz = hz
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        self._stacks: Dict[Tuple[str, Stack], int] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._idle_codes: Dict[CodeType, bool] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self._started_at: Optional[float] = None
+        self._elapsed = 0.0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'SamplingProfiler':
+        if self.running:
+            return self
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='codex-sampling-profiler',
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"Sampling profiler started at {self.hz:g} Hz")
+        return self
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._elapsed += time.perf_counter() - self._started_at
+        self._started_at = None
+
+    def clear(self) -> None:
+        """Discard collected samples"""
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+            self.sampling_seconds = 0.0
+
+    def __enter__(self) -> 'SamplingProfiler':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        interval = 1.0 / self.hz
+        own_id = threading.get_ident()
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            self._sample(own_id)
+            finished = time.perf_counter()
+            self.sampling_seconds += finished - started
+            # Fixed-rate schedule; skip missed ticks instead of bursting
+            next_tick += interval
+            if next_tick < finished:
+                next_tick = finished + interval
+            self._stop.wait(next_tick - finished)
+
+    def _sample(self, own_id: int) -> None:
+        frames = sys._current_frames()
+        with self._lock:
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = self._walk(frame)
+                if not stack or (not self.include_idle and self._is_idle(stack[-1])):
+                    continue
+                name = self._thread_names.get(thread_id)
+                if name is None:
+                    self._thread_names.update((thread.ident, thread.name)
+                                              for thread in threading.enumerate())
+                    name = self._thread_names.get(thread_id, f"thread-{thread_id}")
+                key = (name, stack)
+                self._stacks[key] = self._stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def _walk(self, frame: Optional[FrameType]) -> Stack:
+        codes = []
+        depth = self.max_depth
+        while frame is not None and depth:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+            depth -= 1
+        codes.reverse()
+        return tuple(codes)
+
+    def _is_idle(self, code: CodeType) -> bool:
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            idle = (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+            self._idle_codes[code] = idle
+        return idle
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    @property
+    def overhead(self) -> float:
+        """Fraction of wall time spent sampling since start"""
+        elapsed = self._elapsed
+        if self._started_at is not None:
+            elapsed += time.perf_counter() - self._started_at
+        return self.sampling_seconds / elapsed if elapsed else 0.0
+
+    def folded(self) -> Dict[str, int]:
+        """Collapsed stacks ('thread;outer;...;leaf') with their sample counts"""
+        with self._lock:
+            items = list(self._stacks.items())
+        labels: Dict[CodeType, str] = {}
+        result: Dict[str, int] = {}
+        for (thread_name, stack), count in items:
+            parts = [thread_name.replace(';', ':')]
+            for code in stack:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code).replace(';', ':')
+                parts.append(label)
+            key = ';'.join(parts)
+            result[key] = result.get(key, 0) + count
+        return result
+
+    def to_collapsed(self) -> str:
+        lines = [f"{stack} {count}" for stack, count in sorted(self.folded().items())]
+        return '\n'.join(lines) + ('\n' if lines else '')
+
+    def to_speedscope(self, name: str = 'AutomationCodex') -> Dict:
+        """speedscope file-format document with one sampled profile per thread"""
+        with self._lock:
+            items = list(self._stacks.items())
+        frame_index: Dict[CodeType, int] = {}
+        frames: List[Dict] = []
+        per_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        interval = 1.0 / self.hz
+        for (thread_name, stack), count in sorted(items, key=lambda item: item[0][0]):
+            indices = []
+            for code in stack:
+                index = frame_index.get(code)
+                if index is None:
+                    index = frame_index[code] = len(frames)
+                    frames.append({'name': getattr(code, 'co_qualname', code.co_name),
+                                   'file': code.co_filename, 'line': code.co_firstlineno})
+                indices.append(index)
+            samples, weights = per_thread.setdefault(thread_name, ([], []))
+            samples.append(indices)
+            weights.append(count * interval)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'automation_codex.utils.sampling_profiler',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [{'type': 'sampled', 'name': thread_name, 'unit': 'seconds',
+                          'startValue': 0, 'endValue': sum(weights),
+                          'samples': samples, 'weights': weights}
+                         for thread_name, (samples, weights) in per_thread.items()]
+        }
+
+    def dump(self, output_dir: Optional[Union[str, Path]] = None,
+             formats: Tuple[str, ...] = FORMATS, prefix: str = 'profile') -> List[Path]:
+        """Write the collected samples; returns the written paths"""
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown profile formats: {sorted(unknown)}")
+        directory = Path(output_dir) if output_dir is not None else self._default_output_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+        paths = []
+        if 'collapsed' in formats:
+            path = directory / f"{stem}.collapsed"
+            path.write_text(self.to_collapsed(), encoding='utf-8')
+            paths.append(path)
+        if 'speedscope' in formats:
+            path = directory / f"{stem}.speedscope.json"
+            path.write_text(json.dumps(self.to_speedscope(name=stem)), encoding='utf-8')
+            paths.append(path)
+        logger.info(f"Wrote {self.samples} profile samples ({self.overhead:.2%} overhead) "
+                    f"to {', '.join(str(path) for path in paths)}")
+        return paths
+
+    def _default_output_dir(self) -> Path:
+        if self.output_dir is not None:
+            return self.output_dir
+        from ..config import get_codex_config
+        return get_codex_config().logs_dir
+
+    def install_signal_handler(self, signum: Optional[int] = None) -> bool:
+        """Dump on a signal (SIGUSR2 by default); returns False where unsupported"""
+        signum = signum if signum is not None else getattr(signal, 'SIGUSR2', None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+
+        def handle(received, frame):
+            # Write from a helper thread: the handler interrupts arbitrary code
+            threading.Thread(target=self.dump, name='codex-profile-dump', daemon=True).start()
+
+        signal.signal(signum, handle)
+        return True
+
+
+_global_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    """The process-wide profiler started by maybe_start_profiler, if any"""
+    return _global_profiler
+
+
+def maybe_start_profiler(hz: Optional[float] = None) -> Optional[SamplingProfiler]:
+    """Start the process-wide profiler if hz is given or CODEX_PROFILE_HZ is set
+
+    Idempotent. The profiler dumps to CodexConfig.logs_dir (or
+    CODEX_PROFILE_DIR) on SIGUSR2 and once more at interpreter exit.
+    CODEX_PROFILE_HZ=0 means off; values that are not a finite positive
+    rate are ignored with a warning.
+    """
+    global _global_profiler
+    if _global_profiler is not None:
+        return _global_profiler
+    if hz is None:
+        setting = os.environ.get('CODEX_PROFILE_HZ')
+        if not setting:
+            return None
+        try:
+            hz = float(setting)
+        except ValueError:
+            hz = math.nan
+        if hz == 0:
+            return None
+        if not (hz > 0 and math.isfinite(hz)):
+            logger.warning(f"Ignoring invalid CODEX_PROFILE_HZ={setting!r}")
+            return None
+
+    _global_profiler = SamplingProfiler(hz, output_dir=os.environ.get('CODEX_PROFILE_DIR'))
+    _global_profiler.install_signal_handler()
+    _global_profiler.start()
+    atexit.register(_dump_at_exit)
+    return _global_profiler
+
+
+def _dump_at_exit() -> None:
+    if _global_profiler is not None and _global_profiler.samples:
+        _global_profiler.stop()
+        _global_profiler.dump()
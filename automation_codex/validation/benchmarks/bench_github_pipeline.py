@@ -0,0 +1,410 @@
+"""
+GitHub Pipeline Benchmark
+Offline end-to-end timing of the GitHub monetization pipeline on synthetic repos
+
+Generates synthetic local repository trees (size, depth, fan-out and the
+share of ignorable vendor directories are configurable) plus matching
+`gh repo list` metadata, then runs
+GitHubMonetizationEngine.analyze_complete_profile with an offline CLI stub.
+Reports per-stage call counts and inclusive wall time, file-system call
+counts (scandir/stat/open/glob) and optionally writes a cProfile stats file
+(pstats format, loadable by snakeviz or `python -m pstats`). The script
+has no network or subprocess dependencies, so it can also be run under
+`py-spy record -- python -m ...` for native flame graphs.
+
+Usage:
+    python -m automation_codex.validation.benchmarks.bench_github_pipeline --repos 20 --files 2000
+    python -m automation_codex.validation.benchmarks.bench_github_pipeline --files 20000 --vendor-files 50000 \\
+        --profile-output pipeline.prof --output pipeline.json
+"""
+
+import argparse
+import asyncio
+import builtins
+import contextlib
+import cProfile
+import functools
+import inspect
+import io
+import json
+import os
+import pathlib
+import pstats
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from automation_codex.integrations.github_monetization_engine import (
+    GitHubCLIManager,
+    GitHubMonetizationEngine
+)
+from automation_codex.validation.benchmarks.harness import peak_rss_mb, run_metadata
+
+LANGUAGES = [('Python', '.py'), ('JavaScript', '.js'), ('TypeScript', '.ts'), ('Go', '.go'),
+             ('Rust', '.rs')]
+TOPICS = ['machine-learning', 'api', 'automation', 'data-science', 'devops', 'security',
+          'library', 'web-framework', 'cli', 'blockchain']
+VENDOR_DIRS = ['node_modules', '.venv', 'build', '__pycache__']
+
+PYTHON_SOURCE = '''"""Synthetic module {index}"""
+
+from typing import List
+
+
+def compute_{index}(values: List[int]) -> int:
+    """Sum the values"""
+    return sum(values)
+'''
+SCRIPT_SOURCE = "export function compute{index}(values) {{ return values.reduce((a, b) => a + b, 0); }}\n"
+
+
+# ----------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------
+
+@dataclass
+class TreeShape:
+    """Shape of one synthetic repository tree"""
+    files: int = 1_000
+    depth: int = 4
+    fanout: int = 6
+    python_share: float = 0.6
+    vendor_files: int = 0
+    file_bytes: int = 0
+
+
+def _directories(shape: TreeShape, rng: random.Random) -> List[Path]:
+    """Relative directories of a tree with the given depth and fan-out"""
+    directories = [Path('.')]
+    frontier = [Path('.')]
+    for level in range(shape.depth):
+        frontier = [parent / f"pkg{level}_{i}" for parent in frontier
+                    for i in range(rng.randint(1, shape.fanout))]
+        directories.extend(frontier)
+        if len(directories) > shape.files:
+            break
+    return directories
+
+
+def generate_repo_tree(root: Path, shape: TreeShape, seed: int = 0) -> Dict[str, int]:
+    """Write a synthetic repository under root; returns file counts"""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    for name, content in [('README.md', '# Synthetic repo\n\n## Installation\n\n## Usage\n' + 'x' * 600),
+                          ('LICENSE', 'MIT License\n'), ('setup.py', 'from setuptools import setup\n'),
+                          ('.gitignore', 'dist/\n*.log\n'), ('requirements.txt', 'numpy\n')]:
+        (root / name).write_text(content, encoding='utf-8')
+    (root / 'tests').mkdir(exist_ok=True)
+    (root / 'tests' / 'test_basic.py').write_text('def test_ok():\n    assert True\n', encoding='utf-8')
+    (root / 'docs').mkdir(exist_ok=True)
+
+    padding = '#' * shape.file_bytes
+    directories = _directories(shape, rng)
+    for directory in directories:
+        (root / directory).mkdir(parents=True, exist_ok=True)
+    for index in range(shape.files):
+        directory = root / directories[rng.randrange(len(directories))]
+        if rng.random() < shape.python_share:
+            path, content = directory / f"module_{index}.py", PYTHON_SOURCE.format(index=index)
+        else:
+            path, content = directory / f"script_{index}.js", SCRIPT_SOURCE.format(index=index)
+        path.write_text(content + padding, encoding='utf-8')
+
+    for index in range(shape.vendor_files):
+        vendor = root / VENDOR_DIRS[index % len(VENDOR_DIRS)] / f"dep{index % 97}"
+        vendor.mkdir(parents=True, exist_ok=True)
+        (vendor / f"vendored_{index}.js").write_text(SCRIPT_SOURCE.format(index=index), encoding='utf-8')
+    return {'files': shape.files, 'vendor_files': shape.vendor_files, 'directories': len(directories)}
+
+
+def synthetic_repo_metadata(name: str, owner: str, rng: random.Random) -> Dict[str, Any]:
+    """One repository entry shaped like `gh repo list --json` output"""
+    language = rng.choice(LANGUAGES)[0]
+    return {
+        'name': name,
+        'nameWithOwner': f"{owner}/{name}",
+        'description': f"Synthetic {language} project {name}",
+        'primaryLanguage': {'name': language},
+        'stargazerCount': int(rng.paretovariate(1.2) * 10),
+        'forkCount': int(rng.paretovariate(1.5) * 3),
+        'diskUsage': rng.randint(100, 100_000),
+        'updatedAt': '2025-11-01T00:00:00Z',
+        'repositoryTopics': [{'topic': {'name': topic}} for topic in rng.sample(TOPICS, 3)],
+        'licenseInfo': {'name': 'MIT License'} if rng.random() < 0.7 else None,
+        'isPrivate': False,
+        'url': f"https://github.com/{owner}/{name}",
+        'defaultBranchRef': {'name': 'main'}
+    }
+
+
+class OfflineGitHubCLI(GitHubCLIManager):
+    """GitHubCLIManager serving synthetic data instead of calling gh"""
+
+    def __init__(self, username: str, user_repos: List[Dict[str, Any]],
+                 org_repos: Dict[str, List[Dict[str, Any]]]):
+        self.user_repos = user_repos
+        self.org_repos = org_repos
+        self.authenticated = True
+        self.current_user = {'login': username, 'name': 'Synthetic User', 'bio': '',
+                             'followers': 42, 'following': 7, 'public_repos': len(user_repos)}
+
+    def _check_authentication(self) -> bool:
+        return True
+
+    def get_user_repositories(self, username: Optional[str] = None,
+                              include_private: bool = False) -> List[Dict[str, Any]]:
+        return list(self.user_repos)
+
+    def get_user_organizations(self, username: Optional[str] = None) -> List[str]:
+        return list(self.org_repos)
+
+    def get_organization_repositories(self, org_name: str) -> List[Dict[str, Any]]:
+        return list(self.org_repos.get(org_name, []))
+
+
+def build_workspace(root: Path, repos: int, orgs: int, shape: TreeShape,
+                    seed: int = 0) -> OfflineGitHubCLI:
+    """Generate repo trees under root and an offline CLI listing them"""
+    rng = random.Random(seed)
+    username = 'synthetic-user'
+    owners = [username] + [f"synthetic-org-{i}" for i in range(orgs)]
+    listings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for index in range(repos):
+        owner = owners[index % len(owners)]
+        name = f"repo-{index}"
+        listings[owner].append(synthetic_repo_metadata(name, owner, rng))
+        generate_repo_tree(root / name, shape, seed=seed + index)
+    return OfflineGitHubCLI(username, listings.pop(username, []), dict(listings))
+
+
+# ----------------------------------------------------------------------
+# Instrumentation
+# ----------------------------------------------------------------------
+
+class StageTimer:
+    """Per-stage call counts and inclusive wall time via instance method wrappers
+
+    Generator methods (e.g. _iter_files) are timed across their iteration:
+    each resumption up to the next yield is charged to the generator's
+    stage (and, being inclusive, to the consuming stage as well).
+    """
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.seconds: Dict[str, float] = defaultdict(float)
+
+    def wrap(self, owner: Any, method: str, stage: Optional[str] = None) -> None:
+        original = getattr(owner, method)
+        stage = stage or f"{type(owner).__name__}.{method}"
+
+        if asyncio.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self.calls[stage] += 1
+                    self.seconds[stage] += time.perf_counter() - started
+        elif inspect.isgeneratorfunction(original):
+            @functools.wraps(original)
+            def timed(*args, **kwargs):
+                self.calls[stage] += 1
+                iterator = original(*args, **kwargs)
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            item = next(iterator)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            self.seconds[stage] += time.perf_counter() - started
+                        yield item
+                finally:
+                    iterator.close()
+        else:
+            @functools.wraps(original)
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.calls[stage] += 1
+                    self.seconds[stage] += time.perf_counter() - started
+        setattr(owner, method, timed)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {stage: {'calls': self.calls[stage], 'seconds': self.seconds[stage],
+                        'mean_ms': self.seconds[stage] / self.calls[stage] * 1000}
+                for stage in sorted(self.seconds, key=self.seconds.get, reverse=True)}
+
+
+FS_CALLS = [(os, 'scandir'), (os, 'stat'), (os, 'lstat'), (os, 'listdir'), (os, 'walk'),
+            (builtins, 'open'), (io, 'open'),
+            (pathlib.Path, 'glob'), (pathlib.Path, 'rglob'), (pathlib.Path, 'exists'),
+            (pathlib.Path, 'is_dir'), (pathlib.Path, 'is_file')]
+
+
+@contextlib.contextmanager
+def count_fs_calls() -> Iterator[Counter]:
+    """Count file-system calls made inside the block
+
+    Path.exists/is_dir/is_file are counted themselves and again as the
+    os.stat they perform, so the os.* counts are the syscall-level totals.
+    """
+    counts: Counter = Counter()
+    originals = []
+    for owner, name in FS_CALLS:
+        original = getattr(owner, name)
+        label = f"{getattr(owner, '__name__', owner)}.{name}"
+
+        def counted(*args, _original=original, _label=label, **kwargs):
+            counts[_label] += 1
+            return _original(*args, **kwargs)
+        originals.append((owner, name, original))
+        setattr(owner, name, counted)
+    try:
+        yield counts
+    finally:
+        for owner, name, original in reversed(originals):
+            setattr(owner, name, original)
+
+
+def instrument(engine: GitHubMonetizationEngine) -> StageTimer:
+    """Wrap the pipeline stages of an engine with a StageTimer"""
+    timer = StageTimer()
+    timer.wrap(engine, 'analyze_complete_profile')
+    for method in ('get_user_repositories', 'get_user_organizations', 'get_organization_repositories'):
+        timer.wrap(engine.github_cli, method, f"GitHubCLIManager.{method}")
+    for method in ('analyze_directory', '_iter_files', '_calculate_structure_score',
+                   '_calculate_documentation_score', '_analyze_code_quality',
+                   '_identify_monetization_assets'):
+        timer.wrap(engine.local_analyzer, method)
+    timer.wrap(engine.monetization_analyzer, 'analyze_repository_value')
+    timer.wrap(engine, '_calculate_profile_value_score')
+    timer.wrap(engine, '_generate_monetization_opportunities')
+    return timer
+
+
+def count_files_scanned(engine: GitHubMonetizationEngine) -> Counter:
+    """Wrap analyze_directory to total the files it reports scanning"""
+    analyzer = engine.local_analyzer
+    original = analyzer.analyze_directory
+    scanned: Counter = Counter()
+
+    @functools.wraps(original)
+    def counting(*args, **kwargs):
+        analysis = original(*args, **kwargs)
+        scanned['files'] += analysis.get('total_files', 0)
+        return analysis
+
+    analyzer.analyze_directory = counting
+    return scanned
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def run_pipeline(workspace: Path, cli: OfflineGitHubCLI, profile_output: Optional[Path] = None,
+                 quiet: bool = True) -> Dict[str, Any]:
+    """Run analyze_complete_profile once over workspace and collect measurements"""
+    engine = GitHubMonetizationEngine(github_cli=cli)
+    timer = instrument(engine)
+    files_scanned = count_files_scanned(engine)
+    profiler = cProfile.Profile() if profile_output else None
+    output = io.StringIO()
+
+    capture = contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext()
+
+    started = time.perf_counter()
+    with count_fs_calls() as fs_counts, capture:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            profile = asyncio.run(engine.analyze_complete_profile(
+                include_organizations=True, analyze_local_files=True,
+                local_repos_path=str(workspace)))
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    elapsed = time.perf_counter() - started
+
+    if profiler is not None:
+        profiler.dump_stats(str(profile_output))
+    return {
+        'total_seconds': elapsed,
+        'repositories': len(profile.repositories),
+        'directories_analyzed': timer.calls['LocalFileSystemAnalyzer.analyze_directory'],
+        'files_analyzed': files_scanned['files'],
+        'stages': timer.report(),
+        'fs_calls': dict(fs_counts.most_common()),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"Analyzed {result['repositories']} repositories ({result['files_analyzed']} files) "
+          f"in {result['total_seconds']:.3f}s (peak RSS {result['peak_rss_mb']:.1f} MB)")
+    print(f"\n{'stage (inclusive)':<58} {'calls':>7} {'total s':>9} {'mean ms':>10}")
+    for stage, stats in result['stages'].items():
+        print(f"{stage:<58} {stats['calls']:>7} {stats['seconds']:>9.3f} {stats['mean_ms']:>10.3f}")
+    print(f"\n{'file-system call':<58} {'count':>7}")
+    for call, count in result['fs_calls'].items():
+        print(f"{call:<58} {count:>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--repos', type=int, default=10)
+    parser.add_argument('--orgs', type=int, default=2)
+    parser.add_argument('--files', type=int, default=1_000, help='source files per repository')
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--fanout', type=int, default=6)
+    parser.add_argument('--vendor-files', type=int, default=0,
+                        help='files per repository in ignorable vendor directories')
+    parser.add_argument('--file-bytes', type=int, default=0, help='extra padding per source file')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workspace', type=Path,
+                        help='reuse/keep synthetic repos here instead of a temporary directory')
+    parser.add_argument('--profile-output', type=Path, help='write cProfile stats (pstats format)')
+    parser.add_argument('--print-stats', type=int, default=0,
+                        help='print the top N functions by cumulative time')
+    parser.add_argument('--output', type=Path, help='write results JSON here')
+    parser.add_argument('--verbose', action='store_true', help="show the pipeline's own output")
+    args = parser.parse_args()
+
+    shape = TreeShape(files=args.files, depth=args.depth, fanout=args.fanout,
+                      vendor_files=args.vendor_files, file_bytes=args.file_bytes)
+    workspace = args.workspace or Path(tempfile.mkdtemp(prefix='codex_pipeline_bench_'))
+    try:
+        generation_started = time.perf_counter()
+        cli = build_workspace(workspace, args.repos, args.orgs, shape, args.seed)
+        generation_seconds = time.perf_counter() - generation_started
+
+        result = run_pipeline(workspace, cli, args.profile_output, quiet=not args.verbose)
+        result['generation_seconds'] = generation_seconds
+        print_report(result)
+        if args.profile_output and args.print_stats:
+            print()
+            pstats.Stats(str(args.profile_output)).sort_stats('cumulative').print_stats(args.print_stats)
+        if args.output:
+            payload = {**run_metadata(), 'benchmark': 'bench_github_pipeline',
+                       'config': {**vars(args), 'workspace': str(workspace),
+                                  'output': str(args.output),
+                                  'profile_output': str(args.profile_output) if args.profile_output else None},
+                       **result}
+            args.output.write_text(json.dumps(payload, indent=2), encoding='utf-8')
+    finally:
+        if args.workspace is None:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Mathematical Models Benchmark
+Throughput, latency and peak allocation of the core model methods at several scales
+
+Covers TemplateEvolutionGraph, ContentComplexityAnalyzer and
+TrendPredictionMDP on synthetic graphs, prompt texts and trend intensities.
+Whole-graph analyses (centrality, PageRank) are super-linear and only run up
+to their own scale cap unless --no-caps is given.
+
+Baselines are machine-specific, so none ships with the repo: save one with
+--save-baseline on the machine that will run the comparisons, then pass it
+with --baseline.
+
+Usage:
+    python -m automation_codex.validation.benchmarks.bench_models --scales 1000 100000
+    python -m automation_codex.validation.benchmarks.bench_models --save-baseline baseline.json
+    python -m automation_codex.validation.benchmarks.bench_models --output run.json --baseline baseline.json
+"""
+
+import argparse
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from automation_codex.core.content_cache import content_cache
+from automation_codex.core.mathematical_models import (
+    CompactTemplateNode,
+    ContentComplexityAnalyzer,
+    TemplateEvolutionGraph,
+    TrendPredictionMDP
+)
+from automation_codex.core.prompt_generator import create_prompt_generator
+from automation_codex.validation.benchmarks.harness import (
+    BenchmarkResult,
+    Prepared,
+    compare_to_baseline,
+    load_results,
+    print_results,
+    run_case,
+    write_results
+)
+
+DEFAULT_SCALES = [1_000, 100_000, 1_000_000]
+CATEGORIES = ['Social Media Critique', 'Climate Crisis', 'AI & Technology', 'Political Satire',
+              'Privacy & Surveillance', 'Consumerism Critique', 'Labor & Economy']
+BATCH_SIZE = 4096
+
+
+# ----------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------
+
+def synthetic_templates(count: int, seed: int = 0) -> List[CompactTemplateNode]:
+    rng = random.Random(seed)
+    return [CompactTemplateNode(id=f"AMP-{i}", category=CATEGORIES[i % len(CATEGORIES)],
+                                trend_intensity=rng.uniform(0, 100),
+                                energy_score=rng.uniform(0, 100))
+            for i in range(count)]
+
+
+def synthetic_links(count: int, links: int, seed: int = 0) -> List[Tuple[str, str, float]]:
+    """Random evolution links, biased towards recent templates like real lineages"""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(links):
+        target = rng.randrange(1, count) if count > 1 else 0
+        source = rng.randrange(0, target) if target else 0
+        result.append((f"AMP-{source}", f"AMP-{target}", rng.random()))
+    return result
+
+
+def synthetic_graph(count: int, links_per_node: int = 2, seed: int = 0) -> TemplateEvolutionGraph:
+    graph = TemplateEvolutionGraph()
+    for node in synthetic_templates(count, seed):
+        graph.add_template(node)
+    for source, target, similarity in synthetic_links(count, count * links_per_node, seed):
+        graph.add_evolution_link(source, target, similarity)
+    return graph
+
+
+def synthetic_texts(count: int, seed: int = 0) -> List[str]:
+    """Distinct prompt texts drawn from the combinatorial prompt generator"""
+    generator = create_prompt_generator()
+    prompts = list(generator.sample(min(count, generator.total_combinations), seed=seed))
+    return [f"{prompts[i % len(prompts)]}, series {i}" for i in range(count)]
+
+
+def synthetic_intensities(count: int, seed: int = 0) -> List[float]:
+    rng = random.Random(seed)
+    return [rng.uniform(0, 100) for _ in range(count)]
+
+
+# ----------------------------------------------------------------------
+# Cases
+# ----------------------------------------------------------------------
+
+def prepare_add_template(scale: int) -> Prepared:
+    graph = TemplateEvolutionGraph()
+    nodes = synthetic_templates(scale)
+    return (lambda i: graph.add_template(nodes[i])), scale, 1
+
+
+def prepare_add_evolution_link(scale: int) -> Prepared:
+    graph = TemplateEvolutionGraph()
+    for node in synthetic_templates(scale):
+        graph.add_template(node)
+    links = synthetic_links(scale, scale)
+    return (lambda i: graph.add_evolution_link(*links[i])), scale, 1
+
+
+def prepare_optimize_template_mix(scale: int) -> Prepared:
+    graph = synthetic_graph(scale)
+    return (lambda i: graph.optimize_template_mix()), 3, 1
+
+
+def prepare_find_evolution_opportunities(scale: int) -> Prepared:
+    graph = synthetic_graph(scale)
+    return (lambda i: graph.find_evolution_opportunities()), 3, 1
+
+
+def prepare_complexity_score(scale: int) -> Prepared:
+    texts = synthetic_texts(scale)
+    content_cache.clear()
+    return (lambda i: ContentComplexityAnalyzer.content_complexity_score(texts[i])), scale, 1
+
+
+def prepare_complexity_score_cached(scale: int) -> Prepared:
+    texts = synthetic_texts(min(scale, 1_000))
+    content_cache.clear()
+    for text in texts:
+        ContentComplexityAnalyzer.content_complexity_score(text)
+    count = len(texts)
+    return (lambda i: ContentComplexityAnalyzer.content_complexity_score(texts[i % count])), scale, 1
+
+
+def prepare_calculate_entropy(scale: int) -> Prepared:
+    texts = synthetic_texts(scale)
+    content_cache.clear()
+    return (lambda i: ContentComplexityAnalyzer.calculate_entropy(texts[i])), scale, 1
+
+
+def prepare_batch_complexity_scores(scale: int) -> Prepared:
+    texts = synthetic_texts(scale)
+    batch = min(BATCH_SIZE, scale)
+    batches = [texts[start:start + batch] for start in range(0, scale - batch + 1, batch)]
+    return ((lambda i: ContentComplexityAnalyzer.batch_complexity_scores(batches[i])),
+            len(batches), batch)
+
+
+def prepare_predict_next_trend(scale: int) -> Prepared:
+    mdp = TrendPredictionMDP()
+    intensities = synthetic_intensities(scale)
+    return (lambda i: mdp.predict_next_trend(intensities[i])), scale, 1
+
+
+def prepare_recommend_action(scale: int) -> Prepared:
+    mdp = TrendPredictionMDP()
+    rng = random.Random(0)
+    mdp.q_table[:] = [[rng.random() for _ in mdp.actions] for _ in mdp.states]
+    states = [mdp.states[i % len(mdp.states)] for i in range(scale)]
+    return (lambda i: mdp.recommend_action(states[i])), scale, 1
+
+
+@dataclass
+class Case:
+    name: str
+    prepare: Callable[[int], Prepared]
+    max_scale: Optional[int] = None
+
+
+CASES = [
+    Case('TemplateEvolutionGraph.add_template', prepare_add_template),
+    Case('TemplateEvolutionGraph.add_evolution_link', prepare_add_evolution_link),
+    Case('TemplateEvolutionGraph.optimize_template_mix', prepare_optimize_template_mix, 100_000),
+    # Betweenness centrality is O(V * E)
+    Case('TemplateEvolutionGraph.find_evolution_opportunities',
+         prepare_find_evolution_opportunities, 2_000),
+    Case('ContentComplexityAnalyzer.calculate_entropy', prepare_calculate_entropy),
+    Case('ContentComplexityAnalyzer.content_complexity_score', prepare_complexity_score),
+    Case('ContentComplexityAnalyzer.content_complexity_score[cached]',
+         prepare_complexity_score_cached),
+    Case('ContentComplexityAnalyzer.batch_complexity_scores', prepare_batch_complexity_scores),
+    Case('TrendPredictionMDP.predict_next_trend', prepare_predict_next_trend),
+    Case('TrendPredictionMDP.recommend_action', prepare_recommend_action)
+]
+
+
+def run(scales: List[int], case_filter: Optional[List[str]] = None, caps: bool = True,
+        repeats: int = 5, memory: bool = True) -> List[BenchmarkResult]:
+    """Run every selected case at every scale within its cap"""
+    results = []
+    for case in CASES:
+        if case_filter and not any(part in case.name for part in case_filter):
+            continue
+        for scale in scales:
+            if caps and case.max_scale is not None and scale > case.max_scale:
+                continue
+            try:
+                results.append(run_case(case.name, scale, case.prepare, repeats, memory=memory))
+            except ImportError as e:
+                # e.g. networkx.pagerank needs scipy
+                print(f"Skipping {case.name}@{scale}: {e}", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--cases', nargs='+', help='only run cases whose name contains one of these')
+    parser.add_argument('--no-caps', action='store_true',
+                        help='run super-linear graph analyses at every scale')
+    parser.add_argument('--repeats', type=int, default=5,
+                        help='minimum fresh runs per case; the best throughput is reported')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc memory pass')
+    parser.add_argument('--output', type=Path, help='write results JSON here')
+    parser.add_argument('--baseline', type=Path, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', type=Path, help='also write results as a baseline here')
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help='allowed fractional regression in ops/s or p99 latency, '
+                             'widened for cases noisier than this')
+    args = parser.parse_args()
+
+    results = run(args.scales, args.cases, caps=not args.no_caps, repeats=args.repeats,
+                  memory=not args.no_memory)
+    print_results(results)
+    extra = {'benchmark': 'bench_models', 'scales': args.scales}
+    if args.output:
+        write_results(args.output, results, extra)
+    if args.save_baseline:
+        write_results(args.save_baseline, results, extra)
+
+    if args.baseline is None:
+        return
+    baseline_path = args.baseline
+    regressions = compare_to_baseline(results, load_results(baseline_path), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+              f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+              f"({regression['change']:+.1%})")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Node Memory Benchmark
+Reports bytes per node for the plain and compact graph node representations
+
+Usage:
+    python -m automation_codex.validation.benchmarks.bench_node_memory
+    python -m automation_codex.validation.benchmarks.bench_node_memory --nodes 100000 --with-graph
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from automation_codex.core.mathematical_models import (
+    CompactTemplateNode,
+    TemplateEvolutionGraph,
+    TemplateNode
+)
+from automation_codex.core.scraping_models import (
+    CompactGraphNode,
+    GraphNode,
+    ScrapingGraph
+)
+
+CONTENT_TYPES = ['html', 'json', 'xml', 'pdf']
+CATEGORIES = ['Social Media Critique', 'Climate Crisis', 'AI & Technology', 'Political Satire']
+
+
+def _fresh(text: str) -> str:
+    """Build a new, non-interned copy of text as a parser would produce it"""
+    return ''.join(list(text))
+
+
+def make_graph_nodes(count: int) -> List[GraphNode]:
+    return [GraphNode(id=f"page-{i}", url=f"https://example.com/{i}",
+                      content_type=_fresh(CONTENT_TYPES[i % 4]), priority=float(i % 10),
+                      dependencies=set(), metadata={})
+            for i in range(count)]
+
+
+def make_compact_graph_nodes(count: int) -> List[CompactGraphNode]:
+    return [CompactGraphNode(id=f"page-{i}", url=f"https://example.com/{i}",
+                             content_type=_fresh(CONTENT_TYPES[i % 4]), priority=float(i % 10))
+            for i in range(count)]
+
+
+def make_template_nodes(count: int) -> List[TemplateNode]:
+    return [TemplateNode(id=f"AMP-{i}", category=_fresh(CATEGORIES[i % 4]),
+                         trend_intensity=float(i % 100), energy_score=float(i % 90),
+                         dependencies=set(), metadata={})
+            for i in range(count)]
+
+
+def make_compact_template_nodes(count: int) -> List[CompactTemplateNode]:
+    return [CompactTemplateNode(id=f"AMP-{i}", category=_fresh(CATEGORIES[i % 4]),
+                                trend_intensity=float(i % 100), energy_score=float(i % 90))
+            for i in range(count)]
+
+
+def _scraping_graph_of(factory: Callable[[int], List[Any]]) -> Callable[[int], ScrapingGraph]:
+    def build(count: int) -> ScrapingGraph:
+        graph = ScrapingGraph()
+        for node in factory(count):
+            graph.add_node(node)
+        return graph
+    return build
+
+
+def _template_graph_of(factory: Callable[[int], List[Any]]) -> Callable[[int], TemplateEvolutionGraph]:
+    def build(count: int) -> TemplateEvolutionGraph:
+        graph = TemplateEvolutionGraph()
+        for node in factory(count):
+            graph.add_template(node)
+        return graph
+    return build
+
+
+def measure_bytes_per_node(builder: Callable[[int], Any], count: int) -> float:
+    """Net traced allocation per node for the structure returned by builder"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = builder(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    gc.collect()
+    return (after - before) / count
+
+
+def run(count: int, with_graph: bool = False) -> Dict[str, float]:
+    """Run all node memory measurements"""
+    cases = {
+        'GraphNode': make_graph_nodes,
+        'CompactGraphNode': make_compact_graph_nodes,
+        'TemplateNode': make_template_nodes,
+        'CompactTemplateNode': make_compact_template_nodes
+    }
+    if with_graph:
+        cases.update({
+            'ScrapingGraph[GraphNode]': _scraping_graph_of(make_graph_nodes),
+            'ScrapingGraph[CompactGraphNode]': _scraping_graph_of(make_compact_graph_nodes),
+            'TemplateEvolutionGraph[TemplateNode]': _template_graph_of(make_template_nodes),
+            'TemplateEvolutionGraph[CompactTemplateNode]': _template_graph_of(make_compact_template_nodes)
+        })
+    return {name: measure_bytes_per_node(builder, count) for name, builder in cases.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--nodes', type=int, default=1_000_000)
+    parser.add_argument('--with-graph', action='store_true',
+                        help='also measure nodes inserted into their graph containers')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    results = run(args.nodes, args.with_graph)
+    if args.json:
+        print(json.dumps({'nodes': args.nodes, 'bytes_per_node': results}, indent=2))
+        return
+
+    print(f"Bytes per node at {args.nodes:,} nodes")
+    for name, per_node in results.items():
+        print(f"  {name:<45} {per_node:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""
+Benchmark Harness
+Shared timing, memory and baseline-comparison helpers for the benchmark scripts
+
+Each case is measured over several fresh repeats: throughput is the best
+repeat and latency percentiles the median, and the interquartile spread
+between repeats is kept as the case's noise level. Memory is a separate
+pass under tracemalloc, reporting the peak allocation made by the calls
+themselves, so it is independent of whatever earlier cases left behind
+(timings from that pass are discarded, since tracing slows allocation).
+
+Results serialize straight to JSON; a run file holds the results plus
+environment metadata and can be stored as the baseline for later runs on
+the same machine.
+"""
+
+import gc
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput, latency and memory of one benchmarked operation at one scale"""
+    name: str
+    scale: int
+    ops: int
+    seconds: float
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_alloc_mb: float = 0.0
+    repeats: int = 1
+    noise: float = 0.0
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.scale}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# (operation, number of calls, operations per call)
+Prepared = Tuple[Callable[[int], Any], int, int]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB
+
+    A process-wide high-water mark: it only ever grows, so it describes a
+    whole run rather than any one case.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def measure(name: str, scale: int, operation: Callable[[int], Any], calls: int,
+            ops_per_call: int = 1, warmup: int = 0) -> BenchmarkResult:
+    """Time calls of operation(i), each counting as ops_per_call operations
+
+    Every call is timed individually for the latency percentiles; warmup
+    calls run first and are not recorded.
+    """
+    for i in range(warmup):
+        operation(i)
+    clock = time.perf_counter_ns
+    latencies = [0] * calls
+    started = clock()
+    for i in range(calls):
+        before = clock()
+        operation(i)
+        latencies[i] = clock() - before
+    elapsed = (clock() - started) / 1e9
+
+    latencies.sort()
+    ops = calls * ops_per_call
+    return BenchmarkResult(
+        name=name,
+        scale=scale,
+        ops=ops,
+        seconds=elapsed,
+        ops_per_sec=ops / elapsed if elapsed > 0 else float('inf'),
+        p50_ms=percentile(latencies, 0.50) / 1e6,
+        p99_ms=percentile(latencies, 0.99) / 1e6
+    )
+
+
+def measure_peak_alloc_mb(operation: Callable[[int], Any], calls: int) -> float:
+    """Peak memory allocated while running calls of operation, in MiB
+
+    Measured with tracemalloc relative to the level when the calls start,
+    so memory held from before (other cases, prepared inputs) is excluded.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        for i in range(calls):
+            operation(i)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return max(0, peak - start) / (1024 * 1024)
+
+
+def combine_repeats(runs: List[BenchmarkResult]) -> BenchmarkResult:
+    """One result from repeats: best throughput, median latencies, spread as noise
+
+    noise is the interquartile range of per-repeat throughput relative to
+    its median, which ignores the odd repeat hit by a scheduler stall.
+    """
+    throughputs = [run.ops_per_sec for run in runs]
+    best = max(runs, key=lambda run: run.ops_per_sec)
+    median = statistics.median(throughputs)
+    noise = 0.0
+    if len(throughputs) >= 4 and median > 0:
+        lower, _, upper = statistics.quantiles(throughputs, n=4)
+        noise = (upper - lower) / median
+    return BenchmarkResult(
+        name=best.name,
+        scale=best.scale,
+        ops=best.ops,
+        seconds=best.seconds,
+        ops_per_sec=best.ops_per_sec,
+        p50_ms=statistics.median(run.p50_ms for run in runs),
+        p99_ms=statistics.median(run.p99_ms for run in runs),
+        peak_alloc_mb=max(run.peak_alloc_mb for run in runs),
+        repeats=len(runs),
+        noise=noise
+    )
+
+
+def run_case(name: str, scale: int, prepare: Callable[[int], Prepared], repeats: int = 5,
+             warmup: int = 0, memory: bool = True, min_seconds: float = 0.5,
+             max_repeats: int = 100) -> BenchmarkResult:
+    """Measure a case over fresh repeats, plus a memory pass unless memory is False
+
+    prepare(scale) builds new state for every repeat, so operations that
+    mutate their inputs are measured from the same starting point each time.
+    Cases faster than min_seconds in total get extra repeats (up to
+    max_repeats), since a handful of millisecond runs is mostly timer and
+    scheduler noise.
+    """
+    if repeats < 1:
+        raise ValueError(f"repeats must be at least 1, got {repeats}")
+    runs: List[BenchmarkResult] = []
+    while len(runs) < repeats or (sum(run.seconds for run in runs) < min_seconds
+                                  and len(runs) < max_repeats):
+        operation, calls, ops_per_call = prepare(scale)
+        gc.collect()
+        runs.append(measure(name, scale, operation, calls, ops_per_call, warmup))
+        del operation
+    result = combine_repeats(runs)
+    if memory:
+        operation, calls, _ = prepare(scale)
+        gc.collect()
+        result.peak_alloc_mb = measure_peak_alloc_mb(operation, calls)
+        del operation
+    return result
+
+
+def run_metadata() -> Dict[str, Any]:
+    """Environment details stored alongside results"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine()
+    }
+
+
+def write_results(path: Union[str, Path], results: Iterable[BenchmarkResult],
+                  extra: Optional[Dict[str, Any]] = None) -> Path:
+    """Write a run file: metadata plus one entry per result"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {**run_metadata(), **(extra or {}),
+               'results': [result.to_dict() for result in results]}
+    path.write_text(json.dumps(payload, indent=2), encoding='utf-8')
+    return path
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, BenchmarkResult]:
+    """Results of a run file keyed by name@scale"""
+    payload = json.loads(Path(path).read_text(encoding='utf-8'))
+    fields = set(BenchmarkResult.__dataclass_fields__)
+    results = (BenchmarkResult(**{key: value for key, value in entry.items() if key in fields})
+               for entry in payload.get('results', []))
+    return {result.key: result for result in results}
+
+
+def compare_to_baseline(results: Iterable[BenchmarkResult], baseline: Dict[str, BenchmarkResult],
+                        threshold: float = 0.20, noise_factor: float = 1.5,
+                        min_latency_ms: float = 0.05) -> List[Dict[str, Any]]:
+    """Regressions beyond threshold (fractional) in throughput or p99 latency
+
+    The allowed change per case is the larger of threshold and noise_factor
+    times the repeat-to-repeat noise of either run, so cases that are
+    naturally jittery need a bigger change to be flagged. Results without
+    a baseline entry are skipped. p99 increases smaller than min_latency_ms
+    in absolute terms are ignored, since microsecond tails are mostly
+    scheduler jitter.
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.key)
+        if reference is None:
+            continue
+        allowed = max(threshold, noise_factor * max(result.noise, reference.noise))
+        checks = [
+            ('ops_per_sec', reference.ops_per_sec, result.ops_per_sec,
+             result.ops_per_sec < reference.ops_per_sec * (1 - allowed)),
+            ('p99_ms', reference.p99_ms, result.p99_ms,
+             result.p99_ms > reference.p99_ms * (1 + allowed)
+             and result.p99_ms - reference.p99_ms >= min_latency_ms)
+        ]
+        for metric, before, after, regressed in checks:
+            if regressed:
+                change = (after - before) / before if before else float('inf')
+                regressions.append({'benchmark': result.key, 'metric': metric,
+                                    'baseline': before, 'current': after, 'change': change})
+    return regressions
+
+
+def print_results(results: Iterable[BenchmarkResult]) -> None:
+    """Human-readable results table"""
+    results = list(results)
+    width = max([len('benchmark')] + [len(result.key) for result in results])
+    print(f"{'benchmark':<{width}} {'ops/s':>14} {'noise':>7} {'p50 ms':>10} {'p99 ms':>10} "
+          f"{'peak alloc MB':>14}")
+    for result in results:
+        print(f"{result.key:<{width}} {result.ops_per_sec:>14,.0f} {result.noise:>7.1%} "
+              f"{result.p50_ms:>10.4f} {result.p99_ms:>10.4f} {result.peak_alloc_mb:>14.2f}")
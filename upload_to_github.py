@@ -2,53 +2,189 @@
 """
 GitHub Upload Automation Script
 Uses GitHub API to upload all project files programmatically
+
+Bulk mode (default) creates blobs concurrently over a pooled session, builds
+one tree via the Git Data API and publishes it as a single commit. Blobs
+already on the branch or recorded in the local manifest are skipped, so an
+interrupted upload resumes where it stopped. --per-file keeps the old
+one-commit-per-file contents API upload.
+
+File contents are base64-encoded in chunks straight into the request body,
+so memory per upload stays at one chunk regardless of file size, and the
+bytes in flight across concurrent uploads are capped. Files above the blob
+size limit go through Git LFS when --lfs is given.
 """
 
 import os
+import argparse
 import base64
+import hashlib
 import requests
 import json
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from automation_codex.utils.ignore import IgnoreMatcher
 
 # Configuration
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
 REPO_OWNER = 'BoozeLee'
 REPO_NAME = 'c-h-OODOOOOORRRR'
 BASE_URL = f'https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}'
+BRANCH = 'main'
+WORKSPACE = Path('/home/runner/workspace')
+MANIFEST_NAME = '.github_upload_manifest.json'
+TREE_CHUNK_SIZE = 1000
+ENCODE_CHUNK_SIZE = 3 * 256 * 1024  # multiple of 3 so chunks encode without padding
+MAX_IN_FLIGHT_BYTES = 256 * 1024 * 1024
+LFS_THRESHOLD = 50 * 1024 * 1024  # GitHub warns above 50 MB and rejects blobs above 100 MB
+REQUEST_TIMEOUT = (10, 300)  # (connect, read) seconds; reads allow for slow large blobs
+LFS_BATCH_URL = f'https://github.com/{REPO_OWNER}/{REPO_NAME}.git/info/lfs/objects/batch'
 
-# Files to skip
+# Files to skip (.gitignore syntax; the workspace .gitignore files are applied on top).
+# The leading '*' keeps the reach of the old substring rules, so secrets such as
+# .env.production, .envrc or prod.env never leave the workspace.
 SKIP_PATTERNS = [
-    '.git/', 'node_modules/', '.cache/', '.local/', 
-    '__pycache__/', '.replit', 'replit.nix',
-    '.env', '.env.local'
+    '.*/',  # hidden directories, including .git/, .cache/ and .local/
+    '*.git/', '*.cache/', '*.local/', '*node_modules/', '*__pycache__/',
+    '*.replit*', '*replit.nix*',
+    '*.env*',  # .env, .env.local, .env.*, .envrc, *.env
+    MANIFEST_NAME
 ]
 
-def should_skip(file_path):
-    """Check if file should be skipped"""
-    for pattern in SKIP_PATTERNS:
-        if pattern in str(file_path):
-            return True
-    return False
+@lru_cache(maxsize=None)
+def get_skip_matcher(workspace=WORKSPACE):
+    """Compiled skip rules plus the workspace's top-level .gitignore"""
+    return IgnoreMatcher.from_file(Path(workspace) / '.gitignore', SKIP_PATTERNS)
 
-def upload_file(file_path, content):
+def should_skip(file_path, is_dir=False, workspace=WORKSPACE):
+    """Check if a workspace-relative path should be skipped"""
+    return get_skip_matcher(workspace).is_ignored(file_path, is_dir)
+
+class StreamingBase64Body:
+    """File-like JSON request body that base64-encodes a file chunk by chunk
+
+    Produces {**fields, "content": "<base64 of file>"} without ever holding
+    the encoded file in memory. The exact length is known up front, so
+    requests sends a Content-Length instead of chunked encoding. seek()
+    restarts the encoding, so urllib3 can rewind the body when it retries.
+    """
+    
+    def __init__(self, file_path, fields=None, chunk_size=ENCODE_CHUNK_SIZE):
+        self.file_path = Path(file_path)
+        self.size = self.file_path.stat().st_size
+        self.chunk_size = chunk_size - chunk_size % 3 or 3
+        head = json.dumps(fields or {})[:-1]
+        separator = ', ' if fields else ''
+        self.prefix = f'{head}{separator}"content": "'.encode()
+        self.suffix = b'"}'
+        self.length = len(self.prefix) + base64_length(self.size) + len(self.suffix)
+        self._rewind()
+    
+    def __len__(self):
+        return self.length
+    
+    def _rewind(self):
+        self._parts = self._generate()
+        self._current = b''
+        self._offset = 0
+        self._position = 0
+    
+    def tell(self):
+        return self._position
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.length
+        if not 0 <= offset <= self.length:
+            raise ValueError(f'seek offset {offset} outside body of {self.length} bytes')
+        if offset < self._position:
+            self._parts.close()
+            self._rewind()
+        while self._position < offset:
+            self.read(min(offset - self._position, self.chunk_size))
+        return self._position
+    
+    def _generate(self):
+        yield self.prefix
+        with open(self.file_path, 'rb') as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield base64.b64encode(chunk)
+        yield self.suffix
+    
+    def read(self, size=-1):
+        if size is None or size < 0:
+            rest = self._current[self._offset:] + b''.join(self._parts)
+            self._current, self._offset = b'', 0
+            self._position += len(rest)
+            return rest
+        
+        pieces = []
+        while size > 0:
+            if self._offset >= len(self._current):
+                self._current, self._offset = next(self._parts, b''), 0
+                if not self._current:
+                    break
+            piece = self._current[self._offset:self._offset + size]
+            self._offset += len(piece)
+            size -= len(piece)
+            pieces.append(piece)
+        data = b''.join(pieces)
+        self._position += len(data)
+        return data
+
+class ByteBudget:
+    """Caps the total bytes of request bodies in flight across threads"""
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.condition = threading.Condition()
+    
+    @contextmanager
+    def reserve(self, nbytes):
+        # An oversized request is admitted on its own rather than never
+        with self.condition:
+            while self.in_flight and self.in_flight + nbytes > self.limit:
+                self.condition.wait()
+            self.in_flight += nbytes
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.in_flight -= nbytes
+                self.condition.notify_all()
+
+def base64_length(nbytes):
+    """Length of the base64 encoding of nbytes bytes"""
+    return 4 * ((nbytes + 2) // 3)
+
+def upload_file(file_path, source_path, branch=BRANCH):
     """Upload a single file to GitHub"""
     headers = {
         'Authorization': f'token {GITHUB_TOKEN}',
-        'Accept': 'application/vnd.github.v3+json'
+        'Accept': 'application/vnd.github.v3+json',
+        'Content-Type': 'application/json'
     }
     
-    # Encode content
-    encoded_content = base64.b64encode(content).decode('utf-8')
-    
-    # Prepare API request
+    # Stream the base64-encoded content into the request body
     url = f'{BASE_URL}/contents/{file_path}'
-    data = {
+    body = StreamingBase64Body(source_path, {
         'message': f'Add {file_path}',
-        'content': encoded_content,
-        'branch': 'main'
-    }
+        'branch': branch
+    })
     
-    response = requests.put(url, headers=headers, json=data)
+    response = requests.put(url, headers=headers, data=body, timeout=REQUEST_TIMEOUT)
     
     if response.status_code in [200, 201]:
         print(f'✅ Uploaded: {file_path}')
@@ -58,42 +194,378 @@ def upload_file(file_path, content):
         print(response.json())
         return False
 
+def iter_workspace_files(workspace):
+    """Yield (absolute path, relative posix path) for every file to upload
+    
+    Skipped directories are pruned without being listed, and nested
+    .gitignore files apply to their own subtree.
+    """
+    yield from IgnoreMatcher(SKIP_PATTERNS).walk(workspace, nested_gitignores=True)
+
+def upload_per_file(workspace, branch=BRANCH):
+    """Legacy upload: one contents API PUT (and one commit) per file"""
+    uploaded = 0
+    failed = 0
+    
+    for file_path, relative_path in iter_workspace_files(workspace):
+        try:
+            if upload_file(relative_path, file_path, branch):
+                uploaded += 1
+            else:
+                failed += 1
+                
+        except Exception as e:
+            print(f'❌ Error reading {relative_path}: {e}')
+            failed += 1
+    
+    return uploaded, failed
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request"""
+    
+    def __init__(self, *args, timeout=REQUEST_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+    
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+def create_session(pool_size):
+    """Authenticated session with connection pooling, retries and timeouts
+
+    Retries cover every method; streamed request bodies are rewindable, so
+    a retried POST resends the whole body.
+    """
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'token {GITHUB_TOKEN}',
+        'Accept': 'application/vnd.github.v3+json'
+    })
+    retry = Retry(total=5, backoff_factor=0.5,
+                  status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=None, respect_retry_after_header=True)
+    adapter = TimeoutHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    return session
+
+def git_blob_sha(content):
+    """SHA-1 git assigns to a blob with this content"""
+    header = f'blob {len(content)}\0'.encode()
+    return hashlib.sha1(header + content).hexdigest()
+
+def hash_file(file_path, size):
+    """Return (git blob sha-1, sha-256) of a file, reading it in chunks"""
+    blob_hash = hashlib.sha1(f'blob {size}\0'.encode())
+    content_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(ENCODE_CHUNK_SIZE)
+            if not chunk:
+                break
+            blob_hash.update(chunk)
+            content_hash.update(chunk)
+    return blob_hash.hexdigest(), content_hash.hexdigest()
+
+def file_mode(file_path):
+    """Git tree mode for a file"""
+    return '100755' if os.access(file_path, os.X_OK) else '100644'
+
+class UploadManifest:
+    """Local record of blobs already created, so interrupted uploads resume"""
+    
+    def __init__(self, path, branch):
+        self.path = Path(path)
+        self.key = f'{REPO_OWNER}/{REPO_NAME}@{branch}'
+        self.lock = threading.Lock()
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self.entries = json.load(f).get(self.key, {})
+            except (OSError, ValueError) as e:
+                print(f'⚠️  Ignoring unreadable manifest {self.path}: {e}')
+    
+    def lookup(self, relative_path, stat):
+        """Blob sha recorded for an unchanged file, if any"""
+        entry = self.entries.get(relative_path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha']
+        return None
+    
+    def record(self, relative_path, stat, sha):
+        with self.lock:
+            self.entries[relative_path] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha': sha
+            }
+    
+    def save(self):
+        with self.lock:
+            data = {}
+            if self.path.exists():
+                try:
+                    with open(self.path) as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    data = {}
+            data[self.key] = self.entries
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+def get_branch_head(session, branch):
+    """Return (commit sha, tree sha) of the branch head, or (None, None)"""
+    response = session.get(f'{BASE_URL}/git/ref/heads/{branch}')
+    if response.status_code == 404:
+        return None, None
+    response.raise_for_status()
+    commit_sha = response.json()['object']['sha']
+    commit = session.get(f'{BASE_URL}/git/commits/{commit_sha}')
+    commit.raise_for_status()
+    return commit_sha, commit.json()['tree']['sha']
+
+def get_remote_blobs(session, tree_sha):
+    """Map path -> blob sha for the whole remote tree"""
+    if tree_sha is None:
+        return {}
+    response = session.get(f'{BASE_URL}/git/trees/{tree_sha}', params={'recursive': '1'})
+    response.raise_for_status()
+    data = response.json()
+    if data.get('truncated'):
+        print('⚠️  Remote tree listing truncated; some unchanged files will be re-uploaded')
+    return {item['path']: item['sha'] for item in data['tree'] if item['type'] == 'blob'}
+
+def create_blob(session, content):
+    """Create a blob via the Git Data API and return its sha"""
+    data = {
+        'content': base64.b64encode(content).decode('utf-8'),
+        'encoding': 'base64'
+    }
+    response = session.post(f'{BASE_URL}/git/blobs', json=data)
+    response.raise_for_status()
+    return response.json()['sha']
+
+def create_blob_streaming(session, file_path, budget):
+    """Create a blob from a file, streaming its base64 encoding"""
+    body = StreamingBase64Body(file_path, {'encoding': 'base64'})
+    with budget.reserve(len(body)):
+        response = session.post(f'{BASE_URL}/git/blobs', data=body,
+                                headers={'Content-Type': 'application/json'})
+    response.raise_for_status()
+    return response.json()['sha']
+
+def upload_lfs_object(session, file_path, size, oid, budget):
+    """Upload a file to Git LFS storage and return its pointer file content"""
+    lfs_headers = {
+        'Accept': 'application/vnd.git-lfs+json',
+        'Content-Type': 'application/vnd.git-lfs+json'
+    }
+    batch = {
+        'operation': 'upload',
+        'transfers': ['basic'],
+        'objects': [{'oid': oid, 'size': size}]
+    }
+    response = session.post(LFS_BATCH_URL, json=batch, headers=lfs_headers,
+                            auth=('x-access-token', GITHUB_TOKEN))
+    response.raise_for_status()
+    lfs_object = response.json()['objects'][0]
+    if 'error' in lfs_object:
+        raise RuntimeError(f"LFS rejected {file_path}: {lfs_object['error'].get('message')}")
+    
+    # No actions means the object is already in LFS storage
+    actions = lfs_object.get('actions', {})
+    if 'upload' in actions:
+        upload = actions['upload']
+        with budget.reserve(size), open(file_path, 'rb') as f:
+            put = requests.put(upload['href'], data=f,
+                               headers={**upload.get('header', {}),
+                                        'Content-Type': 'application/octet-stream'},
+                               timeout=REQUEST_TIMEOUT)
+        put.raise_for_status()
+    if 'verify' in actions:
+        verify = actions['verify']
+        response = session.post(verify['href'], json={'oid': oid, 'size': size},
+                                headers={**lfs_headers, **verify.get('header', {})})
+        response.raise_for_status()
+    
+    return (f'version https://git-lfs.github.com/spec/v1\n'
+            f'oid sha256:{oid}\n'
+            f'size {size}\n').encode()
+
+def prepare_blob(session, file_path, relative_path, manifest, known_shas, budget, use_lfs):
+    """Return (tree entry, uploaded, stored in LFS) for a file
+
+    The blob is only uploaded if it is not already known remotely. Files
+    above LFS_THRESHOLD are stored in Git LFS and committed as pointers.
+    """
+    stat = file_path.stat()
+    is_lfs = stat.st_size > LFS_THRESHOLD
+    if is_lfs and not use_lfs:
+        raise RuntimeError(f'{stat.st_size} bytes exceeds the blob limit; rerun with --lfs')
+    
+    sha = manifest.lookup(relative_path, stat)
+    uploaded = False
+    if sha is None:
+        sha, oid = hash_file(file_path, stat.st_size)
+        if is_lfs:
+            pointer = upload_lfs_object(session, file_path, stat.st_size, oid, budget)
+            sha = git_blob_sha(pointer)
+            if sha not in known_shas:
+                create_blob(session, pointer)
+            uploaded = True
+        elif sha not in known_shas:
+            created_sha = create_blob_streaming(session, file_path, budget)
+            if created_sha != sha:
+                raise RuntimeError(f'blob sha mismatch for {relative_path}: {created_sha} != {sha}')
+            uploaded = True
+        manifest.record(relative_path, stat, sha)
+    entry = {'path': relative_path, 'mode': file_mode(file_path), 'type': 'blob', 'sha': sha}
+    return entry, uploaded, is_lfs
+
+def lfs_attributes_entry(session, workspace, remote_blobs, lfs_paths):
+    """Tree entry for a .gitattributes that tracks lfs_paths, or None if unchanged"""
+    local = workspace / '.gitattributes'
+    if local.exists():
+        text = local.read_text()
+    elif '.gitattributes' in remote_blobs:
+        response = session.get(f"{BASE_URL}/git/blobs/{remote_blobs['.gitattributes']}")
+        response.raise_for_status()
+        text = base64.b64decode(response.json()['content']).decode()
+    else:
+        text = ''
+    
+    existing = set(text.splitlines())
+    # Spaces separate pattern and attributes, so they must be escaped
+    lines = [f"{path.replace(' ', '[[:space:]]')} filter=lfs diff=lfs merge=lfs -text"
+             for path in sorted(lfs_paths)]
+    missing = [line for line in lines if line not in existing]
+    if not missing:
+        return None
+    
+    if text and not text.endswith('\n'):
+        text += '\n'
+    content = (text + '\n'.join(missing) + '\n').encode()
+    return {'path': '.gitattributes', 'mode': '100644', 'type': 'blob',
+            'sha': create_blob(session, content)}
+
+def create_tree(session, entries, base_tree):
+    """Create a tree from entries, chunked to stay under API request limits"""
+    tree_sha = base_tree
+    for start in range(0, len(entries), TREE_CHUNK_SIZE):
+        data = {'tree': entries[start:start + TREE_CHUNK_SIZE]}
+        if tree_sha:
+            data['base_tree'] = tree_sha
+        response = session.post(f'{BASE_URL}/git/trees', json=data)
+        response.raise_for_status()
+        tree_sha = response.json()['sha']
+    return tree_sha
+
+def publish_commit(session, branch, tree_sha, parent_sha, message):
+    """Create a commit for tree_sha and move the branch to it"""
+    data = {'message': message, 'tree': tree_sha, 'parents': [parent_sha] if parent_sha else []}
+    response = session.post(f'{BASE_URL}/git/commits', json=data)
+    response.raise_for_status()
+    commit_sha = response.json()['sha']
+    
+    if parent_sha:
+        response = session.patch(f'{BASE_URL}/git/refs/heads/{branch}', json={'sha': commit_sha})
+    else:
+        response = session.post(f'{BASE_URL}/git/refs',
+                                json={'ref': f'refs/heads/{branch}', 'sha': commit_sha})
+    response.raise_for_status()
+    return commit_sha
+
+def upload_bulk(workspace, branch=BRANCH, workers=16, message=None, use_lfs=False,
+                max_in_flight_bytes=MAX_IN_FLIGHT_BYTES):
+    """Upload the workspace as a single commit via the Git Data API"""
+    session = create_session(workers)
+    budget = ByteBudget(max_in_flight_bytes)
+    manifest = UploadManifest(workspace / MANIFEST_NAME, branch)
+    
+    parent_sha, base_tree = get_branch_head(session, branch)
+    remote_blobs = get_remote_blobs(session, base_tree)
+    known_shas = set(remote_blobs.values()) | {e['sha'] for e in manifest.entries.values()}
+    
+    entries = []
+    lfs_paths = []
+    uploaded = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(prepare_blob, session, file_path, relative_path, manifest, known_shas,
+                            budget, use_lfs):
+                relative_path
+            for file_path, relative_path in iter_workspace_files(workspace)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            relative_path = futures[future]
+            try:
+                entry, was_uploaded, is_lfs = future.result()
+            except Exception as e:
+                print(f'❌ Failed: {relative_path} - {e}')
+                failed += 1
+                continue
+            uploaded += was_uploaded
+            if is_lfs:
+                lfs_paths.append(relative_path)
+            if remote_blobs.get(relative_path) != entry['sha']:
+                entries.append(entry)
+            if done % 500 == 0:
+                manifest.save()
+                print(f'   … {done}/{len(futures)} files processed')
+    manifest.save()
+    
+    if failed:
+        print(f'❌ {failed} blobs failed; rerun to resume (completed blobs are in {MANIFEST_NAME})')
+        return uploaded, failed
+    if lfs_paths:
+        attributes = lfs_attributes_entry(session, workspace, remote_blobs, lfs_paths)
+        if attributes is not None:
+            entries = [entry for entry in entries if entry['path'] != '.gitattributes']
+            entries.append(attributes)
+    
+    if not entries:
+        print('✅ Branch already up to date, nothing to commit')
+        return uploaded, failed
+    
+    entries.sort(key=lambda entry: entry['path'])
+    tree_sha = create_tree(session, entries, base_tree)
+    commit_message = message or f'Upload {len(entries)} files'
+    commit_sha = publish_commit(session, branch, tree_sha, parent_sha, commit_message)
+    print(f'✅ Committed {len(entries)} changed files as {commit_sha[:7]}')
+    return uploaded, failed
+
 def main():
     """Main upload function"""
+    parser = argparse.ArgumentParser(description='Upload the workspace to GitHub')
+    parser.add_argument('--workspace', type=Path, default=WORKSPACE)
+    parser.add_argument('--branch', default=BRANCH)
+    parser.add_argument('--workers', type=int, default=16, help='concurrent blob uploads')
+    parser.add_argument('--message', help='commit message for bulk mode')
+    parser.add_argument('--lfs', action='store_true',
+                        help=f'store files over {LFS_THRESHOLD // (1024 * 1024)} MB in Git LFS')
+    parser.add_argument('--max-in-flight-mb', type=int,
+                        default=MAX_IN_FLIGHT_BYTES // (1024 * 1024),
+                        help='cap on request body bytes in flight across workers')
+    parser.add_argument('--per-file', action='store_true',
+                        help='legacy mode: one contents API request and commit per file')
+    args = parser.parse_args()
+    
     print(f'🚀 Uploading files to {REPO_OWNER}/{REPO_NAME}...\n')
     
     if not GITHUB_TOKEN:
         print('❌ GITHUB_TOKEN not found in environment')
         return
     
-    workspace = Path('/home/runner/workspace')
-    uploaded = 0
-    failed = 0
-    
-    # Walk through all files
-    for root, dirs, files in os.walk(workspace):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        
-        for file in files:
-            file_path = Path(root) / file
-            relative_path = file_path.relative_to(workspace)
-            
-            if should_skip(str(relative_path)):
-                continue
-            
-            try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                
-                if upload_file(str(relative_path), content):
-                    uploaded += 1
-                else:
-                    failed += 1
-                    
-            except Exception as e:
-                print(f'❌ Error reading {relative_path}: {e}')
-                failed += 1
+    if args.per_file:
+        uploaded, failed = upload_per_file(args.workspace, args.branch)
+    else:
+        uploaded, failed = upload_bulk(args.workspace, args.branch, args.workers, args.message,
+                                       args.lfs, args.max_in_flight_mb * 1024 * 1024)
     
     print(f'\n📊 Results:')
     print(f'   ✅ Uploaded: {uploaded}')